@@ -0,0 +1,41 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+
+class ClaimsUser(TokenUser):
+    """
+    Stateless user built from a verified access token.
+
+    ``role`` and ``email`` come from the custom claims added in
+    CustomTokenObtainPairSerializer.get_token, which is all the permission
+    classes in core.permissions need.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token.get('role')
+
+    @cached_property
+    def email(self):
+        return self.token.get('email', '')
+
+    def __str__(self):
+        return f"{self.email}"
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication that trusts the token's claims instead of loading the
+    user row on every request.
+
+    Role or active-flag changes take effect once the user's access token
+    expires: saving such a change blacklists the user's refresh tokens (see
+    accounts.signals), so no new access token carrying the old claims can be
+    issued. Tokens without a ``role`` claim fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if 'role' not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+        return ClaimsUser(validated_token)
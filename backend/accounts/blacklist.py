@@ -0,0 +1,125 @@
+"""
+Process-local lookup for blacklisted refresh tokens.
+
+A bloom filter over the JTIs of blacklisted (and not yet expired) refresh
+tokens answers "definitely not blacklisted" without touching the database,
+which is the answer for almost every refresh. Possible hits are confirmed
+against a small set of JTIs blacklisted by this process, then against the
+database.
+
+The filter only knows about blacklist rows written by this process (plus
+what existed when it was loaded). With refresh-token rotation and
+BLACKLIST_AFTER_ROTATION enabled this is still exact: every refresh
+blacklists the presented token itself, and CustomTokenRefreshSerializer
+rejects the request when that row already existed, e.g. because another
+worker revoked the token. Without rotation the filter is bypassed.
+"""
+import hashlib
+import math
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+
+class TokenBlacklistCache:
+    """Bloom filter plus a bounded exact set of recently blacklisted JTIs"""
+
+    def __init__(self, capacity=100000, error_rate=0.01, recent_size=10000):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.recent_size = recent_size
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next lookup reloads from the database"""
+        with self._lock:
+            self._filter = None
+            self._recent = set()
+            self._recent_order = deque()
+
+    @staticmethod
+    def enabled():
+        """The filter can only be trusted when every refresh blacklists its token"""
+        return api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+
+    def load(self):
+        """(Re)build the filter from the live blacklist rows"""
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list('token__jti', flat=True)
+            .iterator()
+        )
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            self._filter = bloom
+
+    def _ensure_loaded(self):
+        if self._filter is None:
+            self.load()
+
+    def add(self, jti):
+        """Record a JTI blacklisted by this process"""
+        if self._filter is None:
+            # Loading reads the row that was just written as well
+            return
+        with self._lock:
+            self._filter.add(jti)
+            if jti not in self._recent:
+                self._recent.add(jti)
+                self._recent_order.append(jti)
+                if len(self._recent_order) > self.recent_size:
+                    self._recent.discard(self._recent_order.popleft())
+            grow = len(self._filter) > self._filter.capacity
+        if grow:
+            self.load()
+
+    def is_blacklisted(self, jti):
+        """Exact answer; hits the database only for possible positives"""
+        self._ensure_loaded()
+        if jti not in self._filter:
+            return False
+        if jti in self._recent:
+            return True
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+blacklist_cache = TokenBlacklistCache(
+    capacity=getattr(settings, 'TOKEN_BLACKLIST_FILTER_CAPACITY', 100000),
+)
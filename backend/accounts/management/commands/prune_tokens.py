@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in small batches. "
+        "Each batch commits on its own, so the command can be interrupted and re-run "
+        "at any time; it simply continues with the remaining expired rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Rows deleted per transaction (default: 1000)",
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=0.0,
+            help="Seconds to pause between batches to let other writers in (default: 0)",
+        )
+        parser.add_argument(
+            '--max-seconds', type=float, default=None,
+            help="Stop after this many seconds; the next run picks up where this one stopped",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only count the expired rows",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lt=now)
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"{expired.count()} expired outstanding tokens, "
+                f"{BlacklistedToken.objects.filter(token__expires_at__lt=now).count()} "
+                f"of them blacklisted."
+            )
+            return
+
+        batch_size = max(1, options['batch_size'])
+        deadline = started + options['max_seconds'] if options['max_seconds'] else None
+        last_id = 0
+        outstanding_deleted = blacklisted_deleted = batches = 0
+        finished = False
+
+        while deadline is None or time.monotonic() < deadline:
+            # Walk the primary key so every batch is an index range scan
+            ids = list(
+                expired.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                finished = True
+                break
+
+            with transaction.atomic():
+                # Blacklist rows go with their outstanding token (on_delete=CASCADE)
+                _total, deleted = OutstandingToken.objects.filter(id__in=ids).delete()
+            outstanding_deleted += deleted.get(OutstandingToken._meta.label, 0)
+            blacklisted_deleted += deleted.get(BlacklistedToken._meta.label, 0)
+            last_id = ids[-1]
+            batches += 1
+
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.monotonic() - started
+        summary = (
+            f"Removed {outstanding_deleted} outstanding and {blacklisted_deleted} blacklisted tokens "
+            f"in {batches} batches ({elapsed:.2f}s)."
+        )
+        if finished:
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            self.stdout.write(self.style.WARNING(summary + " Time limit reached; run again to continue."))
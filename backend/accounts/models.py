@@ -1,8 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
+from employee_management.mixins import TrackLoadedValuesMixin
+
 # Create your models here.
-class User(AbstractUser):
+class User(TrackLoadedValuesMixin, AbstractUser):
     ROLE_CHOICES = [
         ('admin', 'Admin'),
         ('manager', 'Manager'),
@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import authenticate
 from .models import User
+from .tokens import CachedBlacklistRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -44,6 +47,12 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         # Change the username field to email field
         self.fields[self.username_field] = serializers.EmailField()
     
+    def validate(self, attrs):
+        # Authenticate once and return the user payload alongside the tokens
+        data = super().validate(attrs)
+        data['user'] = UserSerializer(self.user).data
+        return data
+
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
@@ -51,3 +60,33 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['email'] = user.email
         token['role'] = user.role
         return token
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh with the in-memory blacklist check.
+
+    When the presented token is rotated, blacklisting it doubles as the exact
+    revocation check: if the blacklist row already existed, the token was
+    revoked (possibly by another process) and the refresh is refused.
+    """
+    token_class = CachedBlacklistRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                _blacklisted, created = refresh.blacklist()
+                if not created:
+                    raise TokenError("Token is blacklisted")
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data['refresh'] = str(refresh)
+
+        return data
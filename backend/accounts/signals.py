@@ -0,0 +1,46 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .blacklist import blacklist_cache
+from .models import User
+
+
+# Fields copied into token claims (or checked when issuing tokens)
+CLAIM_FIELDS = ('role', 'is_active', 'email')
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_claim_change(sender, instance, created, raw=False, **kwargs):
+    """Blacklist a user's live refresh tokens when a claim they carry changes"""
+    loaded_values = getattr(instance, '_loaded_values', None)
+    if loaded_values is None:
+        loaded_values = instance._loaded_values = {}
+    changed = not created and any(
+        field in loaded_values and loaded_values[field] != getattr(instance, field)
+        for field in CLAIM_FIELDS
+    )
+    # The saved values are the baseline for the next save
+    for field in CLAIM_FIELDS:
+        loaded_values[field] = getattr(instance, field)
+    if raw or not changed:
+        return
+
+    outstanding = OutstandingToken.objects.filter(
+        user=instance, expires_at__gt=timezone.now(), blacklistedtoken__isnull=True
+    )
+    outstanding = list(outstanding)
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token=token) for token in outstanding],
+        ignore_conflicts=True,
+    )
+    for token in outstanding:
+        blacklist_cache.add(token.jti)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def remember_blacklisted_token(sender, instance, created, **kwargs):
+    """Keep this process's blacklist filter current"""
+    if created:
+        blacklist_cache.add(instance.token.jti)
@@ -1,10 +1,21 @@
 from django.test import TestCase
-from django.contrib.auth import get_user_model
+from django.contrib.auth import base_user, get_user_model
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
 import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.blacklist import BloomFilter, blacklist_cache
 from accounts.serializers import UserSerializer
 
 User = get_user_model()
@@ -104,6 +115,19 @@ class AuthenticationAPITest(APITestCase):
         self.assertEqual(response.data['user']['username'], 'admin')
         self.assertEqual(response.data['user']['role'], 'admin')
     
+    def test_user_login_checks_password_once(self):
+        """Test a successful login hashes the password only once"""
+        login_data = {
+            'email': 'admin@example.com',
+            'password': 'adminpass123'
+        }
+        with mock.patch.object(base_user, 'check_password', wraps=base_user.check_password) as check:
+            response = self.client.post(self.login_url, login_data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual(response.data['user']['email'], 'admin@example.com')
+
     def test_user_login_invalid_credentials(self):
         """Test login with invalid credentials"""
         login_data = {
@@ -203,3 +227,167 @@ class UserSerializerTest(TestCase):
         self.assertEqual(data['last_name'], 'User')
         self.assertEqual(data['role'], 'manager')
         self.assertNotIn('password', data)  # Password should not be serialized
+
+
+def claims_authentication():
+    """Switch every API view to claims-based authentication"""
+    return mock.patch.object(APIView, 'authentication_classes', [ClaimsJWTAuthentication])
+
+
+class ClaimsAuthenticationTest(APITestCase):
+    """Integration tests for claims-based (stateless) authentication"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.manager_user = User.objects.create_user(
+            username='manager',
+            email='manager@example.com',
+            password='managerpass123',
+            role='manager'
+        )
+        response = self.client.post(reverse('login'), {
+            'email': 'manager@example.com',
+            'password': 'managerpass123'
+        })
+        self.access_token = response.data['access']
+        self.refresh_token = response.data['refresh']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+    def test_read_without_user_query(self):
+        """Test a read request only runs the version lookup and the list query"""
+        with claims_authentication(), self.assertNumQueries(2):
+            response = self.client.get('/api/core/companies/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_role_claim_drives_permissions(self):
+        """Test write permission comes from the role claim"""
+        with claims_authentication():
+            response = self.client.post('/api/core/companies/', {'company_name': 'Claims Corp'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_role_change_revokes_refresh_tokens(self):
+        """Test changing a user's role blacklists their refresh tokens"""
+        self.manager_user.role = 'employee'
+        self.manager_user.save()
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_change_keeps_refresh_tokens(self):
+        """Test saving a user without claim changes leaves tokens valid"""
+        self.manager_user.first_name = 'Renamed'
+        self.manager_user.save()
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenBlacklistCacheTest(APITestCase):
+    """Integration tests for the in-memory refresh token blacklist"""
+
+    def setUp(self):
+        blacklist_cache.reset()
+        self.client = APIClient()
+        self.refresh_url = reverse('token_refresh')
+        self.user = User.objects.create_user(
+            username='manager',
+            email='manager@example.com',
+            password='managerpass123',
+            role='manager'
+        )
+        response = self.client.post(reverse('login'), {
+            'email': 'manager@example.com',
+            'password': 'managerpass123'
+        })
+        self.access_token = response.data['access']
+        self.refresh_token = response.data['refresh']
+
+    def blacklist_lookups(self, queries):
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'token_blacklist_blacklistedtoken' in query['sql']
+        ]
+
+    def test_bloom_filter(self):
+        """Test the filter has no false negatives"""
+        bloom = BloomFilter(1000)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        self.assertTrue(all(f'jti-{i}' in bloom for i in range(1000)))
+        false_positives = sum(f'other-{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_refresh_skips_blacklist_lookup(self):
+        """Test refreshing a live token does not read the blacklist table"""
+        blacklist_cache.load()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.refresh_url, {'refresh': self.refresh_token})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.blacklist_lookups(queries), [])
+
+    def test_rotated_token_is_rejected(self):
+        """Test a refresh token cannot be used twice"""
+        response = self.client.post(self.refresh_url, {'refresh': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(self.refresh_url, {'refresh': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_by_another_process(self):
+        """Test a token blacklisted elsewhere is refused even when the filter missed it"""
+        blacklist_cache.load()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        response = self.client.post(reverse('logout'), {'refresh_token': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Simulate a worker whose filter was loaded before the logout
+        blacklist_cache.reset()
+        blacklist_cache._filter = BloomFilter(100)
+
+        response = self.client.post(self.refresh_url, {'refresh': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_then_refresh(self):
+        """Test logging out revokes the refresh token"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        self.client.post(reverse('logout'), {'refresh_token': self.refresh_token})
+
+        self.client.credentials()
+        response = self.client.post(self.refresh_url, {'refresh': self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PruneTokensCommandTest(TestCase):
+    """Tests for the expired token pruning command"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(
+                user=self.user, jti=f'expired-{i}', token='x', expires_at=now - timedelta(days=1)
+            )
+            if i % 2 == 0:
+                BlacklistedToken.objects.create(token=token)
+        live = OutstandingToken.objects.create(
+            user=self.user, jti='live', token='x', expires_at=now + timedelta(days=1)
+        )
+        BlacklistedToken.objects.create(token=live)
+
+    def test_prune_in_batches(self):
+        """Test expired rows are removed in batches and live rows are kept"""
+        out = StringIO()
+        call_command('prune_tokens', '--batch-size', '2', stdout=out)
+
+        self.assertIn('Removed 5 outstanding and 3 blacklisted tokens in 3 batches', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_dry_run(self):
+        """Test the dry run only reports counts"""
+        out = StringIO()
+        call_command('prune_tokens', '--dry-run', stdout=out)
+
+        self.assertIn('5 expired outstanding tokens, 3 of them blacklisted', out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 6)
@@ -0,0 +1,40 @@
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .blacklist import blacklist_cache
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check goes through the in-memory filter"""
+
+    def check_blacklist(self):
+        if not blacklist_cache.enabled():
+            return super().check_blacklist()
+        if blacklist_cache.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Blacklist this token, returning ``(blacklisted_token, created)``.
+
+        Inserts first and relies on the unique constraint instead of reading
+        the blacklist table beforehand; ``created`` is False when the token
+        had already been blacklisted.
+        """
+        token, _created = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                'token': str(self),
+                'expires_at': datetime_from_epoch(self.payload['exp']),
+            },
+        )
+        try:
+            with transaction.atomic():
+                return BlacklistedToken.objects.create(token=token), True
+        except IntegrityError:
+            return BlacklistedToken.objects.get(token=token), False
@@ -6,6 +6,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .models import User
 from .serializers import UserRegistrationSerializer, UserSerializer, LogoutSerializer, CustomTokenObtainPairSerializer
+from .tokens import CachedBlacklistRefreshToken
 
 
 @api_view(['POST'])
@@ -41,7 +42,7 @@ def logout(request):
     if serializer.is_valid():
         try:
             refresh_token = serializer.validated_data['refresh_token']
-            token = RefreshToken(refresh_token)
+            token = CachedBlacklistRefreshToken(refresh_token)
             token.blacklist()
             
             return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
@@ -54,20 +55,5 @@ def logout(request):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     """Login with user data included in response"""
+    # The serializer adds the user payload, so credentials are checked once
     serializer_class = CustomTokenObtainPairSerializer
-    
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        
-        if response.status_code == 200:
-            # Get the user from the validated data
-            serializer = self.get_serializer(data=request.data)
-            if serializer.is_valid():
-                user = serializer.user
-                user_data = UserSerializer(user).data
-                
-                # Add user data to the response
-                response.data['user'] = user_data
-                
-        return response
-
@@ -0,0 +1,78 @@
+"""
+Performance benchmarks for the backend.
+
+Run them from the ``backend`` directory as modules, e.g.::
+
+    python -m benchmarks.login
+
+Every benchmark works on a throwaway test database, so the development
+database is never touched.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    """Configure Django for a standalone benchmark script"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """Create the test database (and test environment) for the duration of the block"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def measure(func, iterations, warmup=1):
+    """Call ``func`` repeatedly and return the wall-clock duration of each call in seconds"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds plus throughput in calls per second"""
+    total = sum(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3) if samples else 0.0,
+        'per_second': round(len(samples) / total, 1) if total else 0.0,
+    }
+
+
+def format_summary(name, summary):
+    return (
+        f"{name:<32} n={summary['count']:<6} mean={summary['mean_ms']:>9.3f}ms "
+        f"p50={summary['p50_ms']:>9.3f}ms p95={summary['p95_ms']:>9.3f}ms "
+        f"p99={summary['p99_ms']:>9.3f}ms {summary['per_second']:>9.1f}/s"
+    )
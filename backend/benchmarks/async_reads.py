@@ -0,0 +1,210 @@
+"""
+Read endpoints under many concurrent connections: the synchronous views behind
+WSGI against the native async views (``core.async_views``) behind ASGI.
+
+Requests go straight to the WSGI/ASGI application objects, without sockets or
+an HTTP server, so only the Django side is measured. The WSGI path runs on a
+pool of ``--threads`` worker threads, like a threaded WSGI server; the ASGI
+path runs every connection on one event loop. Latencies include the time a
+request waits for a free worker. ``asgi, sync views`` separates the effect of
+the server interface from that of the async views.
+
+    python -m benchmarks.async_reads [--connections 500] [--requests 2000] [--threads 32]
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from benchmarks import format_summary, setup, summarize, test_database
+
+
+def seed(employees):
+    from core import counters
+    from core.models import Company, Department, Employee
+
+    companies = Company.objects.bulk_create(
+        [Company(company_name=f'Company {i}') for i in range(20)]
+    )
+    departments = Department.objects.bulk_create([
+        Department(company=company, department_name=f'Department {j}')
+        for company in companies for j in range(5)
+    ])
+    Employee.objects.bulk_create([
+        Employee(
+            company=departments[i % len(departments)].company,
+            department=departments[i % len(departments)],
+            employee_status='hired',
+            employee_name=f'Employee {i}',
+            email_address=f'employee{i}@example.com',
+            mobile_number='+1234567890',
+            address=f'{i} Benchmark Street',
+            designation='Developer',
+        )
+        for i in range(employees)
+    ], batch_size=1000)
+    counters.recount()
+    return departments[0], Employee.objects.order_by('id').first()
+
+
+@contextmanager
+def read_views(async_reads):
+    """Route the core read endpoints to the async (or sync) views for the block"""
+    from django.test import override_settings
+
+    with override_settings(ASYNC_READ_VIEWS=async_reads):
+        reload_urls()
+        yield
+    reload_urls()
+
+
+def reload_urls():
+    from django.urls import clear_url_caches
+
+    importlib.reload(importlib.import_module('core.urls'))
+    clear_url_caches()
+
+
+def wsgi_get(application, path, query, token):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver',
+        'HTTP_AUTHORIZATION': f'Bearer {token}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(b''),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    statuses = []
+    result = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_get(application, path, query, token):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    statuses = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # The client never disconnects
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    await application(scope, receive, send)
+    return statuses[0]
+
+
+def run(get, connections, requests):
+    """Issue ``requests`` GETs from ``connections`` concurrent clients; returns latencies in seconds"""
+    samples = []
+    remaining = [requests]
+
+    async def client():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            status = await get()
+            samples.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f'Unexpected status {status}')
+
+    async def main():
+        await asyncio.gather(*(client() for _ in range(connections)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per endpoint and server')
+    parser.add_argument('--threads', type=int, default=32, help='WSGI worker threads')
+    args = parser.parse_args()
+
+    setup()
+
+    from django.contrib.auth import get_user_model
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database():
+        department, employee = seed(args.employees)
+        user = get_user_model().objects.create_user(
+            username='bench', email='bench@example.com', password='benchpass123', role='manager'
+        )
+        token = str(AccessToken.for_user(user))
+        endpoints = {
+            'companies': ('/api/core/companies/', ''),
+            'employees by department': ('/api/core/employees/', f'department={department.pk}'),
+            'employee detail': (f'/api/core/employees/{employee.pk}/', ''),
+            'report (cached)': ('/api/core/employees/report/', ''),
+        }
+        wsgi, asgi = get_wsgi_application(), get_asgi_application()
+
+        for name, (path, query) in endpoints.items():
+            def wsgi_request():
+                return asyncio.get_running_loop().run_in_executor(pool, wsgi_get, wsgi, path, query, token)
+
+            def asgi_request():
+                return asgi_get(asgi, path, query, token)
+
+            results = {}
+            with read_views(async_reads=False):
+                with ThreadPoolExecutor(args.threads) as pool:
+                    run(wsgi_request, args.connections, args.threads)
+                    results['wsgi, sync views'] = run(wsgi_request, args.connections, args.requests)
+                run(asgi_request, args.connections, args.threads)
+                results['asgi, sync views'] = run(asgi_request, args.connections, args.requests)
+            with read_views(async_reads=True):
+                run(asgi_request, args.connections, args.threads)
+                results['asgi, async views'] = run(asgi_request, args.connections, args.requests)
+
+            print(f'{name} ({args.connections} connections)')
+            for label, (samples, elapsed) in results.items():
+                summary = summarize(samples)
+                # Requests overlap, so throughput comes from the wall-clock time
+                summary['per_second'] = round(len(samples) / elapsed, 1)
+                print('  ' + format_summary(label, summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""
+Every API endpoint against a seeded dataset of configurable size: latency
+percentiles and SQL queries per request, optionally saved as JSON and
+compared with a saved baseline.
+
+Requests go through the Django test client with a real JWT, so
+authentication, middleware, rendering and compression (gzip is accepted)
+are included. Per-request setup, such as creating the row a DELETE removes
+or minting the refresh token a refresh uses, happens outside the timing.
+Reads run before writes, so they see the seeded data only.
+
+    python -m benchmarks.endpoints [--companies 100] [--departments 50] [--employees 100000]
+        [--iterations 20] [--only 'employees*'] [--skip 'report*']
+        [--output results.json] [--baseline baseline.json] [--threshold 0.25]
+
+With ``--baseline`` a regression (p95 slower by more than ``--threshold``
+and at least 1 ms, or more queries per request) makes the command exit
+with status 1, so it can gate CI. Compare runs of the same size on the same
+machine only.
+"""
+import argparse
+import fnmatch
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks import setup, summarize, test_database
+
+
+STATUSES = (
+    ('hired', 70),
+    ('interview_scheduled', 10),
+    ('application_received', 15),
+    ('not_accepted', 5),
+)
+
+PASSWORD = 'benchpass123'
+
+
+def seed(companies, departments_per_company, employees, batch_size=5000):
+    """Bulk-insert the dataset and rebuild the derived tables; returns the first company"""
+    from core import counters, rollups
+    from core.models import Company, Department, Employee
+
+    company_rows = Company.objects.bulk_create(
+        [Company(company_name=f'Company {i}') for i in range(companies)], batch_size=batch_size
+    )
+    department_rows = Department.objects.bulk_create([
+        Department(company=company, department_name=f'Department {j}')
+        for company in company_rows for j in range(departments_per_company)
+    ], batch_size=batch_size)
+
+    rng = random.Random(42)
+    statuses = [name for name, _weight in STATUSES]
+    weights = [weight for _name, weight in STATUSES]
+    today = date.today()
+    for start in range(0, employees, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, employees)):
+            department = department_rows[rng.randrange(len(department_rows))]
+            employee_status = rng.choices(statuses, weights)[0]
+            batch.append(Employee(
+                company_id=department.company_id,
+                department_id=department.id,
+                employee_status=employee_status,
+                employee_name=f'Employee {i}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address=f'{i} Benchmark Street',
+                designation=rng.choice(('Developer', 'Designer', 'Analyst', 'Manager')),
+                hired_on=today - timedelta(days=rng.randrange(3650)) if employee_status == 'hired' else None,
+            ))
+        Employee.objects.bulk_create(batch)
+    counters.recount()
+    rollups.rebuild()
+    return company_rows[0]
+
+
+def cases(user):
+    """``(name, prepare)`` pairs; ``prepare()`` returns ``(method, path, data)`` for one request"""
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from core.models import Company, Department, Employee
+
+    company = Company.objects.order_by('id').first()
+    department = company.departments.order_by('id').first()
+    employee = Employee.objects.filter(department=department).order_by('id').first()
+    counter = itertools.count()
+
+    def employee_payload(**extra):
+        n = next(counter)
+        return {
+            'company': company.id,
+            'department': department.id,
+            'employee_status': 'hired',
+            'employee_name': f'Benchmark Employee {n}',
+            'email_address': f'bench.employee{n}@example.com',
+            'mobile_number': '+1234567890',
+            'address': f'{n} Benchmark Avenue',
+            'designation': 'Developer',
+            'hired_on': date.today().isoformat(),
+            **extra,
+        }
+
+    def new_employee(**extra):
+        payload = employee_payload(**extra)
+        payload['company_id'] = payload.pop('company')
+        payload['department_id'] = payload.pop('department')
+        return Employee.objects.create(**payload)
+
+    def get(path):
+        return lambda: ('get', path, None)
+
+    def delete(create, prefix):
+        return lambda: ('delete', f'{prefix}{create().id}/', None)
+
+    return [
+        # Reads
+        ('companies list', get('/api/core/companies/')),
+        ('company detail', get(f'/api/core/companies/{company.id}/')),
+        ('company departments', get(f'/api/core/companies/{company.id}/departments/')),
+        ('departments list', get('/api/core/departments/')),
+        ('departments by company', get(f'/api/core/departments/?company={company.id}')),
+        ('department detail', get(f'/api/core/departments/{department.id}/')),
+        ('employees page', get('/api/core/employees/?page_size=50')),
+        ('employees page (total)', get('/api/core/employees/?page_size=50&total=estimate')),
+        ('employees by department', get(f'/api/core/employees/?department={department.id}')),
+        ('employees by company+status page',
+         get(f'/api/core/employees/?company={company.id}&status=hired&page_size=50')),
+        ('employees search', get('/api/core/employees/?search=employee%2012&page_size=50')),
+        ('employees sparse fields page', get('/api/core/employees/?page_size=500&fields=id,employee_name')),
+        ('employee detail', get(f'/api/core/employees/{employee.id}/')),
+        ('report page', get('/api/core/employees/report/?page_size=100')),
+        ('report (cached)', get('/api/core/employees/report/')),
+        ('stats', get('/api/core/stats/')),
+        ('hiring trends', get('/api/core/stats/hiring/')),
+
+        # Writes
+        ('company create', lambda: ('post', '/api/core/companies/',
+                                    {'company_name': f'Benchmark Company {next(counter)}'})),
+        ('company update', lambda: ('patch', f'/api/core/companies/{company.id}/',
+                                    {'company_name': f'Company 0 ({next(counter)})'})),
+        ('company delete', delete(
+            lambda: Company.objects.create(company_name=f'Doomed Company {next(counter)}'),
+            '/api/core/companies/')),
+        ('department create', lambda: ('post', '/api/core/departments/', {
+            'company': company.id, 'department_name': f'Benchmark Department {next(counter)}'})),
+        ('department update', lambda: ('patch', f'/api/core/departments/{department.id}/', {
+            'company': company.id, 'department_name': f'Department 0 ({next(counter)})'})),
+        ('department delete', delete(
+            lambda: Department.objects.create(company=company, department_name=f'Doomed {next(counter)}'),
+            '/api/core/departments/')),
+        ('employee create', lambda: ('post', '/api/core/employees/', employee_payload())),
+        ('employee update', lambda: ('put', f'/api/core/employees/{employee.id}/',
+                                     employee_payload(designation='Senior Developer'))),
+        ('employee delete', delete(new_employee, '/api/core/employees/')),
+        ('employees bulk create (100)', lambda: (
+            'post', '/api/core/employees/bulk/', [employee_payload() for _ in range(100)])),
+        ('employees bulk transition (100)', lambda: ('post', '/api/core/employees/bulk/transition/', {
+            'employee_status': 'interview_scheduled',
+            'ids': [new_employee(employee_status='application_received', hired_on=None).id for _ in range(100)],
+        })),
+        ('employees bulk delete (100)', lambda: (
+            'delete', '/api/core/employees/bulk/', {'ids': [new_employee().id for _ in range(100)]})),
+
+        # Accounts
+        ('signup', lambda: ('post', '/api/accounts/signup/', {
+            'username': f'bench{next(counter)}', 'email': f'bench{next(counter)}@example.com',
+            'password': PASSWORD, 'password_confirm': PASSWORD, 'role': 'employee',
+        })),
+        ('login', lambda: ('post', '/api/accounts/login/', {'email': user.email, 'password': PASSWORD})),
+        ('token refresh', lambda: ('post', '/api/accounts/token/refresh/',
+                                   {'refresh': str(RefreshToken.for_user(user))})),
+        ('logout', lambda: ('post', '/api/accounts/logout/',
+                            {'refresh_token': str(RefreshToken.for_user(user))})),
+    ]
+
+
+def run_case(client, prepare, iterations, warmup=1):
+    """Time ``iterations`` requests; returns (latencies in seconds, queries per request)"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    samples, queries = [], []
+    for iteration in range(warmup + iterations):
+        method, path, data = prepare()
+        # CaptureQueriesContext counts nothing once the bounded log is full
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = getattr(client, method)(path, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        if response.status_code >= 300:
+            raise RuntimeError(f'{method.upper()} {path}: {response.status_code} {response.content[:200]!r}')
+        if iteration >= warmup:
+            samples.append(elapsed)
+            queries.append(len(captured.captured_queries))
+    return samples, queries
+
+
+def compare(results, baseline, threshold):
+    """Print the change against ``baseline`` per endpoint; returns the regressed endpoint names"""
+    regressions = []
+    print(f"\n{'endpoint':<34} {'p50 ms':>19} {'p95 ms':>19} {'queries':>9}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f'{name:<34} (not in baseline)')
+            continue
+        slower = result['p95_ms'] > before['p95_ms'] * (1 + threshold) and result['p95_ms'] - before['p95_ms'] >= 1
+        more_queries = result['queries_max'] > before['queries_max']
+        flag = '  REGRESSION' if slower or more_queries else ''
+        if flag:
+            regressions.append(name)
+        print(
+            f"{name:<34} {before['p50_ms']:>8.2f} -> {result['p50_ms']:>8.2f} "
+            f"{before['p95_ms']:>8.2f} -> {result['p95_ms']:>8.2f} "
+            f"{before['queries_max']:>3} -> {result['queries_max']:<3}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=100)
+    parser.add_argument('--departments', type=int, default=50, help='departments per company')
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--iterations', type=int, default=20, help='timed requests per endpoint')
+    parser.add_argument('--only', action='append', default=[], help='endpoint name glob; repeatable')
+    parser.add_argument('--skip', action='append', default=[], help='endpoint name glob; repeatable')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25, help='tolerated p95 slowdown (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    setup()
+
+    import django
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database():
+        start = time.perf_counter()
+        seed(args.companies, args.departments, args.employees)
+        seconds = time.perf_counter() - start
+        print(f'Seeded {args.companies} companies, {args.companies * args.departments} departments and '
+              f'{args.employees} employees in {seconds:.1f}s')
+
+        user = get_user_model().objects.create_user(
+            username='bench', email='bench@example.com', password=PASSWORD, role='admin'
+        )
+        client = APIClient(HTTP_ACCEPT_ENCODING='gzip')
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+        results = {}
+        for name, prepare in cases(user):
+            if args.only and not any(fnmatch.fnmatch(name, pattern) for pattern in args.only):
+                continue
+            if any(fnmatch.fnmatch(name, pattern) for pattern in args.skip):
+                continue
+            samples, queries = run_case(client, prepare, args.iterations)
+            summary = summarize(samples)
+            summary['queries_mean'] = round(sum(queries) / len(queries), 2)
+            summary['queries_max'] = max(queries)
+            results[name] = summary
+            print(
+                f"{name:<34} p50={summary['p50_ms']:>9.3f}ms p95={summary['p95_ms']:>9.3f}ms "
+                f"p99={summary['p99_ms']:>9.3f}ms queries={summary['queries_mean']:g} "
+                f"(max {summary['queries_max']})"
+            )
+        vendor = connection.vendor
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'companies': args.companies,
+                'departments_per_company': args.departments,
+                'employees': args.employees,
+                'iterations': args.iterations,
+                'database': vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\nResults written to {args.output}')
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
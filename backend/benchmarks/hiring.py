@@ -0,0 +1,91 @@
+"""
+Hiring trends over five years of history: the rollup-backed endpoint
+against the equivalent aggregation over the employee table.
+
+    python -m benchmarks.hiring [--employees 50000] [--iterations 50]
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks import format_summary, measure, setup, summarize, test_database
+
+
+def seed(employees, start, days):
+    from core import counters, rollups
+    from core.models import Company, Department, Employee
+
+    companies = Company.objects.bulk_create(
+        [Company(company_name=f'Company {i}') for i in range(20)]
+    )
+    departments = Department.objects.bulk_create([
+        Department(company=company, department_name=f'Department {j}')
+        for company in companies for j in range(5)
+    ])
+    rng = random.Random(42)
+    batch = []
+    for i in range(employees):
+        department = departments[i % len(departments)]
+        batch.append(Employee(
+            company=department.company,
+            department=department,
+            employee_status='hired',
+            employee_name=f'Employee {i}',
+            email_address=f'employee{i}@example.com',
+            mobile_number='+1234567890',
+            address=f'{i} Benchmark Street',
+            designation='Developer',
+            hired_on=start + timedelta(days=rng.randrange(days)),
+        ))
+    Employee.objects.bulk_create(batch, batch_size=1000)
+    counters.recount()
+    return rollups.rebuild()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+    from django.db.models.functions import TruncMonth
+    from rest_framework.test import APIClient
+
+    from core.models import Employee
+
+    end = date.today()
+    start = end - timedelta(days=5 * 365)
+    with test_database():
+        rows = seed(args.employees, start, 5 * 365)
+        user = get_user_model().objects.create_user(
+            username='bench', email='bench@example.com', password='benchpass123', role='manager'
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        params = {'interval': 'month', 'start': str(start), 'end': str(end)}
+
+        def scan():
+            return list(
+                Employee.objects.filter(employee_status='hired', hired_on__range=(start, end))
+                .annotate(month=TruncMonth('hired_on')).values('month').annotate(hires=Count('id'))
+            )
+
+        results = {
+            'employee table scan': summarize(measure(scan, args.iterations)),
+            'rollup endpoint (month)': summarize(measure(lambda: client.get('/api/core/stats/hiring/', params),
+                                                         args.iterations)),
+            'rollup endpoint (day)': summarize(measure(
+                lambda: client.get('/api/core/stats/hiring/', dict(params, interval='day')), args.iterations
+            )),
+        }
+        print(f"{args.employees} hired employees over five years, {rows} rollup rows")
+        for name, summary in results.items():
+            print(format_summary(name, summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Login throughput: the single-pass login view against the previous flow that
+validated the credentials twice (once in TokenObtainPairView.post and again
+to build the user payload).
+
+    python -m benchmarks.login [--iterations 50]
+"""
+import argparse
+
+from benchmarks import format_summary, measure, setup, summarize, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from unittest import mock
+
+    from django.contrib.auth import base_user, get_user_model
+    from django.urls import path
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.views import TokenObtainPairView
+
+    from accounts.serializers import CustomTokenObtainPairSerializer, UserSerializer
+
+    class TwoPassLoginView(TokenObtainPairView):
+        """The login view as it was before authentication became single-pass"""
+        serializer_class = CustomTokenObtainPairSerializer
+
+        def post(self, request, *args, **kwargs):
+            response = super().post(request, *args, **kwargs)
+            if response.status_code == 200:
+                serializer = self.get_serializer(data=request.data)
+                if serializer.is_valid():
+                    response.data['user'] = UserSerializer(serializer.user).data
+            return response
+
+    from employee_management import urls as root_urls
+    root_urls.urlpatterns.append(path('benchmark/two-pass-login/', TwoPassLoginView.as_view()))
+
+    with test_database():
+        get_user_model().objects.create_user(
+            username='bench', email='bench@example.com', password='benchpass123', role='manager'
+        )
+        client = APIClient()
+        credentials = {'email': 'bench@example.com', 'password': 'benchpass123'}
+
+        results = {}
+        for name, url in (('two-pass (previous)', '/benchmark/two-pass-login/'),
+                          ('single-pass (current)', '/api/accounts/login/')):
+            with mock.patch.object(base_user, 'check_password', wraps=base_user.check_password) as check:
+                samples = measure(lambda: client.post(url, credentials), args.iterations)
+                hashes = check.call_count / (args.iterations + 1)
+            results[name] = summarize(samples)
+            print(f"{format_summary(name, results[name])}  password hashes/login={hashes:.0f}")
+
+        before = results['two-pass (previous)']['per_second']
+        after = results['single-pass (current)']['per_second']
+        if before:
+            print(f"Throughput change: {after / before:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
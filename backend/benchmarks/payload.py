@@ -0,0 +1,65 @@
+"""
+Employee list payloads: encode time of DRF's JSONRenderer against
+FastJSONRenderer, and the size and cost of each response compression.
+
+The rows are the serialized employee list (``EmployeeListSerializer``
+output) of ``--employees`` employees, built once up front.
+
+    python -m benchmarks.payload [--employees 10000] [--iterations 20]
+"""
+import argparse
+
+from benchmarks import format_summary, measure, setup, summarize, test_database
+from benchmarks.serialization import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.test import override_settings
+    from rest_framework.renderers import JSONRenderer
+
+    from core import compression
+    from core.models import Employee
+    from core.renderers import FastJSONRenderer, orjson
+    from core.serializers import EmployeeListSerializer
+
+    with test_database():
+        seed(args.employees)
+        queryset = Employee.objects.select_related('company', 'department').order_by('employee_name', 'id')
+        data = EmployeeListSerializer(queryset, many=True).data
+
+    content = JSONRenderer().render(data)
+    if FastJSONRenderer().render(data) != content:
+        raise SystemExit('FastJSONRenderer output differs from JSONRenderer')
+
+    print(f'encode ({args.employees} rows, {len(content):,} bytes)')
+    encode = {
+        'JSONRenderer': measure(lambda: JSONRenderer().render(data), args.iterations),
+        f"FastJSONRenderer ({'orjson' if orjson else 'json fallback'})": measure(
+            lambda: FastJSONRenderer().render(data), args.iterations),
+    }
+    for label, samples in encode.items():
+        print('  ' + format_summary(label, summarize(samples)))
+
+    print('compress')
+    variants = [('gzip', level) for level in (1, 6, 9)]
+    if compression.brotli is not None:
+        variants += [('br', quality) for quality in (1, 4, 11)]
+    else:
+        print('  (brotli is not installed; pip install brotli to include it)')
+    for encoding, level in variants:
+        with override_settings(COMPRESSION_GZIP_LEVEL=level, COMPRESSION_BROTLI_QUALITY=level):
+            size = len(compression.compress(content, encoding))
+            summary = summarize(measure(lambda: compression.compress(content, encoding), args.iterations))
+        label = f'{encoding} level {level}: {size:,} bytes ({size / len(content):.1%})'
+        print('  ' + format_summary(label, summary))
+
+
+if __name__ == '__main__':
+    main()
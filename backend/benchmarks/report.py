@@ -0,0 +1,75 @@
+"""
+Hired-employee report latency: uncached (the join and serializer on every
+request) against the warm report cache.
+
+    python -m benchmarks.report [--employees 5000] [--iterations 50]
+"""
+import argparse
+from datetime import date, timedelta
+
+from benchmarks import format_summary, measure, setup, summarize, test_database
+
+
+def seed(employees):
+    from core import counters
+    from core.models import Company, Department, Employee
+
+    companies = Company.objects.bulk_create(
+        [Company(company_name=f'Company {i}') for i in range(20)]
+    )
+    departments = Department.objects.bulk_create([
+        Department(company=company, department_name=f'Department {j}')
+        for company in companies for j in range(5)
+    ])
+    Employee.objects.bulk_create([
+        Employee(
+            company=departments[i % len(departments)].company,
+            department=departments[i % len(departments)],
+            employee_status='hired',
+            employee_name=f'Employee {i}',
+            email_address=f'employee{i}@example.com',
+            mobile_number='+1234567890',
+            address=f'{i} Benchmark Street',
+            designation='Developer',
+            hired_on=date.today() - timedelta(days=i % 2000),
+        )
+        for i in range(employees)
+    ], batch_size=1000)
+    counters.recount()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.contrib.auth import get_user_model
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    with test_database():
+        seed(args.employees)
+        user = get_user_model().objects.create_user(
+            username='bench', email='bench@example.com', password='benchpass123', role='manager'
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        url = '/api/core/employees/report/'
+
+        results = {}
+        with override_settings(EMPLOYEE_REPORT_CACHE=None):
+            results['uncached'] = summarize(measure(lambda: client.get(url), args.iterations))
+        results['warm cache'] = summarize(measure(lambda: client.get(url), args.iterations))
+
+        for name, summary in results.items():
+            print(format_summary(f'{name} ({args.employees} rows)', summary))
+        before, after = results['uncached']['p99_ms'], results['warm cache']['p99_ms']
+        if after:
+            print(f"p99 speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
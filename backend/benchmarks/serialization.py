@@ -0,0 +1,92 @@
+"""
+Serializing employee lists: the DRF serializers against the values plans of
+``core.fast_serializers``.
+
+``fetch + serialize`` runs the query and builds the response data, as a
+list request does; ``serialize`` times only the conversion of rows already
+in memory (model instances for DRF, ``values_list()`` tuples for the plan).
+Both paths are rendered once and compared byte for byte before timing.
+
+    python -m benchmarks.serialization [--employees 10000] [--iterations 10]
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks import format_summary, measure, setup, summarize, test_database
+
+
+def seed(employees):
+    from core import counters
+    from core.models import Company, Department, Employee
+
+    companies = Company.objects.bulk_create(
+        [Company(company_name=f'Company {i}') for i in range(20)]
+    )
+    departments = Department.objects.bulk_create([
+        Department(company=company, department_name=f'Department {j}')
+        for company in companies for j in range(5)
+    ])
+    rng = random.Random(42)
+    Employee.objects.bulk_create([
+        Employee(
+            company=departments[i % len(departments)].company,
+            department=departments[i % len(departments)],
+            employee_status='hired',
+            employee_name=f'Employee {i}',
+            email_address=f'employee{i}@example.com',
+            mobile_number='+1234567890',
+            address=f'{i} Benchmark Street',
+            designation='Developer',
+            hired_on=date.today() - timedelta(days=rng.randrange(3650)),
+        )
+        for i in range(employees)
+    ], batch_size=1000)
+    counters.recount()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from core.fast_serializers import compile_plan
+    from core.models import Employee
+    from core.serializers import EmployeeListSerializer, EmployeeReportSerializer
+
+    with test_database():
+        seed(args.employees)
+        queryset = Employee.objects.select_related('company', 'department').order_by('employee_name', 'id')
+        renderer = JSONRenderer()
+
+        for name, serializer_class in (('list', EmployeeListSerializer), ('report', EmployeeReportSerializer)):
+            plan = compile_plan(serializer_class(), Employee)
+            instances, rows = list(queryset), list(plan.rows(queryset))
+            if renderer.render(serializer_class(instances, many=True).data) != renderer.render(plan.serialize(rows)):
+                raise SystemExit(f'{name}: the values plan does not match {serializer_class.__name__}')
+
+            results = {
+                'drf fetch + serialize': measure(
+                    lambda: serializer_class(queryset.all(), many=True).data, args.iterations),
+                'plan fetch + serialize': measure(
+                    lambda: plan.serialize(plan.rows(queryset.all())), args.iterations),
+                'drf serialize': measure(
+                    lambda: serializer_class(instances, many=True).data, args.iterations),
+                'plan serialize': measure(
+                    lambda: compile_plan(serializer_class(), Employee).serialize(rows), args.iterations),
+            }
+            print(f'{name} ({args.employees} rows)')
+            for label, samples in results.items():
+                print('  ' + format_summary(label, summarize(samples)))
+            for step in ('fetch + serialize', 'serialize'):
+                drf, fast = (summarize(results[f'{path} {step}'])['mean_ms'] for path in ('drf', 'plan'))
+                print(f'  {step}: {drf / fast:.1f}x faster')
+
+
+if __name__ == '__main__':
+    main()
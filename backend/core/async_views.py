@@ -0,0 +1,257 @@
+"""
+Async read path for the core endpoints, for deployments served over ASGI.
+
+With ``ASYNC_READ_VIEWS`` set, ``core.urls`` routes the company, department
+and employee lists and details, the hired-employee report and
+``companies/{id}/departments/`` through the views below. A GET for the
+default JSON representation is answered natively: the bearer token is
+verified in the event loop, and the user (unless the token carries the
+claims), the table versions and the rows are loaded with the async ORM, so
+no worker thread is held for the whole request.
+
+Everything else is handed to the regular DRF view through
+``sync_to_async``: writes, other media types, paginated and search requests,
+CSV/NDJSON exports, and any request that fails authentication, permissions
+or the object lookup. Status codes, bodies and headers therefore match the
+synchronous views exactly; the native path only covers the common case.
+"""
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.authentication import ClaimsJWTAuthentication
+
+from . import report_cache, views
+from .conditional import acompute_validators, not_modified
+from .models import Company, Department
+from .serializers import DepartmentListSerializer
+
+
+async def authenticate(request):
+    """
+    ``(user, token)`` for a valid JWT bearer token, or None.
+
+    Follows the configured JWT authentication class but loads the user with
+    the async ORM. None leaves the decision to the DRF view, which also
+    covers missing or invalid credentials and other authentication classes.
+    """
+    authenticators = request.authenticators
+    if not authenticators or not isinstance(authenticators[0], JWTAuthentication):
+        return None
+    authenticator = authenticators[0]
+
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return None
+    try:
+        token = authenticator.get_validated_token(raw_token)
+    except APIException:
+        return None
+
+    if isinstance(authenticator, ClaimsJWTAuthentication):
+        if 'role' in token:
+            return authenticator.get_user(token), token
+    elif type(authenticator).get_user is not JWTAuthentication.get_user:
+        return None
+    if jwt_settings.CHECK_REVOKE_TOKEN or jwt_settings.USER_ID_CLAIM not in token:
+        return None
+
+    user = await get_user_model().objects.filter(
+        **{jwt_settings.USER_ID_FIELD: token[jwt_settings.USER_ID_CLAIM]}
+    ).afirst()
+    if user is None or not user.is_active:
+        return None
+    return user, token
+
+
+class AsyncReadView:
+    """
+    Serve GETs of ``view_class`` natively and delegate everything else to it.
+
+    Subclasses implement ``get_response(view, request)``, returning a response
+    or None to fall back. ``view`` is a ``view_class`` instance set up the
+    way ``APIView.initial`` would, so its querysets, serializers and
+    renderer context can be reused. The ETag/Last-Modified validators come
+    from the view's ``version_models``/``date_sensitive`` unless overridden.
+    """
+    view_class = None
+    version_models = None
+    date_sensitive = None
+
+    @classmethod
+    def as_view(cls):
+        sync_view = cls.view_class.as_view()
+
+        async def view(request, *args, **kwargs):
+            response = None
+            if request.method == 'GET':
+                response = await cls().get(request, *args, **kwargs)
+            if response is None:
+                response = await sync_to_async(sync_view)(request, *args, **kwargs)
+            return response
+
+        # Like every DRF view; only writes reach the CSRF check, and DRF handles them
+        view.csrf_exempt = True
+        view.cls = cls
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        view = self.view_class()
+        view.setup(request, *args, **kwargs)
+        request = view.initialize_request(request, *args, **kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+        if view.get_throttles():
+            return None
+
+        try:
+            view.format_kwarg = view.get_format_suffix(**kwargs)
+            renderer, media_type = view.perform_content_negotiation(request)
+        except APIException:
+            return None
+        if not isinstance(renderer, JSONRenderer):
+            return None
+        request.accepted_renderer, request.accepted_media_type = renderer, media_type
+
+        credentials = await authenticate(request)
+        if credentials is None:
+            return None
+        request.user, request.auth = credentials
+        if not all(permission.has_permission(request, view) for permission in view.get_permissions()):
+            return None
+
+        validators = await acompute_validators(
+            request,
+            self.version_models if self.version_models is not None else view.version_models,
+            self.date_sensitive if self.date_sensitive is not None else view.date_sensitive,
+        )
+        response = not_modified(request, validators)
+        if response is None:
+            try:
+                response = await self.get_response(view, request)
+            except APIException:
+                # e.g. invalid ?fields=; the DRF view renders the error
+                return None
+            if response is None:
+                return None
+        return self.finalize_response(view, validators.apply(response))
+
+    async def get_response(self, view, request):
+        raise NotImplementedError
+
+    def render(self, view, request, data):
+        """The response DRF would send for ``data``"""
+        content = request.accepted_renderer.render(data, request.accepted_media_type, view.get_renderer_context())
+        return HttpResponse(content, content_type=request.accepted_media_type)
+
+    def finalize_response(self, view, response):
+        """Add the view's default headers, as ``APIView.finalize_response`` does"""
+        headers = dict(view.headers)
+        vary = headers.pop('Vary', None)
+        if vary is not None:
+            patch_vary_headers(response, [value.strip() for value in vary.split(',')])
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    async def list(self, view, request):
+        if view.paginator is not None and view.paginator.is_requested(request):
+            return None
+        return self.render(view, request, await self.serialize_list(view, view.filter_queryset(view.get_queryset())))
+
+    async def serialize_list(self, view, queryset):
+        """The serialized rows of ``queryset``, through the view's values plan if it has one"""
+        plan = view.get_values_plan() if hasattr(view, 'get_values_plan') else None
+        if plan is None:
+            rows = [row async for row in queryset]
+            return view.get_serializer(rows, many=True).data
+        return plan.serialize([row async for row in plan.rows(queryset)])
+
+    async def retrieve(self, view, request):
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        instance = await view.filter_queryset(view.get_queryset()).filter(
+            **{view.lookup_field: view.kwargs[lookup_url_kwarg]}
+        ).afirst()
+        if instance is None:
+            return None
+        try:
+            view.check_object_permissions(request, instance)
+        except APIException:
+            return None
+        return self.render(view, request, view.get_serializer(instance).data)
+
+
+class ListView(AsyncReadView):
+    async def get_response(self, view, request):
+        return await self.list(view, request)
+
+
+class DetailView(AsyncReadView):
+    async def get_response(self, view, request):
+        return await self.retrieve(view, request)
+
+
+class CompanyListView(ListView):
+    view_class = views.CompanyListCreateView
+
+
+class CompanyDetailView(DetailView):
+    view_class = views.CompanyDetailView
+
+
+class DepartmentListView(ListView):
+    view_class = views.DepartmentListCreateView
+
+
+class DepartmentDetailView(DetailView):
+    view_class = views.DepartmentDetailView
+
+
+class EmployeeListView(ListView):
+    view_class = views.EmployeeListCreateView
+
+    async def get_response(self, view, request):
+        # Search responses carry facet counts, computed by the DRF view
+        if 'search' in request.query_params:
+            return None
+        return await self.list(view, request)
+
+
+class EmployeeDetailView(DetailView):
+    view_class = views.EmployeeDetailView
+
+
+class EmployeeReportView(AsyncReadView):
+    view_class = views.EmployeeReportView
+
+    async def get_response(self, view, request):
+        if view.paginator is not None and view.paginator.is_requested(request):
+            return None
+
+        async def build():
+            data = await self.serialize_list(view, view.filter_queryset(view.get_queryset()))
+            return request.accepted_renderer.render(data, request.accepted_media_type, view.get_renderer_context())
+
+        content = await report_cache.aget_or_build(date.today(), build, variant=view.get_cache_variant())
+        return HttpResponse(content, content_type=request.accepted_renderer.media_type)
+
+
+class CompanyDepartmentsView(AsyncReadView):
+    view_class = views.company_departments.cls
+    version_models = (Company, Department)
+    date_sensitive = False
+
+    async def get_response(self, view, request):
+        company_id = view.kwargs['company_id']
+        if not await Company.objects.filter(id=company_id).aexists():
+            return None
+        rows = [row async for row in Department.objects.filter(company_id=company_id)]
+        return self.render(view, request, DepartmentListSerializer(rows, many=True).data)
@@ -0,0 +1,278 @@
+"""
+Set-based create/update/delete for batches of employees.
+
+Validation uses the same rules as EmployeeSerializer, but everything a row
+needs from the database (companies, departments, emails already in use, the
+rows being updated) is fetched once per batch, so a batch of any size costs a
+constant number of queries to validate. Writes are chunked and run inside a
+single transaction: either every row is written or none is.
+"""
+from django.db import transaction
+from django.db.models.functions import Lower
+from rest_framework import exceptions, serializers
+
+from . import counters, report_cache, rollups, versions
+from .models import Company, Department, Employee
+from .serializers import EmployeeBulkSerializer
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Columns written by bulk updates (everything a PUT can change)
+UPDATE_FIELDS = [
+    'company', 'department', 'employee_status', 'employee_name', 'email_address',
+    'mobile_number', 'address', 'designation', 'hired_on',
+]
+
+
+class BulkResult:
+    """Outcome of a bulk operation: written employees, or per-row errors"""
+
+    def __init__(self, employees=None, errors=None):
+        self.employees = employees or []
+        self.errors = errors or []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def _int_or_none(value):
+    try:
+        if isinstance(value, bool):
+            return None
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _collect(rows, key):
+    """Integer values of ``key`` across the dict rows (invalid ones are left to the serializer)"""
+    values = set()
+    for row in rows:
+        if isinstance(row, dict):
+            value = _int_or_none(row.get(key))
+            if value is not None:
+                values.add(value)
+    return values
+
+
+def _normalized_email(row):
+    if not isinstance(row, dict) or not isinstance(row.get('email_address'), str):
+        return None
+    return row['email_address'].strip().lower() or None
+
+
+def _rollup_key(employee):
+    return rollups.rollup_key(
+        employee.employee_status, employee.hired_on, employee.company_id, employee.department_id,
+    )
+
+
+def emails_in_use(rows):
+    """``{lowercased email: employee id}`` for the rows' emails already taken: one query"""
+    emails = {email for email in map(_normalized_email, rows) if email}
+    return dict(
+        Employee.objects.annotate(email_lower=Lower('email_address'))
+        .filter(email_lower__in=emails).values_list('email_lower', 'id')
+    )
+
+
+def build_context(rows):
+    """Load everything the batch needs for validation: three queries in total"""
+    return {
+        'companies': Company.objects.in_bulk(_collect(rows, 'company')),
+        'departments': Department.objects.in_bulk(_collect(rows, 'department')),
+        'emails_in_use': emails_in_use(rows),
+    }
+
+
+def validate_rows(rows, context, instances=None):
+    """
+    Run EmployeeBulkSerializer over every row.
+
+    Returns ``(validated, errors)`` where ``validated`` is a list of
+    ``(index, instance, validated_data)`` and ``errors`` a list of
+    ``{'index': i, 'errors': {...}}``. Emails repeated within the batch are
+    rejected as duplicates as well.
+    """
+    validated, errors = [], []
+    seen_emails = {}
+    # One serializer for the batch, as ListSerializer does: building a
+    # ModelSerializer's fields costs more than validating a row with them
+    serializer = EmployeeBulkSerializer(context=context)
+    for index, row in enumerate(rows):
+        instance = instances[index] if instances is not None else None
+        serializer.instance = instance
+        try:
+            data = serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            errors.append({'index': index, 'errors': exc.detail})
+            continue
+
+        email = data['email_address']
+        if email in seen_emails:
+            errors.append({'index': index, 'errors': {
+                'email_address': [f"Duplicate email address in this batch (row {seen_emails[email]})."]
+            }})
+            continue
+        seen_emails[email] = index
+        validated.append((index, instance, data))
+    return validated, errors
+
+
+def bulk_create_employees(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate and insert a batch of new employees"""
+    validated, errors = validate_rows(rows, build_context(rows))
+    if errors:
+        return BulkResult(errors=errors)
+
+    employees = [Employee(**data) for _index, _instance, data in validated]
+    insert_employees(employees, chunk_size)
+    return BulkResult(employees=employees)
+
+
+def insert_employees(employees, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    ``bulk_create()`` validated employees and update the counters, rollups,
+    table version and report cache their model signals would have.
+    """
+    with transaction.atomic(), counters.deferred() as touched, rollups.deferred():
+        Employee.objects.bulk_create(employees, batch_size=chunk_size)
+        versions.bump(Employee)
+        for employee in employees:
+            rollups.employee_changed(None, _rollup_key(employee))
+        if any(employee.employee_status == 'hired' for employee in employees):
+            report_cache.invalidate()
+        touched[Company].update(employee.company_id for employee in employees)
+        touched[Department].update(employee.department_id for employee in employees)
+
+
+def bulk_update_employees(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate and update a batch of existing employees.
+
+    Every row must carry the employee ``id`` plus all writable fields, like a
+    PUT to the detail endpoint.
+    """
+    ids = [_int_or_none(row.get('id')) if isinstance(row, dict) else None for row in rows]
+    existing = Employee.objects.in_bulk([pk for pk in ids if pk is not None])
+
+    errors = []
+    instances = []
+    for index, pk in enumerate(ids):
+        if pk not in existing:
+            errors.append({'index': index, 'errors': {'id': ['Employee not found.']}})
+        instances.append(existing.get(pk))
+    if errors:
+        return BulkResult(errors=errors)
+
+    validated, errors = validate_rows(rows, build_context(rows), instances)
+    if errors:
+        return BulkResult(errors=errors)
+
+    employees = []
+    touches_report = False
+    with transaction.atomic(), counters.deferred() as touched, rollups.deferred():
+        for _index, employee, data in validated:
+            touched[Company].update((employee.company_id, data['company'].pk))
+            touched[Department].update((employee.department_id, data['department'].pk))
+            touches_report |= 'hired' in (employee.employee_status, data.get('employee_status'))
+            old_key = _rollup_key(employee)
+            for field, value in data.items():
+                setattr(employee, field, value)
+            rollups.employee_changed(old_key, _rollup_key(employee))
+            employees.append(employee)
+        Employee.objects.bulk_update(employees, UPDATE_FIELDS, batch_size=chunk_size)
+        versions.bump(Employee)
+        if touches_report:
+            report_cache.invalidate()
+    return BulkResult(employees=employees)
+
+
+def bulk_delete_employees(ids, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Delete employees by id; returns ``(deleted_ids, missing_ids)``"""
+    ids = list(dict.fromkeys(ids))
+    deleted = []
+    with transaction.atomic(), counters.deferred(), versions.deferred(), rollups.deferred():
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            found = list(Employee.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+            Employee.objects.filter(pk__in=found).delete()
+            deleted.extend(found)
+    found = set(deleted)
+    return deleted, [pk for pk in ids if pk not in found]
+
+
+class TransitionConflict(exceptions.APIException):
+    status_code = 409
+    default_detail = 'Employees changed while their status was being changed; retry the request.'
+    default_code = 'conflict'
+
+
+def transition_employees(employees, employee_status, hired_on=None, ids=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Move the ``employees`` queryset to ``employee_status`` wherever
+    ``Employee.ALLOWED_TRANSITIONS`` permits it.
+
+    ``hired_on`` is set to the given date (when hiring) or cleared, as the
+    serializer does for single employees. One SELECT reads the matched rows
+    and checks each against the transition table, then an UPDATE per chunk
+    of ``chunk_size`` writes the allowed rows by pk, so ``updated_ids`` and
+    the rollup deltas always describe the rows written. Both run in one
+    transaction, so the rows cannot change in between: ``select_for_update()``
+    locks them where the database has row locks, and SQLite, which ignores
+    it, either blocks other writers until the commit (rollback journal) or
+    fails the UPDATE if one committed since the SELECT (WAL). The UPDATE
+    still requires a source status, and should it write fewer rows than were
+    selected the transaction is rolled back with ``TransitionConflict``.
+
+    Returns ``(updated_ids, skipped)`` where ``skipped`` is a list of
+    ``{'id': ..., 'reason': ...}``, including any of ``ids`` (the ids the
+    caller asked for) that do not exist.
+    """
+    sources = [
+        source for source, targets in Employee.ALLOWED_TRANSITIONS.items() if employee_status in targets
+    ]
+    if employee_status != 'hired':
+        hired_on = None
+
+    with transaction.atomic(), rollups.deferred():
+        selected = list(employees.select_for_update().order_by('pk').values_list(
+            'pk', 'employee_status', 'hired_on', 'company_id', 'department_id',
+        ))
+        updated, skipped, touches_report = [], [], False
+        for pk, current_status, current_hired_on, company_id, department_id in selected:
+            if current_status in sources:
+                updated.append(pk)
+                touches_report |= 'hired' in (current_status, employee_status)
+                rollups.employee_changed(
+                    rollups.rollup_key(current_status, current_hired_on, company_id, department_id),
+                    rollups.rollup_key(employee_status, hired_on, company_id, department_id),
+                )
+            elif current_status == employee_status:
+                skipped.append({'id': pk, 'reason': f"Already '{employee_status}'."})
+            else:
+                skipped.append({'id': pk, 'reason': (
+                    f"Cannot change status from '{current_status}' to '{employee_status}'. "
+                    f"Allowed transitions: {Employee.ALLOWED_TRANSITIONS.get(current_status, [])}"
+                )})
+
+        if updated:
+            written = 0
+            for start in range(0, len(updated), chunk_size):
+                written += Employee.objects.filter(
+                    pk__in=updated[start:start + chunk_size], employee_status__in=sources,
+                ).update(employee_status=employee_status, hired_on=hired_on)
+            if written != len(updated):
+                raise TransitionConflict()
+            versions.bump(Employee)
+            if touches_report:
+                report_cache.invalidate()
+
+    if ids is not None:
+        found = {pk for pk, *_rest in selected}
+        skipped.extend(
+            {'id': pk, 'reason': 'Employee not found.'} for pk in dict.fromkeys(ids) if pk not in found
+        )
+    return updated, skipped
@@ -0,0 +1,170 @@
+"""
+Negotiated response compression.
+
+``CompressionMiddleware`` compresses responses with brotli (when the optional
+``brotli`` package is installed) or gzip, whichever the client prefers in
+``Accept-Encoding``; equal preferences go to the order of
+``COMPRESSION_ENCODINGS``. Bodies under ``COMPRESSION_MIN_SIZE`` bytes,
+content types that do not compress (see ``COMPRESSIBLE_TYPES``) and
+responses that already set ``Content-Encoding`` are sent as they are.
+Streaming responses, such as the CSV/NDJSON report exports, are compressed
+chunk by chunk without buffering the whole body.
+
+Compressed responses get ``Vary: Accept-Encoding`` and a weak ETag, as with
+Django's ``GZipMiddleware``; ``If-None-Match`` matching is weak, so 304s
+keep working. Gzip responses also keep that middleware's BREACH mitigation,
+a gzip header padded to a random length.
+"""
+import gzip
+import re
+import secrets
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import StreamingBuffer
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip is offered then
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+)
+
+DEFAULT_ENCODINGS = ('br', 'gzip')
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+
+def available_encodings():
+    """The configured encodings this process can produce, in order of preference"""
+    encodings = getattr(settings, 'COMPRESSION_ENCODINGS', DEFAULT_ENCODINGS)
+    return [encoding for encoding in encodings if encoding == 'gzip' or (encoding == 'br' and brotli is not None)]
+
+
+def negotiate(accept_encoding, encodings):
+    """The entry of ``encodings`` the ``Accept-Encoding`` header prefers, or None"""
+    qualities = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _random_filename(max_random_bytes):
+    # Same padding as django.utils.text.compress_string()
+    return b'a' * secrets.randbelow(max_random_bytes) if max_random_bytes else b''
+
+
+def _compressor(encoding, max_random_bytes=0):
+    """``(compress(chunk), finish())`` for a stream in ``encoding``"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY))
+        return compressor.process, compressor.finish
+    buffer = StreamingBuffer()
+    gzip_file = gzip.GzipFile(
+        filename=_random_filename(max_random_bytes), mode='wb', fileobj=buffer, mtime=0,
+        compresslevel=getattr(settings, 'COMPRESSION_GZIP_LEVEL', DEFAULT_GZIP_LEVEL),
+    )
+
+    def process(chunk):
+        gzip_file.write(chunk)
+        return buffer.read()
+
+    def finish():
+        gzip_file.close()
+        return buffer.read()
+    return process, finish
+
+
+def compress(content, encoding, max_random_bytes=0):
+    """
+    ``content`` compressed in ``encoding``. With ``max_random_bytes``, gzip
+    output carries a filename of random length in its header, as Django's
+    ``GZipMiddleware`` does to mitigate the BREACH attack.
+    """
+    if encoding == 'br':
+        return brotli.compress(content, quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY))
+    process, finish = _compressor(encoding, max_random_bytes)
+    return process(content) + finish()
+
+
+def compress_stream(chunks, encoding, max_random_bytes=0):
+    process, finish = _compressor(encoding, max_random_bytes)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_stream(chunks, encoding, max_random_bytes=0):
+    process, finish = _compressor(encoding, max_random_bytes)
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    # Upper bound of the random gzip header padding (see compress())
+    max_random_bytes = GZipMiddleware.max_random_bytes
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming:
+            if len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE):
+                return response
+
+        # Caches must keep one copy per encoding from here on
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), available_encodings())
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    response.streaming_content, encoding, self.max_random_bytes,
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, encoding, self.max_random_bytes,
+                )
+            response.headers.pop('Content-Length', None)
+        else:
+            compressed = compress(response.content, encoding, self.max_random_bytes)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The compressed bytes differ, so the tag can only be weak
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,106 @@
+"""
+ETag / Last-Modified support for the read endpoints.
+
+Validators are derived from the ``core.versions`` counters of the tables a
+view reads, plus everything else the representation depends on (path, query
+string, negotiated media type, and today's date for views exposing
+``days_employed``). A request whose ``If-None-Match`` or
+``If-Modified-Since`` still matches gets ``304 Not Modified`` before the
+view's queryset or serializer runs.
+"""
+import hashlib
+from datetime import date, datetime, time
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from . import versions
+
+
+class Validators:
+    """
+    The ETag and Last-Modified values for one request, plus the
+    ``versions.current()`` result they were derived from
+    """
+
+    def __init__(self, etag, last_modified, current=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.current = current
+
+    def apply(self, response):
+        """Attach the validators to a successful response"""
+        if response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified.timestamp())
+            # Always revalidate; responses depend on the credentials sent
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+
+
+def compute_validators(request, models, date_sensitive=False):
+    """Build the validators for ``request`` against the current table versions"""
+    table_versions, last_modified = versions.current(*models)
+    return _validators(request, table_versions, last_modified, date_sensitive)
+
+
+async def acompute_validators(request, models, date_sensitive=False):
+    """Async version of ``compute_validators()``"""
+    table_versions, last_modified = await versions.acurrent(*models)
+    return _validators(request, table_versions, last_modified, date_sensitive)
+
+
+def _validators(request, table_versions, last_modified, date_sensitive):
+    current = (table_versions, last_modified)
+    renderer = getattr(request, 'accepted_media_type', '') or ''
+    parts = [
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        renderer,
+        ','.join(f'{name}={version}' for name, version in table_versions.items()),
+    ]
+    if date_sensitive:
+        # days_employed changes at midnight even when no row does
+        today = date.today()
+        parts.append(today.isoformat())
+        midnight = timezone.make_aware(datetime.combine(today, time.min))
+        if last_modified is None or midnight > last_modified:
+            last_modified = midnight
+    digest = hashlib.blake2b('\n'.join(parts).encode(), digest_size=16).hexdigest()
+    return Validators(f'"{digest}"', last_modified, current)
+
+
+def not_modified(request, validators):
+    """A 304 response when the client's copy is current, else None"""
+    last_modified = validators.last_modified
+    response = get_conditional_response(
+        request,
+        etag=validators.etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is None:
+        return None
+    return validators.apply(response)
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with ETag/Last-Modified validators and 304s.
+
+    Views list the models whose tables their output depends on in
+    ``version_models``. The check runs after authentication and permission
+    checks (``APIView.initial``) and before the handler touches the database
+    beyond the version lookup.
+    """
+    version_models = ()
+    date_sensitive = False
+
+    def get(self, request, *args, **kwargs):
+        validators = compute_validators(request, self.version_models, self.date_sensitive)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        return validators.apply(super().get(request, *args, **kwargs))
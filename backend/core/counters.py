@@ -0,0 +1,152 @@
+"""
+Stored headcount counters for Company and Department.
+
+``Company.number_of_departments``, ``Company.number_of_employees`` and
+``Department.number_of_employees`` are plain columns. Single-row saves and
+deletes keep them current through the handlers in ``core.signals``; code that
+bypasses model signals (``bulk_create``, ``QuerySet.update``) must either run
+inside ``deferred()`` or call ``recount()`` for the rows it touched.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from . import versions
+from .models import Company, Department, Employee
+
+
+# Company/department ids touched while inside deferred(), or None
+_pending = ContextVar('core_counters_pending', default=None)
+
+
+def _count_subquery(queryset, fk_name):
+    """Correlated COUNT(*) of ``queryset`` rows pointing at the outer row"""
+    counts = queryset.filter(**{fk_name: OuterRef('pk')}).order_by().values(fk_name).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def _adjust(model, pk, **deltas):
+    """Apply ``field += delta`` to one row, or queue the row for recount()"""
+    if pk is None:
+        return
+    pending = _pending.get()
+    if pending is not None:
+        pending[model].add(pk)
+        return
+    # Decrements stop at 0: after a drift (raw deletes, no recount yet) the
+    # columns are unsigned and a negative value would fail the delete itself
+    model.objects.filter(pk=pk).update(**{
+        field: F(field) + delta if delta >= 0 else Greatest(F(field) + delta, Value(0))
+        for field, delta in deltas.items()
+    })
+
+
+def department_added(company_id):
+    _adjust(Company, company_id, number_of_departments=1)
+
+
+def department_removed(company_id):
+    _adjust(Company, company_id, number_of_departments=-1)
+
+
+def department_moved(old_company_id, new_company_id):
+    if old_company_id == new_company_id:
+        return
+    with transaction.atomic(savepoint=False):
+        department_removed(old_company_id)
+        department_added(new_company_id)
+
+
+def employee_added(company_id, department_id):
+    with transaction.atomic(savepoint=False):
+        _adjust(Company, company_id, number_of_employees=1)
+        _adjust(Department, department_id, number_of_employees=1)
+
+
+def employee_removed(company_id, department_id):
+    with transaction.atomic(savepoint=False):
+        _adjust(Company, company_id, number_of_employees=-1)
+        _adjust(Department, department_id, number_of_employees=-1)
+
+
+def employee_moved(old_company_id, old_department_id, new_company_id, new_department_id):
+    with transaction.atomic(savepoint=False):
+        if old_company_id != new_company_id:
+            _adjust(Company, old_company_id, number_of_employees=-1)
+            _adjust(Company, new_company_id, number_of_employees=1)
+        if old_department_id != new_department_id:
+            _adjust(Department, old_department_id, number_of_employees=-1)
+            _adjust(Department, new_department_id, number_of_employees=1)
+
+
+def recount(company_ids=None, department_ids=None):
+    """
+    Recompute the stored counters from the source tables.
+
+    ``None`` means "every row"; an empty collection means "no rows". Each model
+    is refreshed with a single set-based UPDATE.
+    """
+    companies = Company.objects.all()
+    if company_ids is not None:
+        companies = companies.filter(pk__in=list(company_ids))
+    departments = Department.objects.all()
+    if department_ids is not None:
+        departments = departments.filter(pk__in=list(department_ids))
+
+    # The counters are part of the company/department representations, so
+    # rewriting them is a change to those tables
+    with transaction.atomic():
+        if company_ids is None or company_ids:
+            companies.update(
+                number_of_departments=_count_subquery(Department.objects.all(), 'company'),
+                number_of_employees=_count_subquery(Employee.objects.all(), 'company'),
+            )
+            versions.bump(Company)
+        if department_ids is None or department_ids:
+            departments.update(
+                number_of_employees=_count_subquery(Employee.objects.all(), 'department'),
+            )
+            versions.bump(Department)
+
+
+def find_drift():
+    """Return ``(companies, departments)`` querysets of rows whose counters are stale"""
+    companies = Company.objects.annotate(
+        actual_departments=_count_subquery(Department.objects.all(), 'company'),
+        actual_employees=_count_subquery(Employee.objects.all(), 'company'),
+    ).exclude(
+        number_of_departments=F('actual_departments'),
+        number_of_employees=F('actual_employees'),
+    )
+    departments = Department.objects.annotate(
+        actual_employees=_count_subquery(Employee.objects.all(), 'department'),
+    ).exclude(number_of_employees=F('actual_employees'))
+    return companies, departments
+
+
+@contextmanager
+def deferred():
+    """
+    Collect counter changes instead of applying them row by row.
+
+    Bulk code paths wrap their writes in this block: signal handlers only record
+    which companies/departments were touched, and a single recount() runs for
+    them when the block exits successfully. Nested blocks join the outer one.
+    """
+    if _pending.get() is not None:
+        yield _pending.get()
+        return
+
+    pending = defaultdict(set)
+    token = _pending.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending.reset(token)
+    recount(company_ids=pending[Company], department_ids=pending[Department])
@@ -0,0 +1,217 @@
+"""
+Fast path for serializing read-only lists.
+
+``ModelSerializer`` builds a model instance per row and then walks every
+field's ``source`` on it. For plain serializers the same output can be
+produced from ``values_list()`` tuples: ``compile_plan()`` turns a
+serializer into the lookups to fetch plus, for the fields that need one,
+a conversion mirroring the field's ``to_representation()``. Model properties are computed
+from the columns listed in the model's ``property_dependencies``, once per
+distinct combination of those values rather than once per row.
+
+Serializers the plan cannot reproduce exactly get no plan and are
+serialized by DRF as before: nested serializers (``?expand=``), method
+fields, fields with custom ``to_representation()``, and sources through
+nullable relations (DRF omits such fields when the relation is empty).
+Views opt in with ``FastListMixin``; the ``FAST_LIST_SERIALIZATION``
+setting turns the fast path off everywhere.
+"""
+from operator import itemgetter
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from . import instrumentation
+
+
+def _identity(value):
+    return value
+
+
+def _converter(field, model_field=None):
+    """
+    A function equivalent to ``field.to_representation`` for non-None
+    values, ``_identity`` when the column value is already the
+    representation, or None when the field cannot be reproduced.
+    """
+    method = type(field).to_representation
+    if method is serializers.ReadOnlyField.to_representation:
+        return _identity
+    if method is serializers.CharField.to_representation:
+        return _identity if isinstance(model_field, (models.CharField, models.TextField)) else str
+    if method is serializers.IntegerField.to_representation:
+        return _identity if isinstance(model_field, models.IntegerField) else int
+    if method is serializers.ChoiceField.to_representation:
+        if isinstance(model_field, (models.CharField, models.TextField)):
+            # String choices map to themselves; unknown values pass through
+            return _identity
+        choices = field.choice_strings_to_values
+        return lambda value: value if value == '' else choices.get(str(value), value)
+    if method is serializers.PrimaryKeyRelatedField.to_representation:
+        return _identity if field.pk_field is None else None
+    if method is serializers.DateField.to_representation:
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format is None:
+            return _identity
+        if output_format.lower() == ISO_8601:
+            return lambda value: value.isoformat() if value else None
+        return lambda value: value.strftime(output_format) if value else None
+    return None
+
+
+def _resolve(model, attrs):
+    """``(values() lookup, model field)`` for a field source, or None if it needs an instance"""
+    for position, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if field.many_to_many or field.one_to_many:
+            return None
+        if position == len(attrs) - 1:
+            return '__'.join(attrs), field
+        if not field.is_relation or field.null:
+            return None
+        model = field.related_model
+    return None
+
+
+class ValuesPlan:
+    """
+    How to build a serializer's output from ``values_list()`` rows.
+
+    Columns whose value is already the representation are picked from each
+    row in one ``itemgetter`` call; ``fixups`` replace the others.
+    """
+
+    def __init__(self, names, lookups, positions, fixups):
+        self.names = names
+        self.lookups = lookups
+        self.positions = positions
+        self.fixups = fixups
+
+    def rows(self, queryset):
+        """``queryset`` as the tuples ``serialize()`` expects"""
+        return queryset.values_list(*self.lookups)
+
+    def serialize(self, rows):
+        with instrumentation.phase('serialize'):
+            return self._serialize(rows)
+
+    def _serialize(self, rows):
+        names, fixups = self.names, self.fixups
+        if len(self.positions) == 1:
+            position = self.positions[0]
+            pick = lambda row: (row[position],)  # noqa: E731
+        else:
+            pick = itemgetter(*self.positions)
+        data = []
+        for row in rows:
+            values = list(pick(row))
+            for index, get in fixups:
+                values[index] = get(row)
+            data.append(dict(zip(names, values)))
+        return data
+
+
+def compile_plan(serializer, model):
+    """A ``ValuesPlan`` reproducing ``serializer``'s output for ``model`` rows, or None"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    lookups = {}
+
+    def index(lookup):
+        return lookups.setdefault(lookup, len(lookups))
+
+    names, positions, fixups = [], [], []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.BaseSerializer) or field.source == '*':
+            return None
+
+        resolved = _resolve(model, field.source_attrs)
+        if resolved is not None:
+            lookup, model_field = resolved
+            convert = _converter(field, model_field)
+            if convert is None:
+                return None
+            positions.append(index(lookup))
+            if convert is not _identity:
+                fixups.append((len(names), _column_getter(positions[-1], convert)))
+        elif len(field.source_attrs) == 1 and field.source in getattr(model, 'property_dependencies', {}):
+            convert = _converter(field)
+            if convert is None:
+                return None
+            dependencies = model.property_dependencies[field.source]
+            dependency_positions = [index(dependency) for dependency in dependencies]
+            # Placeholder, replaced by the computed value
+            positions.append(dependency_positions[0])
+            fixups.append((len(names), _property_getter(
+                getattr(model, field.source).fget, dependencies, dependency_positions, convert
+            )))
+        else:
+            return None
+        names.append(name)
+    if not names:
+        return None
+    return ValuesPlan(names, list(lookups), positions, fixups)
+
+
+def _column_getter(position, convert):
+    def get(row):
+        value = row[position]
+        return None if value is None else convert(value)
+    return get
+
+
+def _property_getter(fget, dependencies, positions, convert):
+    computed = {}
+
+    def get(row):
+        key = tuple(row[position] for position in positions)
+        try:
+            return computed[key]
+        except KeyError:
+            value = fget(SimpleNamespace(**dict(zip(dependencies, key))))
+            value = computed[key] = None if value is None else convert(value)
+            return value
+    return get
+
+
+class FastListMixin:
+    """Serialize GET lists from ``values_list()`` rows when the serializer allows it"""
+
+    def get_values_plan(self):
+        if not getattr(settings, 'FAST_LIST_SERIALIZATION', True) or self.request.method != 'GET':
+            return None
+        return compile_plan(self.get_serializer(), self.get_queryset().model)
+
+    def serialize_list(self, queryset):
+        """The serialized rows of ``queryset``, as ``get_serializer(queryset, many=True).data`` would give"""
+        plan = self.get_values_plan()
+        if plan is None:
+            return self.get_serializer(queryset, many=True).data
+        return plan.serialize(plan.rows(queryset))
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        if paginator is None or not paginator.is_requested(request):
+            return Response(plan.serialize(plan.rows(queryset)))
+
+        # The paginator reads the ordering values from each row
+        ordering = [field for field, _descending, _nullable in paginator.get_ordering(queryset, self)]
+        page = self.paginate_queryset(queryset.values(*dict.fromkeys(plan.lookups + ordering)))
+        return self.get_paginated_response(plan.serialize(
+            [tuple(row[lookup] for lookup in plan.lookups) for row in page]
+        ))
@@ -0,0 +1,178 @@
+"""
+Sparse fieldsets and expansion for the employee read endpoints.
+
+``?fields=id,employee_name`` limits each object to the listed fields and
+``?expand=company,department`` nests the related objects (see
+``FieldsetSerializerMixin.expandable_fields``). Both apply to GET requests
+only; writes always validate and return the full representation.
+
+Views using ``FieldsetMixin`` also plan their queryset from the fields that
+will actually be serialized: only the columns those fields read are loaded
+(``only()``), and related tables are joined (``select_related()``) only
+when a selected field reads through them. Model properties declare the
+columns they need in the model's ``property_dependencies``; a field whose
+source cannot be resolved leaves the queryset untouched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _names(value):
+    return list(dict.fromkeys(name.strip() for name in (value or '').split(',') if name.strip()))
+
+
+def requested(request):
+    """``(field names or None, expansion names)`` asked for by a GET ``request``"""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, []
+    params = request.query_params
+    return _names(params.get(FIELDS_PARAM)) or None, _names(params.get(EXPAND_PARAM))
+
+
+def cache_variant(request):
+    """A stable string naming the requested fieldset, '' for the full representation"""
+    fields, expand = requested(request)
+    parts = []
+    if fields is not None:
+        parts.append(f"{FIELDS_PARAM}={','.join(sorted(fields))}")
+    if expand:
+        parts.append(f"{EXPAND_PARAM}={','.join(sorted(expand))}")
+    return ';'.join(parts)
+
+
+def select_fields(fields, requested_fields, expanded, available_expansions):
+    """
+    Narrow the serializer ``fields`` dict to ``requested_fields`` plus the
+    expanded relations, raising a 400 for unknown names.
+    """
+    unknown = [name for name in expanded if name not in available_expansions]
+    if unknown:
+        raise ValidationError({EXPAND_PARAM: [
+            f"Unknown expansion(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(available_expansions) or 'none'}."
+        ]})
+    if requested_fields is None:
+        return fields
+    unknown = [name for name in requested_fields if name not in fields]
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: [
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(fields)}."
+        ]})
+    keep = set(requested_fields) | set(expanded)
+    return {name: field for name, field in fields.items() if name in keep}
+
+
+def _add_path(model, attrs, prefix, columns, joins):
+    """Record the column (and joins) behind the attribute path ``attrs``; False if unresolvable"""
+    path_joins = set()
+    for position, attr in enumerate(attrs):
+        last = position == len(attrs) - 1
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            dependencies = getattr(model, 'property_dependencies', {}).get(attr)
+            if not last or dependencies is None:
+                return False
+            path_columns = {prefix + name for name in dependencies}
+            break
+        if field.many_to_many or field.one_to_many:
+            return False
+        if last:
+            path_columns = {prefix + attr}
+            break
+        if not field.is_relation:
+            return False
+        prefix = f'{prefix}{attr}__'
+        path_joins.add(prefix[:-2])
+        model = field.related_model
+    else:
+        return False
+    columns.update(path_columns)
+    joins.update(path_joins)
+    return True
+
+
+def _collect(serializer, model, prefix, columns, joins):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return False
+        if isinstance(field, BaseSerializer):
+            if isinstance(field, ListSerializer) or len(field.source_attrs) != 1:
+                return False
+            try:
+                relation = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return False
+            if not (relation.many_to_one or relation.one_to_one):
+                return False
+            joins.add(prefix + field.source)
+            if not _collect(field, relation.related_model, f'{prefix}{field.source}__', columns, joins):
+                return False
+        elif not _add_path(model, field.source_attrs, prefix, columns, joins):
+            return False
+    return True
+
+
+def plan_queryset(queryset, serializer, extra=()):
+    """
+    Restrict ``queryset`` to the columns and joins ``serializer`` reads.
+
+    ``extra`` lists further lookups to load, e.g. the keyset ordering the
+    paginator reads from each row; unresolvable ones are ignored.
+    """
+    model = queryset.model
+    columns, joins = set(), set()
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+    if not _collect(serializer, model, '', columns, joins):
+        return queryset
+    for lookup in extra:
+        _add_path(model, lookup.split('__'), '', columns, joins)
+    # select_related() without arguments would follow every relation
+    queryset = queryset.select_related(None)
+    if joins:
+        queryset = queryset.select_related(*sorted(joins))
+    return queryset.only(*sorted(columns))
+
+
+class FieldsetMixin:
+    """Load only what the serialized fields of a GET request need"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        if hasattr(self, 'get_keyset_ordering'):
+            ordering = self.get_keyset_ordering()
+        else:
+            ordering = getattr(self, 'keyset_ordering', ())
+        return plan_queryset(queryset, self.get_serializer(), extra=[name.lstrip('-') for name in ordering])
+
+
+class FieldsetSerializerMixin:
+    """
+    Serializer side of ``?fields=`` / ``?expand=``.
+
+    ``expandable_fields`` maps each name accepted by ``?expand=`` to the
+    serializer class used for the nested object; the name is also the
+    source relation.
+    """
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested_fields, expanded = requested(self.context.get('request'))
+        if requested_fields is None and not expanded:
+            return fields
+        for name in expanded:
+            if name in self.expandable_fields:
+                fields[name] = self.expandable_fields[name](read_only=True)
+        return select_fields(fields, requested_fields, expanded, list(self.expandable_fields))
@@ -0,0 +1,173 @@
+"""
+Per-request SQL and timing instrumentation.
+
+``InstrumentationMiddleware`` measures a sample of requests
+(``REQUEST_INSTRUMENTATION_SAMPLE_RATE``, from 0 to 1) and reports, for
+each one:
+
+- ``db``: number of SQL queries and the time spent executing them
+- ``serialize``: time in DRF serializers' ``.data`` and the values plans of
+  ``core.fast_serializers``, including any SQL their lazy querysets run
+- ``view``: time in the view itself, from ``process_view`` until it returns
+- ``render``: time rendering a DRF response after the view returned
+- ``total``: time from this middleware receiving the request until it has
+  the response
+
+as a ``Server-Timing`` header (shown in the browser's network panel) and as
+a log line on the ``core.instrumentation`` logger, with the numbers also
+attached to the record as ``extra['timings']``. Rows of a streaming
+response are produced after the response leaves the middleware and are
+not counted.
+
+With a sample rate of 0 the middleware removes itself at startup
+(``MiddlewareNotUsed``), and the serializer hook is never installed, so
+there is no per-request cost. List it last in ``MIDDLEWARE`` so ``view``
+covers the view alone.
+"""
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+
+logger = logging.getLogger(__name__)
+
+# The Timings of the request being measured, or None
+_current = ContextVar('core_instrumentation_current', default=None)
+
+
+class Timings:
+    """Accumulated durations (seconds) and the query count of one request"""
+
+    def __init__(self):
+        self.durations = {}
+        self.queries = 0
+        self._active = set()
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Time the block as ``name``; nested blocks of the same name count once"""
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.add(name, time.perf_counter() - start)
+
+    def record_query(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper()`` hook"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - start)
+
+    def as_dict(self):
+        timings = {name: round(seconds * 1000, 3) for name, seconds in self.durations.items()}
+        timings['queries'] = self.queries
+        return timings
+
+    def header(self):
+        parts = [f'db;dur={self.durations.get("db", 0.0) * 1000:.3f};desc="{self.queries} queries"']
+        for name in ('serialize', 'view', 'render', 'total'):
+            if name in self.durations:
+                parts.append(f'{name};dur={self.durations[name] * 1000:.3f}')
+        return ', '.join(parts)
+
+
+@contextmanager
+def phase(name):
+    """Time the block as ``name`` when the current request is being measured"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    with timings.phase(name):
+        yield
+
+
+_serializer_data = None
+
+
+def install_serializer_hook():
+    """Time every ``BaseSerializer.data`` access as ``serialize``; idempotent"""
+    global _serializer_data
+    if _serializer_data is not None:
+        return
+    _serializer_data = BaseSerializer.data
+
+    def data(self):
+        timings = _current.get()
+        if timings is None:
+            return _serializer_data.fget(self)
+        with timings.phase('serialize'):
+            return _serializer_data.fget(self)
+
+    BaseSerializer.data = property(data)
+
+
+class InstrumentationMiddleware:
+    def __init__(self, get_response):
+        if getattr(settings, 'REQUEST_INSTRUMENTATION_SAMPLE_RATE', 0) <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_serializer_hook()
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE:
+            return self.get_response(request)
+
+        timings = Timings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        end = time.perf_counter()
+        timings.add('total', end - start)
+        view_started = getattr(request, '_instrumentation_view_started', None)
+        view_finished = getattr(request, '_instrumentation_view_finished', None)
+        if view_started is not None:
+            timings.add('view', (view_finished or end) - view_started)
+            if view_finished is not None:
+                timings.add('render', end - view_finished)
+
+        response['Server-Timing'] = timings.header()
+        values = timings.as_dict()
+        logger.info(
+            'method=%s path=%s status=%s %s',
+            request.method, request.path, response.status_code,
+            ' '.join(f'{name}={value}' for name, value in values.items()),
+            extra={'timings': {'method': request.method, 'path': request.path,
+                               'status': response.status_code, **values}},
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if _current.get() is not None:
+            request._instrumentation_view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # Called as the view returns a DRF response, before it is rendered
+        if _current.get() is not None:
+            request._instrumentation_view_finished = time.perf_counter()
+        return response
@@ -0,0 +1,243 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+
+from core import counters, report_cache, rollups, versions
+from core.models import Company, Department, Employee
+
+
+COMPANY_WORDS = (
+    ('Northwind', 'Contoso', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne', 'Acme', 'Hooli', 'Vandelay',
+     'Soylent', 'Wonka', 'Cyberdyne', 'Tyrell', 'Aperture', 'Oscorp'),
+    ('Systems', 'Logistics', 'Health', 'Labs', 'Foods', 'Energy', 'Media', 'Partners', 'Holdings', 'Robotics',
+     'Finance', 'Retail', 'Software', 'Industries'),
+)
+# Department names and the designations of their employees
+DEPARTMENTS = {
+    'Engineering': ('Software Engineer', 'Senior Software Engineer', 'QA Engineer', 'DevOps Engineer'),
+    'Sales': ('Account Executive', 'Sales Representative', 'Sales Manager'),
+    'Marketing': ('Marketing Specialist', 'Content Writer', 'SEO Analyst'),
+    'Finance': ('Accountant', 'Financial Analyst', 'Controller'),
+    'Human Resources': ('Recruiter', 'HR Generalist', 'HR Manager'),
+    'Operations': ('Operations Analyst', 'Logistics Coordinator', 'Operations Manager'),
+    'Support': ('Support Agent', 'Support Engineer', 'Support Lead'),
+    'Legal': ('Paralegal', 'Legal Counsel'),
+    'Product': ('Product Manager', 'Product Designer', 'UX Researcher'),
+    'Data': ('Data Analyst', 'Data Engineer', 'Data Scientist'),
+}
+FIRST_NAMES = (
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth',
+    'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Carlos', 'Aisha',
+    'Wei', 'Priya', 'Mohammed', 'Yuki', 'Olga', 'Kwame', 'Sofia', 'Mateo', 'Amara', 'Lars',
+)
+LAST_NAMES = (
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee',
+    'Chen', 'Patel', 'Kim', 'Nguyen', 'Okafor', 'Ivanova', 'Sato', 'Khan', 'Silva', 'Novak',
+)
+STREETS = ('Main St', 'Oak Ave', 'Maple Dr', 'Cedar Ln', 'Park Rd', 'Elm St', 'Lake View', 'Hill Rd', 'Pine St')
+CITIES = ('Springfield', 'Riverside', 'Fairview', 'Madison', 'Georgetown', 'Clinton', 'Salem', 'Franklin')
+
+# Share of generated employees per Employee.STATUS_CHOICES value
+STATUS_WEIGHTS = {
+    'application_received': 20,
+    'interview_scheduled': 15,
+    'hired': 55,
+    'not_accepted': 10,
+}
+# Days since hiring are exponential with this mean (most hires are recent),
+# capped at MAX_TENURE_DAYS; only hired employees have a hired_on date
+MEAN_TENURE_DAYS = 700
+MAX_TENURE_DAYS = 3650
+
+EMPLOYEE_FIELDS = (
+    'company', 'department', 'employee_status', 'employee_name', 'email_address',
+    'mobile_number', 'address', 'designation', 'hired_on',
+)
+
+
+def _next_number(model):
+    # Generated names and emails are numbered past every existing row, so
+    # repeated runs never collide on the unique columns
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+@contextmanager
+def deferred_indexes(model):
+    """
+    On SQLite, drop ``model``'s non-unique secondary indexes for the block
+    and create them again when it exits.
+
+    Building an index once over the loaded rows is several times faster
+    than updating it row by row. Unique indexes stay in place so duplicates
+    are rejected as they are inserted. Use inside a transaction: SQLite DDL
+    is transactional, so a failed load rolls back to the original indexes.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA index_list({connection.ops.quote_name(table)})')
+        # (seq, name, unique, origin, partial); origin 'c' is CREATE INDEX
+        names = [row[1] for row in cursor.fetchall() if not row[2] and row[3] == 'c']
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+            [table],
+        )
+        indexes = [(name, sql) for name, sql in cursor.fetchall() if name in names]
+        for name, _sql in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    yield
+    with connection.cursor() as cursor:
+        for _name, sql in indexes:
+            cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate companies, departments, employees in every status and users "
+        "of every role; the same --seed always generates the same data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=10)
+        parser.add_argument('--departments', type=int, default=5, help="Departments per company")
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=1, help="Users per role")
+        parser.add_argument('--password', default='password123', help="Password of every generated user")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=10000, help="Rows per INSERT")
+
+    def handle(self, *args, **options):
+        if options['companies'] < 1 or options['departments'] < 1:
+            raise CommandError("--companies and --departments must be at least 1.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            if connection.vendor == 'sqlite':
+                # Room for the indexes being rebuilt (KiB; the default is 2 MiB)
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA cache_size = -262144')
+            departments = self.generate_departments(
+                self.generate_companies(options['companies']), options['departments'],
+            )
+            with deferred_indexes(Employee):
+                self.generate_employees(departments, options['employees'])
+            users = self.generate_users(options['users'], options['password'])
+
+            # None of these inserts sent signals; bring the derived tables up to date
+            counters.recount()
+            rollups.rebuild()
+            versions.bump(Employee)
+            report_cache.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {options['companies']} companies, {len(departments)} departments, "
+            f"{options['employees']} employees and {len(users)} users "
+            f"in {time.perf_counter() - start:.1f}s."
+        ))
+
+    def generate_companies(self, count):
+        number = _next_number(Company)
+        first, second = COMPANY_WORDS
+        companies = [
+            Company(company_name=f'{self.rng.choice(first)} {self.rng.choice(second)} {number + i}')
+            for i in range(count)
+        ]
+        return Company.objects.bulk_create(companies, batch_size=self.batch_size)
+
+    def generate_departments(self, companies, per_company):
+        names = list(DEPARTMENTS)
+        departments = []
+        for company in companies:
+            for i in range(per_company):
+                # Past the named departments, repeat them numbered ("Sales 2")
+                name = names[i % len(names)]
+                if i >= len(names):
+                    name = f'{name} {i // len(names) + 1}'
+                department = Department(company=company, department_name=name)
+                department.designations = DEPARTMENTS[names[i % len(names)]]
+                departments.append(department)
+        return Department.objects.bulk_create(departments, batch_size=self.batch_size)
+
+    def generate_employees(self, departments, count):
+        """
+        Insert ``count`` employees, ``--batch-size`` rows per ``executemany()``.
+
+        Plain tuples rather than ``bulk_create()``: building and compiling a
+        model instance per row takes several times longer than the inserts.
+        """
+        rng = self.rng
+        number = _next_number(Employee)
+        statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(Employee._meta.db_table),
+            ', '.join(quote(Employee._meta.get_field(name).column) for name in EMPLOYEE_FIELDS),
+            ', '.join(['%s'] * len(EMPLOYEE_FIELDS)),
+        )
+        today = date.today()
+        hire_dates = [
+            connection.ops.adapt_datefield_value(today - timedelta(days=days))
+            for days in range(MAX_TENURE_DAYS + 1)
+        ]
+
+        for chunk_start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - chunk_start)
+            chunk_departments = rng.choices(departments, k=size)
+            chunk_statuses = rng.choices(statuses, weights, k=size)
+            first_names = rng.choices(FIRST_NAMES, k=size)
+            last_names = rng.choices(LAST_NAMES, k=size)
+            streets = rng.choices(STREETS, k=size)
+            cities = rng.choices(CITIES, k=size)
+            rows = []
+            for i in range(size):
+                department = chunk_departments[i]
+                first, last = first_names[i], last_names[i]
+                employee_status = chunk_statuses[i]
+                hired_on = None
+                if employee_status == 'hired':
+                    hired_on = hire_dates[min(int(rng.expovariate(1 / MEAN_TENURE_DAYS)), MAX_TENURE_DAYS)]
+                rows.append((
+                    department.company_id,
+                    department.id,
+                    employee_status,
+                    f'{first} {last}',
+                    f'{first.lower()}.{last.lower()}{number + chunk_start + i}@example.com',
+                    f'+1{rng.randrange(2000000000, 9999999999)}',
+                    f'{rng.randrange(1, 9999)} {streets[i]}, {cities[i]}',
+                    rng.choice(department.designations),
+                    hired_on,
+                ))
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            self.stdout.write(f"Employees: {chunk_start + size}/{count}", ending='\r')
+        if count:
+            self.stdout.write('')
+
+    def generate_users(self, per_role, password):
+        User = get_user_model()
+        number = _next_number(User)
+        # Hashing is deliberately slow; every user shares the one hash
+        password = make_password(password)
+        users = []
+        for role, _label in User.ROLE_CHOICES:
+            for _ in range(per_role):
+                username = f'{role}{number + len(users)}'
+                users.append(User(
+                    username=username, email=f'{username}@example.com', password=password,
+                    first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES), role=role,
+                ))
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
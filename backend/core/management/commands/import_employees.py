@@ -0,0 +1,211 @@
+import csv
+import hashlib
+import io
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import bulk
+from core.models import Company, Department, Employee, ImportProgress
+
+
+COLUMNS = (
+    'employee_name', 'email_address', 'mobile_number', 'address', 'designation',
+    'employee_status', 'hired_on', 'company_name', 'department_name',
+)
+# Left out of the row when blank, so the serializer's defaults apply
+OPTIONAL_COLUMNS = ('employee_status', 'hired_on')
+
+
+def _checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _name_key(name):
+    """Names match ignoring case and runs of whitespace"""
+    return ' '.join((name or '').split()).casefold()
+
+
+def _error_text(errors):
+    messages = []
+    for field, field_errors in errors.items():
+        for message in field_errors:
+            messages.append(message if field == 'non_field_errors' else f'{field}: {message}')
+    return '; '.join(messages)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import employees from a CSV file with the columns employee_name, email_address, "
+        "mobile_number, address, designation, company_name and department_name (optionally "
+        "employee_status and hired_on). Rows are validated like the employee API, valid rows are "
+        "committed in chunks and rejected rows are written to an error CSV. An interrupted import "
+        "resumes after its last committed chunk when run again on the same file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument(
+            '--chunk-size', type=int, default=bulk.DEFAULT_CHUNK_SIZE,
+            help=f"Rows validated and committed per transaction (default: {bulk.DEFAULT_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            '--errors', default=None,
+            help="CSV file for the rejected rows (default: <csv_file>.errors.csv)",
+        )
+        parser.add_argument('--encoding', default='utf-8-sig')
+        parser.add_argument('--delimiter', default=',')
+        parser.add_argument(
+            '--restart', action='store_true',
+            help="Start from the first row even if this file was (partly) imported before",
+        )
+
+    def handle(self, *args, **options):
+        path = options['csv_file']
+        if not os.path.isfile(path):
+            raise CommandError(f"{path} does not exist.")
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        errors_path = options['errors'] or f'{path}.errors.csv'
+        started = time.monotonic()
+
+        # Keyed by contents: the same file resumes under any name, an edited one starts over
+        progress, _created = ImportProgress.objects.get_or_create(
+            checksum=_checksum(path), defaults={'file_name': os.path.basename(path)},
+        )
+        if options['restart']:
+            progress.rows_done = progress.imported = progress.rejected = progress.errors_size = 0
+            progress.finished = False
+        if progress.finished:
+            self.stdout.write(
+                f"{path} was already imported ({progress.imported} employees, {progress.rejected} rejected); "
+                f"use --restart to import it again."
+            )
+            return
+        if progress.rows_done:
+            self.stdout.write(f"Resuming after row {progress.rows_done}.")
+
+        # Loaded once; rows name their company and department
+        self.companies = Company.objects.in_bulk()
+        self.company_ids = {}
+        for company in sorted(self.companies.values(), key=lambda company: company.pk):
+            self.company_ids.setdefault(_name_key(company.company_name), company.pk)
+        self.departments = Department.objects.in_bulk()
+        self.department_ids = {}
+        for department in sorted(self.departments.values(), key=lambda department: department.pk):
+            self.department_ids.setdefault(
+                (department.company_id, _name_key(department.department_name)), department.pk,
+            )
+
+        with open(path, newline='', encoding=options['encoding']) as source, \
+                open(errors_path, 'r+b' if os.path.exists(errors_path) else 'w+b') as errors_file:
+            reader = csv.DictReader(source, delimiter=options['delimiter'])
+            missing = [column for column in COLUMNS
+                       if column not in OPTIONAL_COLUMNS and column not in (reader.fieldnames or ())]
+            if missing:
+                raise CommandError(f"{path} is missing the columns: {', '.join(missing)}.")
+
+            # Drop what a crashed run wrote after its last committed chunk
+            errors_file.truncate(progress.errors_size)
+            errors_file.seek(progress.errors_size)
+            if not progress.errors_size:
+                self.write_rows(errors_file, [['line', *reader.fieldnames, 'errors']])
+
+            records = ((reader.line_num, record) for record in reader)
+            records = islice(records, progress.rows_done, None)
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, progress, reader.fieldnames, errors_file)
+                self.stdout.write(f"Rows: {progress.rows_done}", ending='\r')
+
+        progress.finished = True
+        progress.save()
+        elapsed = time.monotonic() - started
+        summary = f"Imported {progress.imported} employees from {path} in {elapsed:.1f}s."
+        if progress.rejected:
+            self.stdout.write(self.style.WARNING(
+                f"{summary} {progress.rejected} rows were rejected; see {errors_path}."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def write_rows(self, errors_file, rows):
+        text = io.StringIO()
+        csv.writer(text).writerows(rows)
+        errors_file.write(text.getvalue().encode('utf-8'))
+        errors_file.flush()
+        os.fsync(errors_file.fileno())
+
+    def import_chunk(self, chunk, progress, fieldnames, errors_file):
+        rejected = []
+        candidates = []
+        seen_emails = {}
+        for line, record in chunk:
+            data, errors = self.to_data(record)
+            email = (data or {}).get('email_address', '').strip().lower()
+            if not errors and email in seen_emails:
+                errors = {'email_address': [f"Duplicate email address (line {seen_emails[email]})."]}
+            if errors:
+                rejected.append((line, record, errors))
+                continue
+            if email:
+                seen_emails[email] = line
+            candidates.append((line, record, data))
+
+        rows = [data for _line, _record, data in candidates]
+        context = {
+            'companies': self.companies,
+            'departments': self.departments,
+            'emails_in_use': bulk.emails_in_use(rows),
+        }
+        validated, errors = bulk.validate_rows(rows, context)
+        for error in errors:
+            line, record, _data = candidates[error['index']]
+            rejected.append((line, record, error['errors']))
+        rejected.sort(key=lambda rejection: rejection[0])
+
+        # Written before the chunk commits: a crash in between is undone by
+        # truncating to the committed errors_size on resume
+        self.write_rows(errors_file, [
+            [line, *(record.get(name) for name in fieldnames), _error_text(errors)]
+            for line, record, errors in rejected
+        ])
+
+        employees = [Employee(**data) for _index, _instance, data in validated]
+        with transaction.atomic():
+            bulk.insert_employees(employees)
+            progress.rows_done += len(chunk)
+            progress.imported += len(employees)
+            progress.rejected += len(rejected)
+            progress.errors_size = errors_file.tell()
+            progress.save()
+
+    def to_data(self, record):
+        """The serializer input for a CSV record, or errors when its company/department is unknown"""
+        data = {column: (record.get(column) or '') for column in COLUMNS}
+        for column in OPTIONAL_COLUMNS:
+            if not data[column].strip():
+                del data[column]
+
+        company_id = self.company_ids.get(_name_key(data.pop('company_name')))
+        department_name = data.pop('department_name')
+        if company_id is None:
+            return None, {'company_name': [f"Unknown company \"{record.get('company_name')}\"."]}
+        department_id = self.department_ids.get((company_id, _name_key(department_name)))
+        if department_id is None:
+            return None, {'department_name': [
+                f"Unknown department \"{department_name}\" in company \"{record.get('company_name')}\"."
+            ]}
+        data['company'] = company_id
+        data['department'] = department_id
+        return data, None
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core import rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the hiring rollup tables from the employee table"
+
+    def handle(self, *args, **options):
+        written = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt hiring rollups: {written} rows."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored company/department headcount counters and repair drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only report rows whose counters are out of date",
+        )
+
+    def handle(self, *args, **options):
+        companies, departments = counters.find_drift()
+        stale_companies = list(companies.values_list('pk', flat=True))
+        stale_departments = list(departments.values_list('pk', flat=True))
+
+        self.stdout.write(
+            f"Found {len(stale_companies)} companies and "
+            f"{len(stale_departments)} departments with stale counters."
+        )
+        if options['dry_run'] or not (stale_companies or stale_departments):
+            return
+
+        counters.recount(company_ids=stale_companies, department_ids=stale_departments)
+        self.stdout.write(self.style.SUCCESS("Counters repaired."))
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:25
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, fk_name):
+    counts = queryset.filter(**{fk_name: OuterRef('pk')}).order_by().values(fk_name).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    Company = apps.get_model('core', 'Company')
+    Department = apps.get_model('core', 'Department')
+    Employee = apps.get_model('core', 'Employee')
+    Company.objects.update(
+        number_of_departments=_count(Department.objects.all(), 'company'),
+        number_of_employees=_count(Employee.objects.all(), 'company'),
+    )
+    Department.objects.update(
+        number_of_employees=_count(Employee.objects.all(), 'department'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_employee_email_address_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='number_of_departments',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='number_of_employees',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='number_of_employees',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+
+# FTS5 index over the searchable employee columns (SQLite only, see
+# core/search.py). External-content table: the text lives in core_employee,
+# the triggers below keep the index in step with every write.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS core_employee_fts USING fts5(
+        employee_name, email_address, designation, address,
+        content='core_employee', content_rowid='id',
+        tokenize='unicode61', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_employee_fts_insert AFTER INSERT ON core_employee BEGIN
+        INSERT INTO core_employee_fts(rowid, employee_name, email_address, designation, address)
+        VALUES (new.id, new.employee_name, new.email_address, new.designation, new.address);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_employee_fts_delete AFTER DELETE ON core_employee BEGIN
+        INSERT INTO core_employee_fts(core_employee_fts, rowid, employee_name, email_address, designation, address)
+        VALUES ('delete', old.id, old.employee_name, old.email_address, old.designation, old.address);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_employee_fts_update AFTER UPDATE OF
+        employee_name, email_address, designation, address ON core_employee BEGIN
+        INSERT INTO core_employee_fts(core_employee_fts, rowid, employee_name, email_address, designation, address)
+        VALUES ('delete', old.id, old.employee_name, old.email_address, old.designation, old.address);
+        INSERT INTO core_employee_fts(rowid, employee_name, email_address, designation, address)
+        VALUES (new.id, new.employee_name, new.email_address, new.designation, new.address);
+    END
+    """,
+    "INSERT INTO core_employee_fts(core_employee_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS core_employee_fts_update",
+    "DROP TRIGGER IF EXISTS core_employee_fts_delete",
+    "DROP TRIGGER IF EXISTS core_employee_fts_insert",
+    "DROP TABLE IF EXISTS core_employee_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_counter_cache_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
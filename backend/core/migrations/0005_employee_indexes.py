@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:39
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+import django.db.models.functions.text
+
+
+def check_case_insensitive_emails(apps, schema_editor):
+    """Fail with a readable message instead of an IntegrityError on duplicates"""
+    Employee = apps.get_model('core', 'Employee')
+    duplicates = list(
+        Employee.objects.annotate(email_lower=Lower('email_address'))
+        .values('email_lower').annotate(total=Count('id')).filter(total__gt=1)
+        .values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Cannot add the case-insensitive unique constraint on Employee.email_address; "
+            "these addresses are used more than once (ignoring case): " + ", ".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_employee_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['department_name'], name='core_dept_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['employee_name'], name='core_emp_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['company', 'department', 'employee_status'], name='core_emp_co_dept_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['employee_status', 'company', 'department', 'employee_name'], name='core_emp_status_report_idx'),
+        ),
+        migrations.RunPython(check_case_insensitive_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email_address'), name='core_emp_email_ci_unique'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:57
+
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Employee = apps.get_model('core', 'Employee')
+    HiringRollup = apps.get_model('core', 'HiringRollup')
+    hired = Employee.objects.filter(employee_status='hired', hired_on__isnull=False).order_by()
+    rows = []
+    for period_type, period in (('day', F('hired_on')), ('month', TruncMonth('hired_on'))):
+        periods = hired.annotate(period=period)
+        for scope, group_by in (('all', None), ('company', 'company_id'), ('department', 'department_id')):
+            fields = ['period'] + ([group_by] if group_by else [])
+            for group in periods.values(*fields).annotate(hires=Count('id')):
+                rows.append(HiringRollup(
+                    period_type=period_type, scope=scope, scope_id=group[group_by] if group_by else 0,
+                    period_start=group['period'], hires=group['hires'],
+                ))
+    HiringRollup.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_table_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HiringRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_type', models.CharField(choices=[('day', 'Day'), ('month', 'Month')], max_length=5)),
+                ('scope', models.CharField(choices=[('all', 'All'), ('company', 'Company'), ('department', 'Department')], max_length=10)),
+                ('scope_id', models.PositiveBigIntegerField(default=0)),
+                ('period_start', models.DateField()),
+                ('hires', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='hiringrollup',
+            constraint=models.UniqueConstraint(fields=('period_type', 'scope', 'scope_id', 'period_start'), name='core_rollup_period_unique'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_import_progress'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['employee_status', 'hired_on'], name='core_emp_status_hired_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['company', 'employee_status', 'hired_on'], name='core_emp_co_status_hired_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_employee_tenure_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchIndex',
+            fields=[
+                ('employee', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='core.employee')),
+                ('document', models.TextField(db_column='core_employee_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'core_employee_fts',
+                'managed': False,
+            },
+        ),
+    ]
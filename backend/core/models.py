@@ -1,46 +1,93 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import date
 
+from employee_management.mixins import TrackLoadedValuesMixin
+
 # Create your models here.
 
-class Company(models.Model):
+class AtomicSaveMixin:
+    """Save the row and the state core.signals derives from it in one transaction.
+
+    ``Model.save()`` sends ``post_save`` after its own write, outside any
+    transaction, so the counters, rollups and table versions the handlers
+    update would otherwise commit separately from the row. Deletes need
+    nothing extra: the deletion collector already sends ``post_delete``
+    inside its transaction.
+    """
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class CounterCacheMixin:
+    """Never write the counter-cache columns back from a stale in-memory copy.
+
+    The counters are only changed through core.counters, so ordinary updates
+    save every other concrete field.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Company(TrackLoadedValuesMixin, AtomicSaveMixin, CounterCacheMixin, models.Model):
     company_name = models.CharField(max_length=200, unique=True)
-    
-    @property
-    def number_of_departments(self):
-        return self.departments.count()
+    # Counter caches maintained by core.signals / core.counters
+    number_of_departments = models.PositiveIntegerField(default=0, editable=False)
+    number_of_employees = models.PositiveIntegerField(default=0, editable=False)
 
-    @property
-    def number_of_employees(self):
-        return self.employees.count()
+    counter_fields = ('number_of_departments', 'number_of_employees')
     
     def __str__(self):
         return self.company_name
 
 
-class Department(models.Model):
+class Department(TrackLoadedValuesMixin, AtomicSaveMixin, CounterCacheMixin, models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='departments')
     department_name = models.CharField(max_length=200)
-    
-    @property
-    def number_of_employees(self):
-        return self.employees.count()
+    # Counter cache maintained by core.signals / core.counters
+    number_of_employees = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('number_of_employees',)
 
     class Meta:
         unique_together = ['company', 'department_name']
+        indexes = [
+            # Department list keyset ordering
+            models.Index(fields=['department_name'], name='core_dept_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.department_name} - {self.company.company_name}"
 
 
-class Employee(models.Model):
+class Employee(TrackLoadedValuesMixin, AtomicSaveMixin, models.Model):
     STATUS_CHOICES = [
         ('application_received', 'Application Received'),
         ('interview_scheduled', 'Interview Scheduled'),
         ('hired', 'Hired'),
         ('not_accepted', 'Not Accepted'),
     ]
+    # Status workflow: the statuses each status may change to
+    ALLOWED_TRANSITIONS = {
+        'application_received': ['interview_scheduled', 'not_accepted'],
+        'interview_scheduled': ['hired', 'not_accepted'],
+        'hired': [],  # Once hired, cannot change status
+        'not_accepted': [],  # Once not accepted, cannot change status
+    }
 
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='employees')
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='employees')
@@ -52,6 +99,29 @@ class Employee(models.Model):
     designation = models.CharField(max_length=200, help_text="Position/Title")
     hired_on = models.DateField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Employee list keyset ordering
+            models.Index(fields=['employee_name'], name='core_emp_name_idx'),
+            # company/department/status filters on the employee list
+            models.Index(fields=['company', 'department', 'employee_status'], name='core_emp_co_dept_status_idx'),
+            # Status filter and the hired report (status, company, department, name)
+            models.Index(
+                fields=['employee_status', 'company', 'department', 'employee_name'],
+                name='core_emp_status_report_idx',
+            ),
+            # Tenure filters and ordering (core.tenure), overall and per company
+            models.Index(fields=['employee_status', 'hired_on'], name='core_emp_status_hired_idx'),
+            models.Index(fields=['company', 'employee_status', 'hired_on'], name='core_emp_co_status_hired_idx'),
+        ]
+        constraints = [
+            # Emails are unique regardless of case; also serves the duplicate check
+            models.UniqueConstraint(Lower('email_address'), name='core_emp_email_ci_unique'),
+        ]
+
+    # Columns read by properties, for the query planning in core.fieldsets
+    property_dependencies = {'days_employed': ('hired_on', 'employee_status')}
+
     @property
     def days_employed(self):
         if self.hired_on and self.employee_status == 'hired':
@@ -60,3 +130,107 @@ class Employee(models.Model):
 
     def __str__(self):
         return f"{self.employee_name} - {self.company.company_name}"
+
+
+class EmployeeSearchIndex(models.Model):
+    """The FTS5 index over employees used by core.search (SQLite only).
+
+    Created by migration 0004 and kept in sync by triggers on core_employee;
+    this unmanaged model only lets the ORM join it for the match and rank.
+    """
+    employee = models.OneToOneField(
+        Employee, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='search_index',
+    )
+    # FTS5's hidden column named after the table: the left operand of MATCH
+    document = models.TextField(db_column='core_employee_fts')
+    # bm25() score; negative, lower is better
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'core_employee_fts'
+
+
+class TableVersion(models.Model):
+    """Change counter for one model's table, bumped by core.versions on every write.
+
+    The list/detail views derive their ETag and Last-Modified headers from
+    these rows instead of from the data itself.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class HiringRollup(models.Model):
+    """Hired employees per hire day/month, overall and per company/department.
+
+    One row counts the employees currently in the ``hired`` status whose
+    ``hired_on`` falls in the period, within one scope: everyone
+    (``scope_id`` 0), one company or one department. Each scope is stored
+    separately so a query only reads the rows of the scope it asks for.
+    Maintained incrementally by core.rollups; ``rebuild_rollups`` recomputes
+    it from scratch.
+    """
+    DAY = 'day'
+    MONTH = 'month'
+    PERIOD_CHOICES = [
+        (DAY, 'Day'),
+        (MONTH, 'Month'),
+    ]
+    ALL = 'all'
+    COMPANY = 'company'
+    DEPARTMENT = 'department'
+    SCOPE_CHOICES = [
+        (ALL, 'All'),
+        (COMPANY, 'Company'),
+        (DEPARTMENT, 'Department'),
+    ]
+
+    period_type = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    # Company or department id for those scopes, 0 for ALL. Not a foreign
+    # key: rows of deleted companies/departments are drained by the employee
+    # deletes and removed by rebuild_rollups.
+    scope_id = models.PositiveBigIntegerField(default=0)
+    period_start = models.DateField()
+    hires = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index every rollup query range-scans
+            models.UniqueConstraint(
+                fields=['period_type', 'scope', 'scope_id', 'period_start'],
+                name='core_rollup_period_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.scope_id} {self.period_type} {self.period_start}: {self.hires}"
+
+
+class ImportProgress(models.Model):
+    """Checkpoint of a ``manage.py import_employees`` run over one CSV file.
+
+    Saved in the same transaction as each chunk of employees, so after a
+    crash the import resumes right after the last committed chunk: no row is
+    imported twice or skipped. ``errors_size`` is how many bytes of the
+    error file belong to committed chunks; anything after it is discarded
+    on resume.
+    """
+    # SHA-256 of the file's contents
+    checksum = models.CharField(max_length=64, primary_key=True)
+    file_name = models.CharField(max_length=500)
+    rows_done = models.PositiveBigIntegerField(default=0)
+    imported = models.PositiveBigIntegerField(default=0)
+    rejected = models.PositiveBigIntegerField(default=0)
+    errors_size = models.PositiveBigIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.file_name}: {self.rows_done} rows"
@@ -0,0 +1,282 @@
+"""
+Keyset (cursor) pagination for the core list endpoints.
+
+Pages are addressed by the ordering values of the last row seen instead of an
+OFFSET, so fetching page N costs the same as fetching page 1 as long as the
+ordering is backed by an index. Every ordering ends with ``id`` to keep it
+stable when the leading key has duplicates.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import F, Max, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on an ``(ordering key, ..., id)`` tuple.
+
+    Views declare their order with a ``keyset_ordering`` attribute (or a
+    ``get_keyset_ordering()`` method), e.g. ``('employee_name', 'id')``; a
+    leading ``-`` sorts descending. NULLs sort last in both directions.
+
+    Pagination is opt-in per request so existing clients keep receiving plain
+    lists: it only applies when ``cursor`` or ``page_size`` is present.
+    ``?total=estimate`` adds a cheap estimated row count, ``?total=exact`` a
+    real ``COUNT(*)``.
+    """
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request):
+        """Pagination is opt-in: only requests sending a cursor or page size get pages"""
+        return (self.cursor_query_param in request.query_params
+                or self.page_size_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        position, reverse = self.decode_cursor(request, queryset.model)
+        self.total = self.get_total(queryset, request, view)
+
+        ordering = [(field, not descending if reverse else descending, nullable)
+                    for field, descending, nullable in self.ordering]
+        queryset = queryset.order_by(*[self._order_expression(key, reverse) for key in ordering])
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Moving backwards, the extra row tells us whether there is a
+        # previous page; a next page always exists since we came from it.
+        if reverse:
+            self.has_previous, self.has_next = has_more, position is not None
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+        self.first_position = self._position(rows[0]) if rows else position
+        self.last_position = self._position(rows[-1]) if rows else position
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, queryset, view):
+        """Return ``[(field, descending, nullable), ...]`` always ending in ``id``"""
+        if hasattr(view, 'get_keyset_ordering'):
+            ordering = view.get_keyset_ordering()
+        else:
+            ordering = getattr(view, 'keyset_ordering', ('id',))
+        ordering = [name for name in ordering if name.lstrip('-') not in ('id', 'pk')] + [
+            next((name for name in ordering if name.lstrip('-') in ('id', 'pk')), 'id')
+        ]
+
+        keys = []
+        for name in ordering:
+            field = name.lstrip('-')
+            keys.append((field, name.startswith('-'), self._is_nullable(queryset.model, field)))
+        return keys
+
+    def get_total(self, queryset, request, view):
+        mode = request.query_params.get(self.total_query_param)
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            estimate = None
+            if hasattr(view, 'estimate_total'):
+                estimate = view.estimate_total(queryset)
+            if estimate is None and not queryset.query.where:
+                estimate = estimate_table_rows(queryset.model, queryset.db)
+            return estimate
+        return None
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.request.query_params.get(self.total_query_param) in ('exact', 'estimate'):
+            payload['total'] = self.total
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'total': {'type': 'integer', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, default=_json_default, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model=None):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            position, reverse = payload['p'], bool(payload.get('r'))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            if model is not None:
+                position = [
+                    self._to_python(model, field, nullable, value)
+                    for (field, _descending, nullable), value in zip(self.ordering, position)
+                ]
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _position(self, row):
+        return [_lookup(row, field) for field, _descending, _nullable in self.ordering]
+
+    @staticmethod
+    def _order_expression(key, reverse):
+        field, descending, nullable = key
+        expression = F(field).desc if descending else F(field).asc
+        if not nullable:
+            return expression()
+        # NULLs stay last when walking forwards, so they come first backwards
+        if reverse:
+            return expression(nulls_first=True)
+        return expression(nulls_last=True)
+
+    @staticmethod
+    def _after(ordering, position, reverse):
+        """Build ``(k1, k2, ...) > (v1, v2, ...)`` for the given sort directions"""
+        condition = Q()
+        equal_so_far = Q()
+        for (field, descending, nullable), value in zip(ordering, position):
+            nulls_last = not reverse
+            if value is None:
+                after = Q(**{f'{field}__isnull': False}) if not nulls_last else None
+                equal = Q(**{f'{field}__isnull': True})
+            else:
+                after = Q(**{f'{field}__lt' if descending else f'{field}__gt': value})
+                if nullable and nulls_last:
+                    after |= Q(**{f'{field}__isnull': True})
+                equal = Q(**{field: value})
+            if after is not None:
+                condition |= equal_so_far & after
+            equal_so_far &= equal
+        if not condition:
+            return Q(pk__in=[])
+        return condition
+
+    @staticmethod
+    def _to_python(model, field, nullable, value):
+        """A cursor value as its model field's Python type; raises on a value the field cannot hold"""
+        if value is None:
+            if not nullable:
+                raise ValueError
+            return None
+        # Cursors only ever hold scalars
+        if not isinstance(value, (int, float, str)):
+            raise TypeError
+        try:
+            model_field = _model_field(model, field)
+        except (FieldDoesNotExist, AttributeError):
+            model_field = None
+        # Annotations (e.g. the search rank) are kept as they are
+        return model_field.to_python(value) if model_field is not None else value
+
+    @staticmethod
+    def _is_nullable(model, field):
+        try:
+            return _model_field(model, field).null
+        except (FieldDoesNotExist, AttributeError):
+            # Annotations and expressions may be NULL
+            return True
+
+
+def estimate_table_rows(model, using='default'):
+    """
+    Cheap row-count estimate for a whole table.
+
+    PostgreSQL exposes the planner's statistics; elsewhere the highest primary
+    key is an index-only upper bound that is close enough for page counters.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+    return model._default_manager.using(using).aggregate(estimate=Max('pk'))['estimate'] or 0
+
+
+def _model_field(model, field):
+    """The model field behind a ``__`` lookup path"""
+    for part in field.split('__')[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(field.split('__')[-1])
+
+
+def _lookup(row, field):
+    if isinstance(row, dict):
+        value = row[field]
+    else:
+        value = row
+        for part in field.split('__'):
+            value = getattr(value, part, None)
+            if value is None:
+                break
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
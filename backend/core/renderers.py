@@ -0,0 +1,110 @@
+import csv
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional; FastJSONRenderer then behaves like JSONRenderer
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` encoding with orjson when it is installed.
+
+    The output is byte-for-byte what ``JSONRenderer`` produces, except that
+    floats in exponent notation are spelled ``1e16`` rather than ``1e+16``
+    (the same value). Dates, times, Decimals, lazy strings and other
+    non-JSON types go through DRF's encoder. Indented (``; indent=``) or
+    ASCII-only output, and anything orjson rejects (non-string keys,
+    oversized integers), is left to ``JSONRenderer`` itself.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(
+                data, default=self.encoder_class().default, option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer escapes these for embedding in <script> tags
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer"""
+    def write(self, value):
+        return value
+
+
+class TabularRenderer(BaseRenderer):
+    """
+    Base for row-oriented formats.
+
+    ``render()`` handles ordinary, already materialised responses; error
+    bodies become one ``field, message`` row per message. Views stream large
+    results through ``stream()`` instead.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None and response.exception:
+            data = _error_rows(data)
+        if data is None:
+            rows = []
+        elif isinstance(data, dict):
+            rows = [data]
+        else:
+            rows = list(data)
+        header = list(rows[0].keys()) if rows else []
+        lines = self.stream(header, ([row.get(name) for name in header] for row in rows))
+        return ''.join(lines).encode(self.charset)
+
+    def stream(self, header, rows):
+        """Yield the rendered text piece by piece; ``rows`` are sequences in ``header`` order"""
+        raise NotImplementedError('.stream() must be implemented.')
+
+
+def _error_rows(detail, field=None):
+    """
+    Flatten an error response body into ``{'field', 'message'}`` rows, with
+    nested fields joined by dots and plain strings instead of reprs
+    """
+    if isinstance(detail, dict):
+        return [
+            row for name, value in detail.items()
+            for row in _error_rows(value, name if field is None else f'{field}.{name}')
+        ]
+    if isinstance(detail, (list, tuple)):
+        return [row for value in detail for row in _error_rows(value, field)]
+    return [{'field': field or '', 'message': str(detail)}]
+
+
+class CSVRenderer(TabularRenderer):
+    """Render a list of flat objects as CSV with a header line"""
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def stream(self, header, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+
+class NDJSONRenderer(TabularRenderer):
+    """Render a list of objects as newline-delimited JSON, one object per line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def stream(self, header, rows):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(header, row))) + '\n'
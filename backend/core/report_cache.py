@@ -0,0 +1,131 @@
+"""
+Cache for the hired-employee report.
+
+The report is stored, serialized or already rendered (see ``variant``), in the Django cache named by the
+``EMPLOYEE_REPORT_CACHE`` setting (``None`` disables caching) under a key
+built from the ``REPORT`` version counter in ``core.versions`` and today's
+date (``days_employed`` changes at midnight). The counter is bumped, inside
+the writing transaction, only by writes that change the report: a hired
+employee added, changed or removed (or an employee leaving/entering the
+hired status), or a company/department with hired employees renamed. Stale
+entries are never read again and simply expire.
+
+Because the key comes from the database, per-process caches such as locmem
+stay correct across workers; a shared backend (file, database, redis) just
+means one rebuild per change instead of one per worker.
+
+Concurrent misses are coalesced with a short-lived lock taken with
+``cache.add``: one request rebuilds while the others wait for its result,
+and rebuild themselves only if it does not arrive in time.
+
+``acache_key()`` and ``aget_or_build()`` are the same for async views
+(``core.async_views``), using the async cache and ORM APIs.
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import versions
+
+
+REPORT = 'core.employee_report'
+
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+
+def invalidate():
+    """Mark the cached report as stale"""
+    versions.bump(REPORT)
+
+
+def get_cache():
+    alias = getattr(settings, 'EMPLOYEE_REPORT_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def cache_key(today, variant='data'):
+    return _key(today, variant, *versions.current(REPORT))
+
+
+async def acache_key(today, variant='data'):
+    return _key(today, variant, *await versions.acurrent(REPORT))
+
+
+def _key(today, variant, table_versions, updated_at):
+    # updated_at keeps keys unique if the counter is ever reset (restores, test rollbacks)
+    stamp = updated_at.timestamp() if updated_at else 0
+    return f'core:employee-report:{variant}:{table_versions[REPORT]}:{stamp}:{today.isoformat()}'
+
+
+def get_or_build(today, build, variant='data'):
+    """
+    Return the cached report for ``today``, calling ``build()`` on a miss.
+
+    ``variant`` names the representation ``build()`` produces, e.g. the
+    serialized rows or the rendered JSON body for one media type.
+    """
+    cache = get_cache()
+    if cache is None:
+        return build()
+
+    key = cache_key(today, variant)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    lock_key = f'{key}:lock'
+    locked = cache.add(lock_key, True, LOCK_TIMEOUT)
+    if not locked:
+        # Another request is rebuilding this key; wait for its result
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            data = cache.get(key)
+            if data is not None:
+                return data
+            if cache.get(lock_key) is None:
+                break
+
+    try:
+        data = build()
+        cache.set(key, data, getattr(settings, 'EMPLOYEE_REPORT_CACHE_TIMEOUT', 3600))
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return data
+
+
+async def aget_or_build(today, build, variant='data'):
+    """Async version of ``get_or_build()``; ``build`` is a coroutine function"""
+    cache = get_cache()
+    if cache is None:
+        return await build()
+
+    key = await acache_key(today, variant)
+    data = await cache.aget(key)
+    if data is not None:
+        return data
+
+    lock_key = f'{key}:lock'
+    locked = await cache.aadd(lock_key, True, LOCK_TIMEOUT)
+    if not locked:
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            data = await cache.aget(key)
+            if data is not None:
+                return data
+            if await cache.aget(lock_key) is None:
+                break
+
+    try:
+        data = await build()
+        await cache.aset(key, data, getattr(settings, 'EMPLOYEE_REPORT_CACHE_TIMEOUT', 3600))
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+    return data
@@ -0,0 +1,295 @@
+"""
+Hiring rollups: hired employees per hire day/month, overall and per
+company/department.
+
+``HiringRollup`` rows count the employees currently in the ``hired`` status
+by the day and month of their ``hired_on`` date, once for every scope the
+employee belongs to (all, their company, their department). Single-row saves and
+deletes keep them current through the handlers in ``core.signals``; code
+that bypasses model signals (``bulk_create``, ``QuerySet.update``) must call
+``employee_changed()`` for every row it wrote, ideally inside ``deferred()``.
+
+Hires per period, headcount over time and tenure buckets are all answered
+from these rows, so analytics never scan the employee table.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth
+
+from .models import Employee, HiringRollup
+
+
+# Pending {(period_type, scope, scope_id, period_start): delta}, or None
+_pending = ContextVar('core_rollups_pending', default=None)
+
+# Rollup rows per statement, keeping the parameters under SQLite's limit of 999
+_BATCH_SIZE = 100
+
+# (label, minimum days, maximum days or None) as of today
+TENURE_BUCKETS = (
+    ('0-90 days', 0, 90),
+    ('91-365 days', 91, 365),
+    ('1-2 years', 366, 730),
+    ('2-5 years', 731, 1826),
+    ('5+ years', 1827, None),
+)
+
+
+def rollup_key(employee_status, hired_on, company_id, department_id):
+    """What an employee contributes to the rollups: None unless hired with a date"""
+    if employee_status != 'hired' or hired_on is None:
+        return None
+    # Instances created in code may still hold an ISO string until reloaded
+    return (Employee._meta.get_field('hired_on').to_python(hired_on), company_id, department_id)
+
+
+def _scopes(company_id, department_id):
+    return (
+        (HiringRollup.ALL, 0),
+        (HiringRollup.COMPANY, company_id),
+        (HiringRollup.DEPARTMENT, department_id),
+    )
+
+
+def employee_changed(old_key, new_key):
+    """Move one employee's contribution from ``old_key`` to ``new_key``"""
+    if old_key == new_key:
+        return
+    deltas = Counter()
+    for key, delta in ((old_key, -1), (new_key, 1)):
+        if key is None:
+            continue
+        hired_on, company_id, department_id = key
+        for scope, scope_id in _scopes(company_id, department_id):
+            deltas[(HiringRollup.DAY, scope, scope_id, hired_on)] += delta
+            deltas[(HiringRollup.MONTH, scope, scope_id, hired_on.replace(day=1))] += delta
+
+    pending = _pending.get()
+    if pending is not None:
+        pending.update(deltas)
+        return
+    _apply(deltas)
+
+
+def _apply(deltas):
+    """
+    Add ``deltas`` to their rollup rows with one UPDATE for the decrements
+    and one upsert for the increments (per ``_BATCH_SIZE`` rows each)
+    """
+    increments = [(key, delta) for key, delta in deltas.items() if delta > 0]
+    decrements = [(key, delta) for key, delta in deltas.items() if delta < 0]
+    with transaction.atomic(savepoint=False):
+        for start in range(0, len(decrements), _BATCH_SIZE):
+            _decrement(decrements[start:start + _BATCH_SIZE])
+        for start in range(0, len(increments), _BATCH_SIZE):
+            _upsert(increments[start:start + _BATCH_SIZE])
+
+
+def _decrement(decrements):
+    """Subtract from existing rows; rows only ever lose hires they gained"""
+    matches = [
+        (Q(period_type=period_type, scope=scope, scope_id=scope_id, period_start=period_start), delta)
+        for (period_type, scope, scope_id, period_start), delta in decrements
+    ]
+    HiringRollup.objects.filter(reduce(or_, (match for match, _delta in matches))).update(
+        hires=F('hires') + Case(*(When(match, then=Value(delta)) for match, delta in matches), default=Value(0)),
+    )
+
+
+def _upsert(increments):
+    """Create the missing rows of ``increments`` and add to the existing ones"""
+    if not connection.features.supports_update_conflicts_with_target:
+        for (period_type, scope, scope_id, period_start), delta in increments:
+            rows = HiringRollup.objects.filter(
+                period_type=period_type, scope=scope, scope_id=scope_id, period_start=period_start,
+            )
+            if rows.update(hires=F('hires') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    HiringRollup.objects.create(
+                        period_type=period_type, scope=scope, scope_id=scope_id,
+                        period_start=period_start, hires=delta,
+                    )
+            except IntegrityError:
+                # Created concurrently since the UPDATE
+                rows.update(hires=F('hires') + delta)
+        return
+
+    table = connection.ops.quote_name(HiringRollup._meta.db_table)
+    key, hires = _columns('period_type', 'scope', 'scope_id', 'period_start'), _columns('hires')[0]
+    placeholders = ', '.join(['(%s, %s, %s, %s, %s)'] * len(increments))
+    date_field = HiringRollup._meta.get_field('period_start')
+    params = [
+        value
+        for (period_type, scope, scope_id, period_start), delta in increments
+        for value in (period_type, scope, scope_id, date_field.get_db_prep_value(period_start, connection), delta)
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({", ".join(key)}, {hires}) VALUES {placeholders} '
+            f'ON CONFLICT ({", ".join(key)}) DO UPDATE SET {hires} = {table}.{hires} + excluded.{hires}',
+            params,
+        )
+
+
+def _columns(*names):
+    return [connection.ops.quote_name(HiringRollup._meta.get_field(name).column) for name in names]
+
+
+@contextmanager
+def deferred():
+    """
+    Collect rollup changes and apply them, netted per row, when the block exits.
+
+    Nested blocks join the outer one.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+
+    pending = Counter()
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    _apply(pending)
+
+
+def _insert_groups(cursor, period_type, scope, groups):
+    """INSERT a rollup row per ``period``/``group_id``/``hires`` row of ``groups``"""
+    table = connection.ops.quote_name(HiringRollup._meta.db_table)
+    columns = ', '.join(_columns('period_type', 'scope', 'scope_id', 'period_start', 'hires'))
+    scope_id = '0' if scope == HiringRollup.ALL else 'grouped.group_id'
+    sql, params = groups.query.sql_with_params()
+    cursor.execute(
+        f'INSERT INTO {table} ({columns}) '
+        f'SELECT %s, %s, {scope_id}, grouped.period, grouped.hires FROM ({sql}) grouped',
+        (period_type, scope, *params),
+    )
+    return cursor.rowcount
+
+
+def rebuild():
+    """
+    Recompute every rollup row from the employee table.
+
+    Only the daily company and department rows scan the employees; the
+    other rows are summed from those (every employee is in one company,
+    every day in one month). Each set of rows is a single
+    ``INSERT ... SELECT``, so nothing passes through Python.
+    """
+    hired = Employee.objects.filter(employee_status='hired', hired_on__isnull=False).order_by()
+    rollup_rows = HiringRollup.objects.order_by()
+    created = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        HiringRollup.objects.all().delete()
+        for scope, group_by in ((HiringRollup.COMPANY, 'company_id'), (HiringRollup.DEPARTMENT, 'department_id')):
+            created += _insert_groups(cursor, HiringRollup.DAY, scope, hired.values(
+                period=F('hired_on'), group_id=F(group_by),
+            ).annotate(hires=Count('id')))
+            created += _insert_groups(cursor, HiringRollup.MONTH, scope, rollup_rows.filter(
+                period_type=HiringRollup.DAY, scope=scope,
+            ).values(period=TruncMonth('period_start'), group_id=F('scope_id')).annotate(hires=Sum('hires')))
+        for period_type in (HiringRollup.DAY, HiringRollup.MONTH):
+            created += _insert_groups(cursor, period_type, HiringRollup.ALL, rollup_rows.filter(
+                period_type=period_type, scope=HiringRollup.COMPANY,
+            ).values(period=F('period_start')).annotate(hires=Sum('hires')))
+    return created
+
+
+def _scope(company_id=None, department_id=None):
+    """The narrowest scope asked for; a department implies its company"""
+    if department_id is not None:
+        return {'scope': HiringRollup.DEPARTMENT, 'scope_id': department_id}
+    if company_id is not None:
+        return {'scope': HiringRollup.COMPANY, 'scope_id': company_id}
+    return {'scope': HiringRollup.ALL, 'scope_id': 0}
+
+
+def _month_after(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _periods(period_type, start, end):
+    if period_type == HiringRollup.DAY:
+        day = start
+        while day <= end:
+            yield day
+            day += timedelta(days=1)
+        return
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def time_series(period_type, start, end, company_id=None, department_id=None):
+    """
+    Hires per period between ``start`` and ``end`` (inclusive), with the
+    running headcount of current employees hired up to the end of each period.
+    Empty periods are included with zero hires.
+    """
+    if period_type == HiringRollup.MONTH:
+        start = start.replace(day=1)
+    rows = HiringRollup.objects.filter(period_type=period_type, **_scope(company_id, department_id)).order_by()
+    headcount = rows.filter(period_start__lt=start).aggregate(total=Sum('hires'))['total'] or 0
+    hires = dict(rows.filter(period_start__gte=start, period_start__lte=end).values_list('period_start', 'hires'))
+
+    series = []
+    for period in _periods(period_type, start, end):
+        headcount += hires.get(period, 0)
+        series.append({'period': period, 'hires': hires.get(period, 0), 'headcount': headcount})
+    return series
+
+
+def tenure_buckets(company_id=None, department_id=None, today=None):
+    """
+    Current hired employees per tenure bucket as of ``today``.
+
+    Counts "hired on or after X" for every bucket boundary X from the monthly
+    rows after X's month plus the daily rows within it, so one query reads
+    the monthly rows and the daily rows of a handful of months.
+    """
+    today = today or date.today()
+    boundaries = set()
+    for _label, minimum, maximum in TENURE_BUCKETS:
+        boundaries.add(today - timedelta(days=minimum - 1))
+        if maximum is not None:
+            boundaries.add(today - timedelta(days=maximum))
+
+    # Every branch carries the full index prefix so each one is a range scan
+    scope = _scope(company_id, department_id)
+    condition = Q(period_type=HiringRollup.MONTH, **scope)
+    for boundary in boundaries:
+        condition |= Q(
+            period_type=HiringRollup.DAY, **scope,
+            period_start__gte=boundary.replace(day=1), period_start__lt=_month_after(boundary),
+        )
+    rows = list(HiringRollup.objects.filter(condition).values_list('period_type', 'period_start', 'hires'))
+
+    def hired_since(day):
+        if day is None:
+            return sum(hires for period_type, _start, hires in rows if period_type == HiringRollup.MONTH)
+        month_after = _month_after(day)
+        return sum(
+            hires for period_type, period_start, hires in rows
+            if (period_start >= month_after if period_type == HiringRollup.MONTH
+                else day <= period_start < month_after)
+        )
+
+    buckets = []
+    for label, minimum, maximum in TENURE_BUCKETS:
+        # hired_on between today - maximum and today - minimum, inclusive
+        earliest = today - timedelta(days=maximum) if maximum is not None else None
+        employees = hired_since(earliest) - hired_since(today - timedelta(days=minimum - 1))
+        buckets.append({'bucket': label, 'min_days': minimum, 'max_days': maximum, 'employees': employees})
+    return buckets
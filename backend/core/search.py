@@ -0,0 +1,128 @@
+"""
+Full-text employee search.
+
+On SQLite the search runs against ``core_employee_fts``, an FTS5 index over
+the employee name, email, designation and address columns. The index is an
+external-content table kept in sync by triggers on ``core_employee`` (see
+migration 0004), so every write path, including bulk inserts and raw SQL,
+updates it. Other databases fall back to case-insensitive substring matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Count, F, Lookup, Q
+from django.db.models.expressions import RawSQL
+
+from .models import EmployeeSearchIndex
+
+
+FTS_TABLE = 'core_employee_fts'
+SEARCH_FIELDS = ('employee_name', 'email_address', 'designation', 'address')
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class Match(Lookup):
+    """``document MATCH query`` on the FTS5 index"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+EmployeeSearchIndex._meta.get_field('document').register_lookup(Match)
+
+
+def search_terms(query):
+    return _TERM_RE.findall(query or '')
+
+
+def fts_query(query):
+    """
+    Turn free text into a safe FTS5 query: every word must match, as a prefix.
+
+    ``"john" "dev"`` style quoting keeps FTS5 operators in user input from
+    being interpreted.
+    """
+    return ' '.join(f'"{term}"*' for term in search_terms(query))
+
+
+def is_supported(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def search_employees(queryset, query, ranked=True):
+    """
+    Restrict ``queryset`` to employees matching ``query``.
+
+    ``ranked`` adds a ``search_rank`` annotation (lower is better) and orders
+    by it on SQLite; elsewhere ``search_rank`` is constant and results keep
+    their order. Unranked searches only filter, which is all keyset pages
+    need: bm25 scores depend on the whole table's term statistics, so any
+    write can reorder them and they cannot back a cursor.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if not is_supported(queryset.db):
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for field in SEARCH_FIELDS:
+                term_condition |= Q(**{f'{field}__icontains': term})
+            condition &= term_condition
+        queryset = queryset.filter(condition)
+        return queryset.annotate(search_rank=RawSQL('0', [])) if ranked else queryset
+
+    if not ranked:
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [fts_query(query)],
+        ))
+    return queryset.filter(search_index__document__match=fts_query(query)).annotate(
+        search_rank=F('search_index__rank'),
+    ).order_by('search_rank', 'id')
+
+
+def facet_counts(queryset):
+    """
+    Counts by status, company and department for ``queryset``, computed from a
+    single GROUP BY over (company, department, status).
+    """
+    groups = queryset.order_by().values(
+        'employee_status', 'company_id', 'company__company_name',
+        'department_id', 'department__department_name',
+    ).annotate(count=Count('id'))
+
+    statuses, companies, departments = {}, {}, {}
+    for group in groups:
+        statuses[group['employee_status']] = statuses.get(group['employee_status'], 0) + group['count']
+
+        company = companies.setdefault(group['company_id'], {
+            'id': group['company_id'],
+            'company_name': group['company__company_name'],
+            'count': 0,
+        })
+        company['count'] += group['count']
+
+        department = departments.setdefault(group['department_id'], {
+            'id': group['department_id'],
+            'department_name': group['department__department_name'],
+            'company': group['company_id'],
+            'count': 0,
+        })
+        department['count'] += group['count']
+
+    def by_count(items):
+        return sorted(items, key=lambda item: (-item['count'], item['id']))
+
+    return {
+        'status': [
+            {'employee_status': status, 'count': count}
+            for status, count in sorted(statuses.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'company': by_count(companies.values()),
+        'department': by_count(departments.values()),
+    }
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.core.validators import EmailValidator, RegexValidator
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.functions import Lower
+from .fieldsets import FieldsetSerializerMixin
 from .models import Company, Department, Employee
 from datetime import date
 import re
@@ -77,11 +79,13 @@ class DepartmentSerializer(serializers.ModelSerializer):
         return data
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     days_employed = serializers.ReadOnlyField()
     company_name = serializers.CharField(source='company.company_name', read_only=True)
     department_name = serializers.CharField(source='department.department_name', read_only=True)
 
+    expandable_fields = {'company': CompanySerializer, 'department': DepartmentSerializer}
+
     class Meta:
         model = Employee
         fields = [
@@ -188,8 +192,9 @@ class EmployeeSerializer(serializers.ModelSerializer):
         email_address = data.get('email_address')
 
         # Validate that department belongs to the selected company
+        # (compare ids so the department's company is not loaded)
         if company and department:
-            if department.company != company:
+            if department.company_id != company.pk:
                 raise serializers.ValidationError(
                     "The selected department does not belong to the selected company."
                 )
@@ -205,31 +210,17 @@ class EmployeeSerializer(serializers.ModelSerializer):
             data['hired_on'] = None
 
         # Check for duplicate email addresses
-        if email_address:
-            existing_query = Employee.objects.filter(email_address=email_address.lower())
-            
-            # For updates, exclude the current instance
-            if self.instance:
-                existing_query = existing_query.exclude(pk=self.instance.pk)
-            
-            if existing_query.exists():
-                raise serializers.ValidationError(
-                    "An employee with this email address already exists."
-                )
+        if email_address and self.email_in_use(email_address.lower()):
+            raise serializers.ValidationError(
+                "An employee with this email address already exists."
+            )
 
         # Validate status transitions (basic workflow)
         if self.instance and self.instance.employee_status != employee_status:
             current_status = self.instance.employee_status
             new_status = employee_status
-            
-            # Define allowed transitions
-            allowed_transitions = {
-                'application_received': ['interview_scheduled', 'not_accepted'],
-                'interview_scheduled': ['hired', 'not_accepted'],
-                'hired': [],  # Once hired, cannot change status
-                'not_accepted': []  # Once not accepted, cannot change status
-            }
-            
+            allowed_transitions = Employee.ALLOWED_TRANSITIONS
+
             if new_status not in allowed_transitions.get(current_status, []):
                 raise serializers.ValidationError(
                     f"Cannot change status from '{current_status}' to '{new_status}'. "
@@ -238,13 +229,107 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
         return data
 
+    def email_in_use(self, email_address):
+        """Check whether another employee already uses this email address"""
+        # Compare on LOWER(email_address) so the case-insensitive unique index is used
+        existing_query = Employee.objects.annotate(
+            email_lower=Lower('email_address')
+        ).filter(email_lower=email_address)
+        
+        # For updates, exclude the current instance
+        if self.instance:
+            existing_query = existing_query.exclude(pk=self.instance.pk)
+        
+        return existing_query.exists()
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves objects from a dict in the serializer
+    context (``context[context_key]``, keyed by pk) instead of querying.
+    Falls back to the normal queryset lookup when no dict is provided.
+    """
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get(self.context_key)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in preloaded:
+            self.fail('does_not_exist', pk_value=data)
+        return preloaded[pk]
+
+
+class EmployeeBulkSerializer(EmployeeSerializer):
+    """
+    EmployeeSerializer for batches: related objects and the emails already in
+    use are loaded once per batch (see core.bulk) and passed in the context,
+    so validating a row runs no queries.
+    """
+    company = PreloadedPrimaryKeyRelatedField('companies', queryset=Company.objects.all())
+    department = PreloadedPrimaryKeyRelatedField('departments', queryset=Department.objects.all())
+
+    def email_in_use(self, email_address):
+        """Look the address up in ``context['emails_in_use']`` (email -> employee id)"""
+        emails_in_use = self.context.get('emails_in_use')
+        if emails_in_use is None:
+            return super().email_in_use(email_address)
+        owner = emails_in_use.get(email_address)
+        return owner is not None and (self.instance is None or owner != self.instance.pk)
+
+
+class EmployeeTransitionFilterSerializer(serializers.Serializer):
+    """Which employees a bulk transition applies to, as the employee list filters them"""
+    company = serializers.IntegerField(required=False)
+    department = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Employee.STATUS_CHOICES, required=False)
+
+
+class EmployeeTransitionSerializer(serializers.Serializer):
+    """
+    A bulk status change: the target ``employee_status`` for the employees
+    listed in ``ids`` or matched by ``filter``. ``hired_on`` is required when
+    the target is ``hired``, like for a single employee, and ignored otherwise.
+    """
+    employee_status = serializers.ChoiceField(choices=Employee.STATUS_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    filter = EmployeeTransitionFilterSerializer(required=False)
+    hired_on = serializers.DateField(required=False, allow_null=True)
+
+    def validate_hired_on(self, value):
+        if value and value > date.today():
+            raise serializers.ValidationError("Hired date cannot be in the future.")
+        return value
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Send either a list of employee ids or a filter.")
+        if data['employee_status'] == 'hired':
+            if not data.get('hired_on'):
+                raise serializers.ValidationError(
+                    "Hired date is required when employee status is 'hired'."
+                )
+        else:
+            data['hired_on'] = None
+        return data
+
 
-class EmployeeListSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Simplified serializer for listing employees"""
     company_name = serializers.CharField(source='company.company_name', read_only=True)
     department_name = serializers.CharField(source='department.department_name', read_only=True)
     days_employed = serializers.ReadOnlyField()
 
+    expandable_fields = {'company': CompanySerializer, 'department': DepartmentSerializer}
+
     class Meta:
         model = Employee
         fields = [
@@ -261,13 +346,15 @@ class DepartmentListSerializer(serializers.ModelSerializer):
         fields = ['id', 'department_name']
 
 
-class EmployeeReportSerializer(serializers.ModelSerializer):
+class EmployeeReportSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for Employee Report showing hired employees """
     company_name = serializers.CharField(source='company.company_name', read_only=True)
     department_name = serializers.CharField(source='department.department_name', read_only=True)
     days_employed = serializers.ReadOnlyField()
     position = serializers.CharField(source='designation', read_only=True)
 
+    expandable_fields = {'company': CompanySerializer, 'department': DepartmentSerializer}
+
     class Meta:
         model = Employee
         fields = [
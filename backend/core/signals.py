@@ -0,0 +1,97 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters, report_cache, rollups, versions
+from .models import Company, Department, Employee
+
+
+def _loaded(instance, field):
+    """Value ``field`` had when the instance was read from the database"""
+    loaded_values = getattr(instance, '_loaded_values', None) or {}
+    return loaded_values.get(field, getattr(instance, field))
+
+
+def _remember(instance, *fields):
+    """Treat the just-saved values as the new baseline for the next save"""
+    loaded_values = getattr(instance, '_loaded_values', None)
+    if loaded_values is None:
+        loaded_values = instance._loaded_values = {}
+    for field in fields:
+        loaded_values[field] = getattr(instance, field)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def bump_table_version(sender, **kwargs):
+    """Invalidate the ETags of every view reading the written table"""
+    versions.bump(sender)
+
+
+def _has_hired_employees(instance):
+    return instance.employees.filter(employee_status='hired').exists()
+
+
+def _rollup_key(instance, loaded=False):
+    value = (lambda field: _loaded(instance, field)) if loaded else (lambda field: getattr(instance, field))
+    return rollups.rollup_key(
+        value('employee_status'), value('hired_on'), value('company_id'), value('department_id'),
+    )
+
+
+@receiver(post_save, sender=Company)
+def company_saved(sender, instance, created, raw=False, **kwargs):
+    """Renaming a company with hired employees changes the report"""
+    if not created and _loaded(instance, 'company_name') != instance.company_name:
+        if _has_hired_employees(instance):
+            report_cache.invalidate()
+    _remember(instance, 'company_name')
+
+
+@receiver(post_save, sender=Department)
+def department_saved(sender, instance, created, raw=False, **kwargs):
+    """Keep Company.number_of_departments and the cached report in step with department writes"""
+    if not created and _loaded(instance, 'department_name') != instance.department_name:
+        if _has_hired_employees(instance):
+            report_cache.invalidate()
+    if not raw:
+        if created:
+            counters.department_added(instance.company_id)
+        else:
+            counters.department_moved(_loaded(instance, 'company_id'), instance.company_id)
+    _remember(instance, 'company_id', 'department_name')
+
+
+@receiver(post_delete, sender=Department)
+def department_deleted(sender, instance, **kwargs):
+    counters.department_removed(instance.company_id)
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, created, raw=False, **kwargs):
+    """Keep the headcounts, hiring rollups and cached report in step with employee writes"""
+    # Any write to an employee who is, or was, hired changes the report
+    if 'hired' in (instance.employee_status, _loaded(instance, 'employee_status')):
+        report_cache.invalidate()
+    if not raw:
+        if created:
+            counters.employee_added(instance.company_id, instance.department_id)
+            rollups.employee_changed(None, _rollup_key(instance))
+        else:
+            counters.employee_moved(
+                _loaded(instance, 'company_id'), _loaded(instance, 'department_id'),
+                instance.company_id, instance.department_id,
+            )
+            rollups.employee_changed(_rollup_key(instance, loaded=True), _rollup_key(instance))
+    _remember(instance, 'company_id', 'department_id', 'employee_status', 'hired_on')
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    counters.employee_removed(instance.company_id, instance.department_id)
+    rollups.employee_changed(_rollup_key(instance, loaded=True), None)
+    if _loaded(instance, 'employee_status') == 'hired':
+        report_cache.invalidate()
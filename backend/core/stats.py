@@ -0,0 +1,97 @@
+"""
+Dashboard statistics.
+
+Headcounts by ``employee_status`` per company, per department and overall,
+computed from one GROUP BY over companies LEFT JOIN departments LEFT JOIN
+employees, so companies and departments without employees are listed too.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+from . import versions
+from .models import Company, Department, Employee
+
+
+def _by_status():
+    return {status: 0 for status, _label in Employee.STATUS_CHOICES}
+
+
+def compute_stats():
+    """Build the statistics payload from a single aggregate query"""
+    groups = Company.objects.order_by().values(
+        'id', 'company_name',
+        'departments__id', 'departments__department_name',
+        'departments__employees__employee_status',
+    ).annotate(count=Count('departments__employees'))
+
+    totals = {'companies': 0, 'departments': 0, 'employees': 0, 'by_status': _by_status()}
+    companies, departments = {}, {}
+    for group in groups:
+        company = companies.get(group['id'])
+        if company is None:
+            company = companies[group['id']] = {
+                'id': group['id'],
+                'company_name': group['company_name'],
+                'departments': 0,
+                'employees': 0,
+                'by_status': _by_status(),
+            }
+
+        department_id = group['departments__id']
+        if department_id is None:
+            continue
+        department = departments.get(department_id)
+        if department is None:
+            department = departments[department_id] = {
+                'id': department_id,
+                'department_name': group['departments__department_name'],
+                'company': group['id'],
+                'company_name': group['company_name'],
+                'employees': 0,
+                'by_status': _by_status(),
+            }
+            company['departments'] += 1
+
+        status = group['departments__employees__employee_status']
+        if status is None:
+            continue
+        count = group['count']
+        for bucket in (department, company, totals):
+            bucket['employees'] += count
+            bucket['by_status'][status] = bucket['by_status'].get(status, 0) + count
+
+    totals['companies'] = len(companies)
+    totals['departments'] = len(departments)
+    return {
+        'totals': totals,
+        'companies': sorted(companies.values(), key=lambda item: (item['company_name'], item['id'])),
+        'departments': sorted(
+            departments.values(), key=lambda item: (item['company_name'], item['department_name'], item['id'])
+        ),
+    }
+
+
+def get_stats(current=None):
+    """
+    The statistics, from the cache when ``DASHBOARD_STATS_CACHE_TIMEOUT`` is set.
+
+    Entries are keyed by the current table versions, so a cached payload is
+    never stale; the timeout only bounds how long unused entries are kept.
+    ``current`` is ``versions.current(Company, Department, Employee)`` when
+    the caller has already read it.
+    """
+    timeout = getattr(settings, 'DASHBOARD_STATS_CACHE_TIMEOUT', None)
+    if not timeout:
+        return compute_stats()
+
+    table_versions, last_modified = current or versions.current(Company, Department, Employee)
+    # last_modified keeps keys unique if the counters are ever reset
+    stamp = last_modified.timestamp() if last_modified else 0
+    key = 'core:stats:' + ':'.join(str(version) for version in table_versions.values()) + f':{stamp}'
+    cache = caches[getattr(settings, 'DASHBOARD_STATS_CACHE', 'default')]
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(key, stats, timeout)
+    return stats
@@ -0,0 +1,131 @@
+"""
+Tenure filters and ordering for the employee list and the hired report.
+
+``days_employed`` is a Python property (days since ``hired_on`` for hired
+employees), so it cannot be filtered or sorted on directly. It grows as
+``hired_on`` recedes, though, so every tenure condition maps onto a
+``hired_on`` range and tenure order onto reverse ``hired_on`` order:
+
+* ``?min_days=N`` / ``?max_days=N``: ``hired_on <= today - N`` /
+  ``hired_on >= today - N``
+* ``?hired_after=YYYY-MM-DD`` / ``?hired_before=YYYY-MM-DD``: inclusive
+  ``hired_on`` bounds
+* ``?ordering=tenure`` (shortest first) or ``-tenure`` (longest first)
+
+Tenure only exists for hired employees, so any of these parameters also
+limits the rows to the ``hired`` status. That puts every tenure query on the
+``(employee_status, hired_on)`` or ``(company, employee_status, hired_on)``
+index: filtering and sorting are an index range scan, never a computed
+value per row. The views are ``date_sensitive`` already, so cached
+responses do not outlive the day their day counts were computed for.
+"""
+from datetime import date, timedelta
+
+from rest_framework.exceptions import ValidationError
+
+
+ORDERING_PARAM = 'ordering'
+# ?ordering= value -> keyset ordering; the id follows hired_on's direction so
+# a single index scan (forwards or backwards) returns the rows in order
+ORDERINGS = {
+    'tenure': ('-hired_on', '-id'),
+    '-tenure': ('hired_on', 'id'),
+}
+DAYS_PARAMS = ('min_days', 'max_days')
+DATE_PARAMS = ('hired_after', 'hired_before')
+PARAMS = (ORDERING_PARAM,) + DAYS_PARAMS + DATE_PARAMS
+
+
+def parse(params, today=None):
+    """
+    The ``hired_on`` bounds and keyset ordering asked for by the query
+    ``params``: ``{'start': date|None, 'end': date|None, 'ordering':
+    tuple|None}``, or None when no tenure parameter is present. Invalid
+    values raise a 400.
+    """
+    if not any(name in params for name in PARAMS):
+        return None
+    today = today or date.today()
+    errors = {}
+
+    ordering = params.get(ORDERING_PARAM)
+    if ordering is not None and ordering not in ORDERINGS:
+        errors[ORDERING_PARAM] = [f"Unknown ordering '{ordering}'. Available: {', '.join(ORDERINGS)}."]
+
+    days = {}
+    for name in DAYS_PARAMS:
+        if name in params:
+            try:
+                days[name] = int(params[name])
+                if days[name] < 0:
+                    raise ValueError
+            except ValueError:
+                errors[name] = ['A non-negative whole number of days is required.']
+    dates = {}
+    for name in DATE_PARAMS:
+        if name in params:
+            try:
+                dates[name] = date.fromisoformat(params[name])
+            except ValueError:
+                errors[name] = ['A date in YYYY-MM-DD format is required.']
+    if errors:
+        raise ValidationError(errors)
+
+    if 'min_days' in days and 'max_days' in days and days['min_days'] > days['max_days']:
+        errors['min_days'] = ['min_days must not be greater than max_days.']
+    if 'hired_after' in dates and 'hired_before' in dates and dates['hired_after'] > dates['hired_before']:
+        errors['hired_after'] = ['hired_after must not be after hired_before.']
+    if errors:
+        raise ValidationError(errors)
+
+    # More days employed means an earlier hire date
+    starts = [dates.get('hired_after')]
+    ends = [dates.get('hired_before')]
+    if 'max_days' in days:
+        starts.append(today - timedelta(days=days['max_days']))
+    if 'min_days' in days:
+        ends.append(today - timedelta(days=days['min_days']))
+    starts = [value for value in starts if value is not None]
+    ends = [value for value in ends if value is not None]
+    return {
+        'start': max(starts) if starts else None,
+        'end': min(ends) if ends else None,
+        'ordering': ORDERINGS.get(ordering),
+    }
+
+
+def cache_variant(request):
+    """A stable string naming the requested tenure parameters, '' when there are none"""
+    params = request.query_params
+    return ';'.join(f'{name}={params[name]}' for name in PARAMS if name in params)
+
+
+class TenureFilterMixin:
+    """
+    Apply the tenure parameters to the view's queryset and keyset ordering.
+
+    Views call ``filter_tenure()`` from ``get_queryset()`` and prefer
+    ``get_tenure_ordering()`` in ``get_keyset_ordering()``.
+    """
+
+    def get_tenure(self):
+        if not hasattr(self, '_tenure'):
+            self._tenure = parse(self.request.query_params)
+        return self._tenure
+
+    def filter_tenure(self, queryset):
+        tenure = self.get_tenure()
+        if tenure is None:
+            return queryset
+        queryset = queryset.filter(employee_status='hired')
+        if tenure['start'] is not None:
+            queryset = queryset.filter(hired_on__gte=tenure['start'])
+        if tenure['end'] is not None:
+            queryset = queryset.filter(hired_on__lte=tenure['end'])
+        if tenure['ordering'] is not None:
+            queryset = queryset.order_by(*tenure['ordering'])
+        return queryset
+
+    def get_tenure_ordering(self):
+        tenure = self.get_tenure()
+        return tenure['ordering'] if tenure is not None else None
@@ -1,14 +1,42 @@
-from django.test import TestCase
+from django.test import AsyncRequestFactory, TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
-from rest_framework import status
-from datetime import date, datetime
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework import serializers, status
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+import base64
+import csv
+import gzip
 import json
+import os
+import re
+import tempfile
 
-from core.models import Company, Department, Employee
-from core.serializers import CompanySerializer, DepartmentSerializer, EmployeeSerializer
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Sum
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from io import StringIO
+from unittest import mock, skipUnless
+
+from core import (
+    async_views, bulk, compression, counters, fast_serializers, instrumentation, report_cache, rollups, search,
+    versions,
+)
+from core.models import Company, Department, Employee, HiringRollup
+from core.serializers import CompanySerializer, DepartmentSerializer, EmployeeListSerializer, EmployeeSerializer
+from core.renderers import FastJSONRenderer
+from core.views import CompanyListCreateView
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.serializers import CustomTokenObtainPairSerializer
 
 User = get_user_model()
 
@@ -364,3 +392,2578 @@ class SerializerTest(TestCase):
         
         self.assertFalse(serializer.is_valid())
         self.assertIn('company', serializer.errors)
+
+
+class CounterCacheTest(TestCase):
+    """Tests for the stored company/department headcount counters"""
+
+    def setUp(self):
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.company)
+
+    def make_employee(self, email, **kwargs):
+        data = {
+            'employee_name': 'John Doe',
+            'email_address': email,
+            'mobile_number': '+1234567890',
+            'address': '123 Test Street',
+            'designation': 'Developer',
+            'company': self.company,
+            'department': self.department,
+        }
+        data.update(kwargs)
+        return Employee.objects.create(**data)
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        for field, value in expected.items():
+            self.assertEqual(getattr(obj, field), value, field)
+
+    def test_department_create_and_delete(self):
+        """Test department writes maintain the company department count"""
+        self.assertCounts(self.company, number_of_departments=2)
+        self.other_department.delete()
+        self.assertCounts(self.company, number_of_departments=1)
+
+    def test_employee_create_move_and_delete(self):
+        """Test employee writes maintain company and department headcounts"""
+        employee = self.make_employee('john@example.com')
+        self.assertCounts(self.company, number_of_employees=1)
+        self.assertCounts(self.department, number_of_employees=1)
+
+        employee.department = self.other_department
+        employee.save()
+        self.assertCounts(self.department, number_of_employees=0)
+        self.assertCounts(self.other_department, number_of_employees=1)
+
+        employee = Employee.objects.get(pk=employee.pk)
+        employee.company = self.other_company
+        employee.save()
+        self.assertCounts(self.company, number_of_employees=0)
+        self.assertCounts(self.other_company, number_of_employees=1)
+
+        employee.delete()
+        self.assertCounts(self.other_company, number_of_employees=0)
+        self.assertCounts(self.other_department, number_of_employees=0)
+
+    def test_saving_stale_instance_keeps_counters(self):
+        """Test that saving an old in-memory copy does not overwrite the counters"""
+        stale_company = Company.objects.get(pk=self.company.pk)
+        self.make_employee('john@example.com')
+        stale_company.company_name = 'Renamed Company'
+        stale_company.save()
+        self.assertCounts(self.company, number_of_employees=1, company_name='Renamed Company')
+
+    def test_cascade_delete(self):
+        """Test deleting a department with employees updates the company"""
+        self.make_employee('john@example.com')
+        self.make_employee('jane@example.com', department=self.other_department)
+        self.department.delete()
+        self.assertCounts(self.company, number_of_departments=1, number_of_employees=1)
+
+    def test_deferred_bulk_path(self):
+        """Test bulk writes inside deferred() are recounted once at the end"""
+        with counters.deferred() as touched:
+            Employee.objects.bulk_create([
+                Employee(
+                    employee_name=f'Employee {i}', email_address=f'e{i}@example.com',
+                    mobile_number='+1234567890', address='123 Test Street', designation='Developer',
+                    company=self.company, department=self.department,
+                )
+                for i in range(5)
+            ])
+            touched[Company].add(self.company.pk)
+            touched[Department].add(self.department.pk)
+            Employee.objects.filter(email_address='e0@example.com').delete()
+        self.assertCounts(self.company, number_of_employees=4)
+        self.assertCounts(self.department, number_of_employees=4)
+
+    def test_failed_handler_rolls_back_the_write(self):
+        """Test the row write and its derived updates commit or roll back together"""
+        version = versions.current(Employee)[0]['core.employee']
+        with mock.patch('core.rollups.employee_changed', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.make_employee('john@example.com')
+        self.assertFalse(Employee.objects.exists())
+        self.assertCounts(self.company, number_of_employees=0)
+        self.assertEqual(versions.current(Employee)[0]['core.employee'], version)
+
+        employee = self.make_employee('john@example.com')
+        employee.department = self.other_department
+        with mock.patch('core.rollups.employee_changed', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                employee.save()
+        self.assertEqual(Employee.objects.get(pk=employee.pk).department_id, self.department.id)
+        self.assertCounts(self.department, number_of_employees=1)
+        self.assertCounts(self.other_department, number_of_employees=0)
+
+    def test_delete_with_drifted_counters(self):
+        """Test a delete does not drive a drifted counter below zero"""
+        employee = self.make_employee('john@example.com')
+        Company.objects.filter(pk=self.company.pk).update(number_of_employees=0)
+        Department.objects.filter(pk=self.department.pk).update(number_of_employees=0)
+
+        employee.delete()
+        self.assertFalse(Employee.objects.filter(pk=employee.pk).exists())
+        self.assertCounts(self.company, number_of_employees=0)
+        self.assertCounts(self.department, number_of_employees=0)
+
+    def test_recount_command_repairs_drift(self):
+        """Test the management command detects and fixes stale counters"""
+        self.make_employee('john@example.com')
+        Company.objects.filter(pk=self.company.pk).update(number_of_employees=F('number_of_employees') + 7)
+        Department.objects.filter(pk=self.department.pk).update(number_of_employees=0)
+
+        out = StringIO()
+        call_command('recount_headcounts', '--dry-run', stdout=out)
+        self.assertIn('1 companies and 1 departments', out.getvalue())
+        self.assertCounts(self.company, number_of_employees=8)
+
+        call_command('recount_headcounts', stdout=StringIO())
+        self.assertCounts(self.company, number_of_employees=1, number_of_departments=2)
+        self.assertCounts(self.department, number_of_employees=1)
+
+    def test_company_list_query_count(self):
+        """Test listing companies no longer issues a query per row"""
+        serializer = CompanySerializer(Company.objects.all(), many=True)
+        with self.assertNumQueries(1):
+            serializer.data
+
+
+class KeysetPaginationTest(APITestCase):
+    """Integration tests for cursor pagination on the list endpoints"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.other_company)
+
+        for i in range(7):
+            Employee.objects.create(
+                # Duplicate names so the id tie-breaker matters
+                employee_name=f'Employee {i // 2}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address='123 Test Street',
+                designation='Developer',
+                employee_status='hired' if i % 2 else 'application_received',
+                hired_on=date.today() if i % 2 else None,
+                company=self.company,
+                department=self.department,
+            )
+        Employee.objects.create(
+            employee_name='Other Employee',
+            email_address='other@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            company=self.other_company,
+            department=self.other_department,
+        )
+
+    def collect(self, params):
+        """Follow next links and return the ids of every row"""
+        url = reverse('employee-list-create')
+        response = self.client.get(url, params)
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                return ids, response
+            response = self.client.get(response.data['next'])
+
+    def test_unpaginated_by_default(self):
+        """Test plain lists are returned when no pagination parameter is sent"""
+        response = self.client.get(reverse('employee-list-create'))
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 8)
+
+    def test_walk_all_pages(self):
+        """Test every row is returned exactly once in (name, id) order"""
+        ids, _ = self.collect({'page_size': 3})
+        expected = list(Employee.objects.order_by('employee_name', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_pagination_with_filters(self):
+        """Test cursors keep the company and status filters"""
+        ids, _ = self.collect({'page_size': 2, 'company': self.company.id, 'status': 'hired'})
+        expected = list(Employee.objects.filter(
+            company=self.company, employee_status='hired'
+        ).order_by('employee_name', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_previous_link(self):
+        """Test walking back returns the previous page unchanged"""
+        url = reverse('employee-list-create')
+        first = self.client.get(url, {'page_size': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(back.data['previous'])
+
+    def test_estimated_total(self):
+        """Test the estimated total comes from the counter columns"""
+        url = reverse('employee-list-create')
+        response = self.client.get(url, {'page_size': 2, 'total': 'estimate', 'company': self.company.id})
+        self.assertEqual(response.data['total'], 7)
+        response = self.client.get(url, {'page_size': 2, 'total': 'estimate'})
+        self.assertEqual(response.data['total'], 8)
+        response = self.client.get(url, {'page_size': 2, 'total': 'exact', 'status': 'hired'})
+        self.assertEqual(response.data['total'], 3)
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor is rejected"""
+        response = self.client.get(reverse('employee-list-create'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_value_types(self):
+        """Test a well-formed cursor holding values of the wrong type is rejected, not a 500"""
+        url = reverse('employee-list-create')
+        for position in (['x', 'abc'], ['x', {'a': 1}], ['x', None], [['x'], 1]):
+            payload = json.dumps({'p': position, 'r': 0}).encode()
+            cursor = base64.urlsafe_b64encode(payload).decode().rstrip('=')
+            response = self.client.get(url, {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+    def test_company_pagination(self):
+        """Test companies paginate by name"""
+        response = self.client.get(reverse('company-list-create'), {'page_size': 1})
+        self.assertEqual(response.data['results'][0]['company_name'], 'Other Company')
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['company_name'], 'Test Company')
+        self.assertIsNone(response.data['next'])
+
+
+class EmployeeTenureFilterTest(APITestCase):
+    """Integration tests for the tenure filters and ordering"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.other_company)
+
+        today = date.today()
+        # Days employed per employee; two share 100 so the id tie-breaker matters
+        self.days = [10, 100, 100, 400, 1000]
+        for i, days in enumerate(self.days):
+            Employee.objects.create(
+                employee_name=f'Employee {i}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address='123 Test Street',
+                designation='Developer',
+                employee_status='hired',
+                hired_on=today - timedelta(days=days),
+                company=self.company if i < 4 else self.other_company,
+                department=self.department if i < 4 else self.other_department,
+            )
+        Employee.objects.create(
+            employee_name='Applicant',
+            email_address='applicant@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            company=self.company,
+            department=self.department,
+        )
+        self.list_url = reverse('employee-list-create')
+        self.report_url = reverse('employee-report')
+
+    def test_longest_tenure_first(self):
+        """Test -tenure lists hired employees longest-employed first"""
+        response = self.client.get(self.list_url, {'ordering': '-tenure'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['days_employed'] for row in response.data], [1000, 400, 100, 100, 10])
+
+        response = self.client.get(self.list_url, {'ordering': 'tenure', 'company': self.company.id})
+        self.assertEqual([row['days_employed'] for row in response.data], [10, 100, 100, 400])
+
+    def test_day_and_date_ranges(self):
+        """Test min_days/max_days and hired_after/hired_before bound the hire date inclusively"""
+        response = self.client.get(self.list_url, {'min_days': 100, 'max_days': 400})
+        self.assertEqual(sorted(row['days_employed'] for row in response.data), [100, 100, 400])
+
+        today = date.today()
+        response = self.client.get(self.list_url, {
+            'hired_after': (today - timedelta(days=400)).isoformat(),
+            'hired_before': (today - timedelta(days=100)).isoformat(),
+            'min_days': 101,
+        })
+        self.assertEqual([row['days_employed'] for row in response.data], [400])
+
+    def test_tenure_pages(self):
+        """Test cursors walk the tenure ordering in both directions"""
+        response = self.client.get(self.list_url, {'ordering': '-tenure', 'page_size': 2})
+        pages = [response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            pages.append(response.data['results'])
+        rows = [row for page in pages for row in page]
+        expected = list(Employee.objects.filter(employee_status='hired').order_by(
+            'hired_on', 'id'
+        ).values_list('id', flat=True))
+        self.assertEqual([row['id'] for row in rows], expected)
+
+        back = self.client.get(response.data['previous'])
+        self.assertEqual(back.data['results'], pages[-2])
+
+    def test_report_filters_and_cache_variants(self):
+        """Test the report applies the tenure parameters and caches each combination separately"""
+        with override_settings(EMPLOYEE_REPORT_CACHE='default'):
+            caches['default'].clear()
+            full = self.client.get(self.report_url).json()
+            filtered = self.client.get(self.report_url, {'min_days': 400, 'ordering': '-tenure'}).json()
+            csv_response = self.client.get(self.report_url, {'min_days': 400, 'format': 'csv'})
+        self.assertEqual(len(full), 5)
+        self.assertEqual([row['days_employed'] for row in filtered], [1000, 400])
+        rows = list(csv.DictReader(b''.join(csv_response.streaming_content).decode().splitlines()))
+        self.assertEqual(sorted(row['days_employed'] for row in rows), ['1000', '400'])
+
+    def test_invalid_parameters(self):
+        """Test malformed or contradictory tenure parameters are rejected"""
+        for params, field in [
+            ({'ordering': 'salary'}, 'ordering'),
+            ({'min_days': '-1'}, 'min_days'),
+            ({'max_days': 'ten'}, 'max_days'),
+            ({'hired_after': '2024-13-01'}, 'hired_after'),
+            ({'min_days': 10, 'max_days': 5}, 'min_days'),
+            ({'hired_after': '2024-02-01', 'hired_before': '2024-01-01'}, 'hired_after'),
+        ]:
+            for url in (self.list_url, self.report_url):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, (url, params))
+                self.assertIn(field, response.json())
+
+            # Streamed exports validate before the response starts
+            response = self.client.get(self.report_url, {**params, 'format': 'csv'})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertFalse(response.streaming)
+
+
+class EmployeeReportExportTest(APITestCase):
+    """Integration tests for the streaming report exports"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+
+        beta = Company.objects.create(company_name='Beta Corp')
+        alpha = Company.objects.create(company_name='Alpha Corp')
+        departments = [
+            Department.objects.create(department_name='Sales', company=beta),
+            Department.objects.create(department_name='Engineering', company=alpha),
+            Department.objects.create(department_name='Sales', company=alpha),
+        ]
+        for i, name in enumerate(['Zoe, Jr.', 'Adam', 'Mona "M" Lisa', 'Bob']):
+            department = departments[i % 3]
+            Employee.objects.create(
+                employee_name=name,
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address='123 Test Street',
+                designation='Developer',
+                employee_status='hired',
+                hired_on=date(2024, 1, i + 1),
+                company=department.company,
+                department=department,
+            )
+        Employee.objects.create(
+            employee_name='Not Hired',
+            email_address='applicant@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            company=alpha,
+            department=departments[1],
+        )
+        self.url = reverse('employee-report')
+
+    def json_report(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_ndjson_matches_json_report(self):
+        """Test NDJSON rows equal the JSON report rows, in the same order"""
+        response = self.client.get(self.url, {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows, self.json_report())
+
+    def test_csv_matches_json_report(self):
+        """Test CSV export keeps the columns, quoting and ordering"""
+        response = self.client.get(self.url, {'format': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('employee-report.csv', response['Content-Disposition'])
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        expected = self.json_report()
+        self.assertEqual([row['employee_name'] for row in rows], [row['employee_name'] for row in expected])
+        self.assertEqual(list(rows[0].keys()), list(expected[0].keys()))
+        self.assertEqual(rows[0]['days_employed'], str(expected[0]['days_employed']))
+
+    def test_csv_via_accept_header(self):
+        """Test the export format can be negotiated with the Accept header"""
+        response = self.client.get(self.url, HTTP_ACCEPT='text/csv')
+        self.assertTrue(response.streaming)
+
+    def test_export_errors_are_plain_rows(self):
+        """Test error responses in export formats hold the messages, not Python reprs"""
+        response = self.client.get(self.url, {'format': 'csv', 'fields': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        rows = list(csv.reader(response.content.decode().splitlines()))
+        self.assertEqual(rows[0], ['field', 'message'])
+        self.assertEqual(rows[1][0], 'fields')
+        self.assertTrue(rows[1][1].startswith('Unknown field(s): bogus.'))
+        self.assertNotIn('ErrorDetail', response.content.decode())
+
+        response = self.client.get(self.url, {'format': 'ndjson', 'fields': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        rows = [json.loads(line) for line in response.content.decode().splitlines()]
+        self.assertEqual([row['field'] for row in rows], ['fields'])
+        self.assertTrue(rows[0]['message'].startswith('Unknown field(s): bogus.'))
+
+    def test_export_requires_authentication(self):
+        """Test unauthenticated exports are rejected"""
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url, {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EmployeeBulkAPITest(APITestCase):
+    """Integration tests for the bulk employee endpoint"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse('employee-bulk')
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.company)
+        self.foreign_department = Department.objects.create(department_name='Support', company=self.other_company)
+        self.existing = Employee.objects.create(
+            employee_name='John Doe',
+            email_address='john@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            company=self.company,
+            department=self.department,
+        )
+
+    def row(self, i, **overrides):
+        data = {
+            'employee_name': f'Applicant {i}',
+            'email_address': f'applicant{i}@example.com',
+            'mobile_number': '+1234567890',
+            'address': '123 Test Street',
+            'designation': 'Developer',
+            'employee_status': 'application_received',
+            'company': self.company.id,
+            'department': self.department.id,
+        }
+        data.update(overrides)
+        return data
+
+    def test_bulk_create(self):
+        """Test creating a batch of employees updates the counters"""
+        response = self.client.post(self.url, [self.row(i) for i in range(20)], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 20)
+        self.assertEqual(len(response.data['ids']), 20)
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.number_of_employees, 21)
+
+    def test_bulk_create_query_count_is_constant(self):
+        """Test validation and insert cost the same number of queries for 5 or 50 rows"""
+        counts = []
+        for size, offset in ((5, 0), (50, 100)):
+            rows = [self.row(offset + i) for i in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, rows, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_create_reports_row_errors(self):
+        """Test invalid rows are reported by index and nothing is written"""
+        rows = [
+            self.row(0),
+            self.row(1, email_address='john@example.com'),
+            self.row(2, department=self.foreign_department.id),
+            self.row(3, company=9999),
+            self.row(4, email_address='APPLICANT0@example.com'),
+            self.row(5, employee_status='hired'),
+        ]
+        response = self.client.post(self.url, rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3, 4, 5])
+        self.assertIn('company', response.data['errors'][2]['errors'])
+        self.assertIn('email_address', response.data['errors'][3]['errors'])
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_bulk_update(self):
+        """Test updating employees, including a department move"""
+        row = self.row(0, id=self.existing.id, employee_status='interview_scheduled',
+                       department=self.other_department.id, email_address='john@example.com')
+        response = self.client.put(self.url, [row], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.employee_status, 'interview_scheduled')
+        self.assertEqual(self.existing.department, self.other_department)
+        self.department.refresh_from_db()
+        self.other_department.refresh_from_db()
+        self.assertEqual(self.department.number_of_employees, 0)
+        self.assertEqual(self.other_department.number_of_employees, 1)
+
+    def test_bulk_update_enforces_transitions(self):
+        """Test status transition rules apply to bulk updates"""
+        row = self.row(0, id=self.existing.id, employee_status='hired', hired_on=str(date.today()))
+        response = self.client.put(self.url, [row, self.row(1, id=9999)], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+
+        response = self.client.put(self.url, [row], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', response.data['errors'][0]['errors'])
+
+    def test_bulk_delete(self):
+        """Test deleting employees reports missing ids"""
+        response = self.client.delete(self.url, {'ids': [self.existing.id, 9999]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'deleted': 1, 'missing': [9999]})
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.number_of_employees, 0)
+
+    def test_bulk_requires_manager(self):
+        """Test employees cannot use the bulk endpoint"""
+        employee_user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='employeepass123',
+            role='employee'
+        )
+        self.client.force_authenticate(employee_user)
+        response = self.client.post(self.url, [self.row(0)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EmployeeBulkTransitionTest(APITestCase):
+    """Integration tests for the bulk status transition endpoint"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse('employee-bulk-transition')
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.other_company)
+
+    def create_employees(self, count, employee_status='application_received', department=None):
+        department = department or self.department
+        start = Employee.objects.count()
+        return [
+            Employee.objects.create(
+                employee_name=f'Applicant {i}',
+                email_address=f'applicant{i}@example.com',
+                mobile_number='+1234567890',
+                address='123 Test Street',
+                designation='Developer',
+                employee_status=employee_status,
+                hired_on=date(2024, 1, 1) if employee_status == 'hired' else None,
+                company=department.company,
+                department=department,
+            )
+            for i in range(start, start + count)
+        ]
+
+    def statuses(self):
+        return dict(Employee.objects.values_list('pk', 'employee_status'))
+
+    def test_transition_by_ids(self):
+        """Test allowed employees move and the others are reported with the reason"""
+        applicant, other_applicant = self.create_employees(2)
+        interviewing, = self.create_employees(1, 'interview_scheduled')
+        hired, = self.create_employees(1, 'hired')
+
+        response = self.client.post(self.url, {
+            'employee_status': 'interview_scheduled',
+            'ids': [applicant.pk, other_applicant.pk, interviewing.pk, hired.pk, 9999],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(response.data['ids'], [applicant.pk, other_applicant.pk])
+        self.assertEqual([(row['id'], row['reason'].split('.')[0]) for row in response.data['skipped']], [
+            (interviewing.pk, "Already 'interview_scheduled'"),
+            (hired.pk, "Cannot change status from 'hired' to 'interview_scheduled'"),
+            (9999, 'Employee not found'),
+        ])
+        self.assertEqual(self.statuses(), {
+            applicant.pk: 'interview_scheduled', other_applicant.pk: 'interview_scheduled',
+            interviewing.pk: 'interview_scheduled', hired.pk: 'hired',
+        })
+        self.assertEqual(Employee.objects.get(pk=hired.pk).hired_on, date(2024, 1, 1))
+
+    def test_hire_by_filter(self):
+        """Test hiring through a filter sets hired_on and updates the rollups and report"""
+        interviewing = self.create_employees(3, 'interview_scheduled')
+        applicant, = self.create_employees(1)
+        elsewhere, = self.create_employees(1, 'interview_scheduled', department=self.other_department)
+        self.assertEqual(self.client.get(reverse('employee-report')).json(), [])
+
+        response = self.client.post(self.url, {
+            'employee_status': 'hired',
+            'hired_on': '2024-05-06',
+            'filter': {'company': self.company.pk},
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['ids'], [employee.pk for employee in interviewing])
+        self.assertEqual([row['id'] for row in response.data['skipped']], [applicant.pk])
+        self.assertEqual(
+            set(Employee.objects.filter(employee_status='hired').values_list('pk', 'hired_on')),
+            {(employee.pk, date(2024, 5, 6)) for employee in interviewing},
+        )
+        self.assertEqual(self.statuses()[elsewhere.pk], 'interview_scheduled')
+        series = rollups.time_series('day', date(2024, 5, 6), date(2024, 5, 6), company_id=self.company.pk)
+        self.assertEqual(series[0]['hires'], 3)
+        self.assertEqual(len(self.client.get(reverse('employee-report')).json()), 3)
+
+    def test_not_accepted_clears_hired_on(self):
+        """Test moving to a status other than hired stores no hire date"""
+        applicant, = self.create_employees(1)
+
+        response = self.client.post(self.url, {
+            'employee_status': 'not_accepted', 'hired_on': '2024-05-06', 'ids': [applicant.pk],
+        }, format='json')
+
+        self.assertEqual(response.data['updated'], 1)
+        self.assertIsNone(Employee.objects.get(pk=applicant.pk).hired_on)
+
+    def test_invalid_requests(self):
+        """Test bad targets, selections and hire dates are rejected"""
+        applicant, = self.create_employees(1)
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        for body in ({'employee_status': 'fired', 'ids': [applicant.pk]},
+                     {'employee_status': 'not_accepted'},
+                     {'employee_status': 'not_accepted', 'ids': [applicant.pk], 'filter': {}},
+                     {'employee_status': 'not_accepted', 'ids': []},
+                     {'employee_status': 'hired', 'ids': [applicant.pk]},
+                     {'employee_status': 'hired', 'ids': [applicant.pk], 'hired_on': tomorrow}):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, body)
+        self.assertEqual(self.statuses()[applicant.pk], 'application_received')
+
+    def test_constant_queries(self):
+        """Test the query count does not depend on how many employees move"""
+        def transition(count):
+            ids = [employee.pk for employee in self.create_employees(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {
+                    'employee_status': 'interview_scheduled', 'ids': ids,
+                }, format='json')
+            self.assertEqual(response.data['updated'], count)
+            return len(queries)
+
+        self.assertEqual(transition(3), transition(60))
+
+    def test_chunked_update(self):
+        """Test the UPDATE is split into chunks of pks"""
+        employees = self.create_employees(5)
+
+        with CaptureQueriesContext(connection) as queries:
+            updated, skipped = bulk.transition_employees(
+                Employee.objects.all(), 'interview_scheduled', chunk_size=2,
+            )
+
+        self.assertEqual(updated, [employee.pk for employee in employees])
+        self.assertEqual(skipped, [])
+        self.assertEqual(set(self.statuses().values()), {'interview_scheduled'})
+        self.assertEqual(
+            len([query for query in queries if query['sql'].startswith('UPDATE "core_employee"')]), 3,
+        )
+
+    def test_conflicting_write_rolls_back(self):
+        """Test a row leaving its source status before the UPDATE fails the whole transition"""
+        first, second = self.create_employees(2)
+        employee_changed = rollups.employee_changed
+
+        def concurrent_write(old_key, new_key):
+            # Stands in for a write committed between the SELECT and the UPDATE
+            Employee.objects.filter(pk=second.pk).update(employee_status='not_accepted')
+            employee_changed(old_key, new_key)
+
+        with mock.patch('core.rollups.employee_changed', side_effect=concurrent_write):
+            response = self.client.post(self.url, {
+                'employee_status': 'interview_scheduled', 'ids': [first.pk, second.pk],
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.statuses(), {first.pk: 'application_received', second.pk: 'application_received'})
+
+    def test_requires_manager(self):
+        """Test employees cannot change statuses in bulk"""
+        employee_user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='employeepass123',
+            role='employee'
+        )
+        self.client.force_authenticate(employee_user)
+        response = self.client.post(self.url, {'employee_status': 'not_accepted', 'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EmployeeSearchTest(APITestCase):
+    """Integration tests for full-text employee search"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse('employee-list-create')
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.other_company)
+
+        people = [
+            ('Alice Walker', 'Backend Developer', '12 Baker Street', self.department, 'hired'),
+            ('Bob Stone', 'Developer Advocate', '7 Market Road', self.other_department, 'application_received'),
+            ('Carol Developer', 'Developer', '3 Developer Lane', self.department, 'application_received'),
+            ('Dan Brown', 'Sales Manager', '9 Elm Street', self.other_department, 'application_received'),
+        ]
+        for i, (name, designation, address, department, employee_status) in enumerate(people):
+            Employee.objects.create(
+                employee_name=name,
+                email_address=f'person{i}@example.com',
+                mobile_number='+1234567890',
+                address=address,
+                designation=designation,
+                employee_status=employee_status,
+                hired_on=date.today() if employee_status == 'hired' else None,
+                company=department.company,
+                department=department,
+            )
+
+    def names(self, response):
+        return [row['employee_name'] for row in response.data['results']]
+
+    def test_search_matches_all_fields(self):
+        """Test search covers name, designation, email and address"""
+        response = self.client.get(self.url, {'search': 'developer'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Carol matches in name, designation and address, so ranks first
+        self.assertEqual(self.names(response)[0], 'Carol Developer')
+        self.assertEqual(set(self.names(response)), {'Alice Walker', 'Bob Stone', 'Carol Developer'})
+
+        response = self.client.get(self.url, {'search': 'person3@example'})
+        self.assertEqual(self.names(response), ['Dan Brown'])
+
+    def test_prefix_and_multiple_terms(self):
+        """Test every term must match, as a prefix"""
+        response = self.client.get(self.url, {'search': 'dev bak'})
+        self.assertEqual(self.names(response), ['Alice Walker'])
+
+    def test_search_with_filters_and_facets(self):
+        """Test facets count the matching rows after filters"""
+        response = self.client.get(self.url, {'search': 'developer', 'company': self.company.id})
+
+        self.assertEqual(set(self.names(response)), {'Alice Walker', 'Carol Developer'})
+        facets = response.data['facets']
+        self.assertEqual(facets['company'], [
+            {'id': self.company.id, 'company_name': 'Test Company', 'count': 2}
+        ])
+        self.assertEqual(
+            {item['employee_status']: item['count'] for item in facets['status']},
+            {'hired': 1, 'application_received': 1}
+        )
+        self.assertEqual(facets['department'][0]['department_name'], 'Engineering')
+
+    def test_index_follows_writes(self):
+        """Test updates and deletes are reflected in search results"""
+        employee = Employee.objects.get(employee_name='Dan Brown')
+        employee.employee_name = 'Daniel Quartz'
+        employee.save()
+
+        self.assertEqual(self.names(self.client.get(self.url, {'search': 'quartz'})), ['Daniel Quartz'])
+        self.assertEqual(self.names(self.client.get(self.url, {'search': 'brown'})), [])
+
+        employee.delete()
+        self.assertEqual(self.names(self.client.get(self.url, {'search': 'quartz'})), [])
+
+    def test_search_operators_are_escaped(self):
+        """Test FTS syntax in the query cannot break the search"""
+        response = self.client.get(self.url, {'search': 'walker" OR NEAR(*'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(response), [])
+
+        response = self.client.get(self.url, {'search': '   '})
+        self.assertEqual(self.names(response), [])
+
+    def test_paginated_search(self):
+        """Test search results paginate by id, unaffected by writes between pages"""
+        response = self.client.get(self.url, {'search': 'developer', 'page_size': 2})
+        first_page = [row['id'] for row in response.data['results']]
+        self.assertIn('facets', response.data)
+
+        # Changes the term statistics every bm25 rank depends on
+        Employee.objects.filter(employee_name='Dan Brown').update(designation='Developer Developer')
+        response = self.client.get(response.data['next'])
+        ids = first_page + [row['id'] for row in response.data['results']]
+        self.assertEqual(ids, list(Employee.objects.order_by('id').values_list('id', flat=True)))
+
+
+class ConditionalGetTest(APITestCase):
+    """Integration tests for ETag / Last-Modified support on the read endpoints"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+
+    def create_employee(self, email='john@example.com'):
+        return Employee.objects.create(
+            employee_name='John Doe',
+            email_address=email,
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            company=self.company,
+            department=self.department,
+        )
+
+    def employee_row(self, email):
+        return {
+            'company': self.company.id,
+            'department': self.department.id,
+            'employee_name': 'Bulk Employee',
+            'email_address': email,
+            'mobile_number': '+1234567890',
+            'address': '1 Test Street',
+            'designation': 'Developer',
+        }
+
+    def employee_version(self):
+        return versions.current(Employee)[0]['core.employee']
+
+    def test_not_modified_skips_the_query(self):
+        """Test a matching If-None-Match returns 304 after only the version lookup"""
+        url = reverse('company-list-create')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since(self):
+        """Test Last-Modified round-trips through If-Modified-Since"""
+        url = reverse('department-detail', args=[self.department.id])
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_change_the_etag(self):
+        """Test single-row writes on any dependent table invalidate the ETag"""
+        url = reverse('company-list-create')
+        etag = self.client.get(url)['ETag']
+
+        # Employee writes change the company headcount counters
+        employee = self.create_employee()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['number_of_employees'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        employee.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['number_of_employees'], 0)
+
+    def test_bulk_writes_change_the_etag(self):
+        """Test bulk endpoints bump the version once per request"""
+        url = reverse('employee-list-create')
+        etag = self.client.get(url)['ETag']
+        version = self.employee_version()
+
+        response = self.client.post(reverse('employee-bulk'), [
+            self.employee_row('a@example.com'), self.employee_row('b@example.com'),
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.employee_version(), version + 1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+        etag = self.client.get(url)['ETag']
+        response = self.client.delete(reverse('employee-bulk'), {'ids': response.data['ids']}, format='json')
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertEqual(self.employee_version(), version + 2)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_the_representation(self):
+        """Test query string and format produce distinct ETags"""
+        url = reverse('employee-report')
+        etags = {
+            self.client.get(url)['ETag'],
+            self.client.get(url, {'page_size': 10})['ETag'],
+            self.client.get(url, {'format': 'csv'})['ETag'],
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_company_departments(self):
+        """Test the company departments endpoint is conditional too"""
+        url = reverse('company-departments', args=[self.company.id])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Employee writes do not touch this representation
+        self.create_employee()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Department.objects.create(department_name='Sales', company=self.company)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_permissions_checked_first(self):
+        """Test an unauthenticated request never gets a 304"""
+        url = reverse('company-list-create')
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(None)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EmployeeReportCacheTest(APITestCase):
+    """Integration tests for the cached hired-employee report"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse('employee-report')
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.empty_department = Department.objects.create(department_name='Sales', company=self.company)
+        self.hired = self.create_employee('Hired Person', 'hired@example.com', 'hired')
+        self.applicant = self.create_employee('Applicant', 'applicant@example.com', 'application_received')
+
+    def create_employee(self, name, email, employee_status):
+        return Employee.objects.create(
+            employee_name=name,
+            email_address=email,
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            employee_status=employee_status,
+            hired_on=date.today() if employee_status == 'hired' else None,
+            company=self.company,
+            department=self.department,
+        )
+
+    def report_version(self):
+        return versions.current(report_cache.REPORT)[0][report_cache.REPORT]
+
+    def test_warm_report_skips_the_join(self):
+        """Test a cached report only costs the version lookups"""
+        response = self.client.get(self.url)
+        self.assertEqual([row['employee_name'] for row in response.json()], ['Hired Person'])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual([row['employee_name'] for row in response.json()], ['Hired Person'])
+
+    def test_hired_changes_invalidate(self):
+        """Test hiring, editing and removing hired employees refresh the report"""
+        self.client.get(self.url)
+
+        self.applicant.employee_status = 'hired'
+        self.applicant.hired_on = date.today()
+        self.applicant.save()
+        self.assertEqual(len(self.client.get(self.url).json()), 2)
+
+        self.hired.designation = 'Lead Developer'
+        self.hired.save()
+        positions = {row['position'] for row in self.client.get(self.url).json()}
+        self.assertIn('Lead Developer', positions)
+
+        self.hired.employee_status = 'not_accepted'
+        self.hired.save()
+        self.assertEqual(len(self.client.get(self.url).json()), 1)
+
+        self.applicant.delete()
+        self.assertEqual(self.client.get(self.url).json(), [])
+
+    def test_unrelated_writes_keep_the_cache(self):
+        """Test writes that cannot change the report leave it cached"""
+        version = self.report_version()
+        self.applicant.designation = 'Tester'
+        self.applicant.save()
+        self.create_employee('Another Applicant', 'another@example.com', 'interview_scheduled')
+        self.empty_department.department_name = 'Marketing'
+        self.empty_department.save()
+        self.department.save()
+        self.assertEqual(self.report_version(), version)
+
+    def test_renames_invalidate(self):
+        """Test renaming a company or department with hired employees refreshes the report"""
+        self.client.get(self.url)
+
+        self.department.department_name = 'Platform'
+        self.department.save()
+        self.assertEqual(self.client.get(self.url).json()[0]['department_name'], 'Platform')
+
+        company = Company.objects.get(pk=self.company.pk)
+        company.company_name = 'Renamed Company'
+        company.save()
+        self.assertEqual(self.client.get(self.url).json()[0]['company_name'], 'Renamed Company')
+
+    def test_bulk_writes_invalidate(self):
+        """Test bulk creates of hired employees refresh the report"""
+        self.client.get(self.url)
+        response = self.client.post(reverse('employee-bulk'), [{
+            'company': self.company.id,
+            'department': self.department.id,
+            'employee_status': 'hired',
+            'employee_name': 'Bulk Hire',
+            'email_address': 'bulk@example.com',
+            'mobile_number': '+1234567890',
+            'address': '1 Test Street',
+            'designation': 'Developer',
+            'hired_on': str(date.today()),
+        }], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.client.get(self.url).json()), 2)
+
+    @override_settings(EMPLOYEE_REPORT_CACHE=None)
+    def test_cache_can_be_disabled(self):
+        """Test every request runs the report query when caching is off"""
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+    def test_concurrent_misses_wait_for_the_builder(self):
+        """Test a miss while another worker holds the rebuild lock reuses its result"""
+        cache = caches['default']
+        today = date.today()
+        key = report_cache.cache_key(today)
+        cache.add(f'{key}:lock', True, 30)
+
+        def finish_rebuild():
+            cache.set(key, ['built elsewhere'])
+            cache.delete(f'{key}:lock')
+
+        build = mock.Mock(return_value=['built here'])
+        with mock.patch.object(report_cache.time, 'sleep', side_effect=lambda _seconds: finish_rebuild()):
+            self.assertEqual(report_cache.get_or_build(today, build), ['built elsewhere'])
+        build.assert_not_called()
+
+
+class DashboardStatsTest(APITestCase):
+    """Integration tests for the dashboard statistics endpoint"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse('dashboard-stats')
+
+        self.company = Company.objects.create(company_name='Beta Corp')
+        self.empty_company = Company.objects.create(company_name='Alpha Corp')
+        self.engineering = Department.objects.create(department_name='Engineering', company=self.company)
+        self.sales = Department.objects.create(department_name='Sales', company=self.company)
+        for i, employee_status in enumerate(['hired', 'hired', 'interview_scheduled']):
+            self.create_employee(i, employee_status)
+
+    def create_employee(self, i, employee_status):
+        return Employee.objects.create(
+            employee_name=f'Employee {i}',
+            email_address=f'employee{i}@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            employee_status=employee_status,
+            hired_on=date.today() if employee_status == 'hired' else None,
+            company=self.company,
+            department=self.engineering,
+        )
+
+    def test_counts(self):
+        """Test totals, companies and departments including empty ones"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        totals = response.data['totals']
+        self.assertEqual((totals['companies'], totals['departments'], totals['employees']), (2, 2, 3))
+        self.assertEqual(totals['by_status'], {
+            'application_received': 0, 'interview_scheduled': 1, 'hired': 2, 'not_accepted': 0,
+        })
+
+        companies = response.data['companies']
+        self.assertEqual([company['company_name'] for company in companies], ['Alpha Corp', 'Beta Corp'])
+        self.assertEqual((companies[0]['departments'], companies[0]['employees']), (0, 0))
+        self.assertEqual((companies[1]['departments'], companies[1]['employees']), (2, 3))
+        self.assertEqual(companies[1]['by_status']['hired'], 2)
+
+        departments = {department['department_name']: department for department in response.data['departments']}
+        self.assertEqual(departments['Engineering']['employees'], 3)
+        self.assertEqual(departments['Engineering']['by_status']['interview_scheduled'], 1)
+        self.assertEqual(departments['Sales']['employees'], 0)
+        self.assertEqual(departments['Sales']['company'], self.company.id)
+
+    @override_settings(DASHBOARD_STATS_CACHE_TIMEOUT=0)
+    def test_single_aggregate_query(self):
+        """Test the statistics come from one query besides the version lookup"""
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+        for i in range(3, 20):
+            self.create_employee(i, 'not_accepted')
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['totals']['by_status']['not_accepted'], 17)
+
+    def test_cached_stats_follow_writes(self):
+        """Test cached statistics are reused until a write changes the tables"""
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        # Only the version lookup, shared by the ETag and the cache key
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['totals']['employees'], 3)
+
+        self.create_employee(3, 'hired')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['totals']['employees'], 4)
+
+    def test_requires_authentication(self):
+        """Test statistics are readable by every role but not anonymously"""
+        employee_user = User.objects.create_user(
+            username='employee', email='employee@example.com', password='employeepass123', role='employee'
+        )
+        self.client.force_authenticate(employee_user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+class HiringRollupTest(APITestCase):
+    """Tests for the incrementally maintained hiring rollups and the trends endpoint"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.url = reverse('hiring-trends')
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.other_company = Company.objects.create(company_name='Other Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.other_department = Department.objects.create(department_name='Sales', company=self.other_company)
+
+    def create_employee(self, i, hired_on=None, department=None, employee_status=None):
+        department = department or self.department
+        return Employee.objects.create(
+            employee_name=f'Employee {i}',
+            email_address=f'employee{i}@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            employee_status=employee_status or ('hired' if hired_on else 'application_received'),
+            hired_on=hired_on,
+            company=department.company,
+            department=department,
+        )
+
+    def rollup_state(self):
+        return {
+            (row.period_type, row.scope, row.scope_id, row.period_start): row.hires
+            for row in HiringRollup.objects.exclude(hires=0)
+        }
+
+    def total_hires(self):
+        return sum(hires for key, hires in self.rollup_state().items() if key[:2] == ('day', 'all'))
+
+    def assertMatchesRebuild(self):
+        state = self.rollup_state()
+        rollups.rebuild()
+        self.assertEqual(state, self.rollup_state())
+
+    def test_hired_on_as_string(self):
+        """Test an instance created with an ISO date string is counted under that date"""
+        self.create_employee(1, hired_on='2024-03-05')
+
+        self.assertEqual(self.rollup_state()[('day', 'all', 0, date(2024, 3, 5))], 1)
+        self.assertMatchesRebuild()
+
+    def test_single_row_writes(self):
+        """Test hires, edits, moves and deletes update the rollups incrementally"""
+        employee = self.create_employee(1, date(2024, 3, 15))
+        self.create_employee(2, date(2024, 3, 20))
+        applicant = self.create_employee(3)
+        expected = {}
+        for scope, scope_id in (('all', 0), ('company', self.company.id), ('department', self.department.id)):
+            expected.update({
+                ('day', scope, scope_id, date(2024, 3, 15)): 1,
+                ('day', scope, scope_id, date(2024, 3, 20)): 1,
+                ('month', scope, scope_id, date(2024, 3, 1)): 2,
+            })
+        self.assertEqual(self.rollup_state(), expected)
+
+        employee.hired_on = date(2024, 4, 1)
+        employee.save()
+        employee.company = self.other_company
+        employee.department = self.other_department
+        employee.save()
+        applicant.employee_status = 'hired'
+        applicant.hired_on = date(2024, 3, 20)
+        applicant.save()
+        self.assertMatchesRebuild()
+
+        employee = Employee.objects.get(pk=employee.pk)
+        employee.employee_status = 'not_accepted'
+        employee.save()
+        self.assertMatchesRebuild()
+
+        Employee.objects.get(pk=applicant.pk).delete()
+        self.department.delete()
+        self.assertEqual(self.rollup_state(), {})
+
+    def test_bulk_writes(self):
+        """Test the bulk endpoints keep the rollups consistent"""
+        rows = [{
+            'company': self.company.id,
+            'department': self.department.id,
+            'employee_status': 'hired',
+            'employee_name': f'Bulk {i}',
+            'email_address': f'bulk{i}@example.com',
+            'mobile_number': '+1234567890',
+            'address': '1 Test Street',
+            'designation': 'Developer',
+            'hired_on': str(date(2024, 1, 1) + timedelta(days=i * 20)),
+        } for i in range(5)]
+        response = self.client.post(reverse('employee-bulk'), rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ids = response.data['ids']
+        self.assertEqual(self.total_hires(), 5)
+        self.assertMatchesRebuild()
+
+        rows[0].update(id=ids[0], hired_on='2023-06-01', department=self.other_department.id,
+                       company=self.other_company.id)
+        rows[1].update(id=ids[1], hired_on='2024-01-02')
+        response = self.client.put(reverse('employee-bulk'), rows[:2], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertMatchesRebuild()
+
+        self.client.delete(reverse('employee-bulk'), {'ids': ids[:3]}, format='json')
+        self.assertEqual(self.total_hires(), 2)
+        self.assertMatchesRebuild()
+
+    def test_deferred_batches(self):
+        """Test changes to more rows than one statement writes are applied in batches"""
+        with rollups.deferred():
+            employees = [self.create_employee(i, date(2024, 1, 1) + timedelta(days=i)) for i in range(60)]
+        self.assertEqual(self.total_hires(), 60)
+        self.assertMatchesRebuild()
+
+        with rollups.deferred():
+            for employee in employees[:50]:
+                employee.delete()
+        self.assertEqual(self.total_hires(), 10)
+        self.assertMatchesRebuild()
+
+    def test_monthly_series(self):
+        """Test monthly hires and running headcount with empty months filled in"""
+        self.create_employee(1, date(2023, 12, 5))
+        self.create_employee(2, date(2024, 1, 10))
+        self.create_employee(3, date(2024, 3, 1))
+        self.create_employee(4, date(2024, 3, 31), department=self.other_department)
+
+        response = self.client.get(self.url, {'start': '2024-01-15', 'end': '2024-04-30'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['period'], row['hires'], row['headcount']) for row in response.data['series']],
+            [(date(2024, 1, 1), 1, 2), (date(2024, 2, 1), 0, 2), (date(2024, 3, 1), 2, 4), (date(2024, 4, 1), 0, 4)],
+        )
+
+        response = self.client.get(self.url, {
+            'start': '2024-01-01', 'end': '2024-04-30', 'company': self.other_company.id,
+        })
+        self.assertEqual([row['hires'] for row in response.data['series']], [0, 0, 1, 0])
+
+    def test_daily_series_and_tenure(self):
+        """Test the daily series and the tenure buckets as of today"""
+        today = date.today()
+        self.create_employee(1, today - timedelta(days=10))
+        self.create_employee(2, today - timedelta(days=10))
+        self.create_employee(3, today - timedelta(days=400))
+        self.create_employee(4, today - timedelta(days=3000))
+
+        response = self.client.get(self.url, {
+            'interval': 'day', 'start': str(today - timedelta(days=11)), 'end': str(today),
+        })
+        series = response.data['series']
+        self.assertEqual(len(series), 12)
+        self.assertEqual((series[1]['hires'], series[1]['headcount']), (2, 4))
+        self.assertEqual(series[0]['headcount'], 2)
+
+        tenure = {bucket['bucket']: bucket['employees'] for bucket in response.data['tenure']}
+        self.assertEqual(tenure, {
+            '0-90 days': 2, '91-365 days': 0, '1-2 years': 1, '2-5 years': 0, '5+ years': 1,
+        })
+
+    def test_constant_queries(self):
+        """Test the endpoint cost does not depend on the history length"""
+        for i in range(30):
+            self.create_employee(i, date(2020, 1, 1) + timedelta(days=i * 60))
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {'start': '2020-01-01', 'end': '2024-12-31'})
+        self.assertEqual(len(response.data['series']), 60)
+        self.assertEqual(response.data['series'][-1]['headcount'], 30)
+
+    def test_invalid_parameters(self):
+        """Test bad intervals, dates and ranges are rejected"""
+        for params in ({'interval': 'week'}, {'start': '2024-13-01'}, {'company': 'abc'},
+                       {'start': '2024-02-01', 'end': '2024-01-01'},
+                       {'interval': 'day', 'start': '1990-01-01', 'end': '2024-01-01'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_rebuild_command(self):
+        """Test rebuild_rollups repairs rollups changed behind the signals' back"""
+        self.create_employee(1, date(2024, 5, 5))
+        Employee.objects.update(hired_on=date(2024, 6, 6))
+        out = StringIO()
+        call_command('rebuild_rollups', stdout=out)
+        self.assertIn('6 rows', out.getvalue())
+        self.assertEqual(
+            {key for key in self.rollup_state() if key[1] == 'department'},
+            {('day', 'department', self.department.id, date(2024, 6, 6)),
+             ('month', 'department', self.department.id, date(2024, 6, 1))},
+        )
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTest(APITestCase):
+    """Regression tests: hot endpoints must not full-scan the core tables"""
+
+    # "SCAN core_employee" without an index means every row is read
+    FULL_SCAN_RE = re.compile(r'^SCAN (core_employee|core_department|core_company)\b(?!.*\bINDEX\b)')
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+
+        self.company = Company.objects.create(company_name='Test Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.employee = Employee.objects.create(
+            employee_name='John Doe',
+            email_address='john@example.com',
+            mobile_number='+1234567890',
+            address='123 Test Street',
+            designation='Developer',
+            company=self.company,
+            department=self.department,
+        )
+
+    def full_scans(self, queries):
+        """Plan lines that read a whole core table, with the offending SQL"""
+        scans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    if self.FULL_SCAN_RE.search(detail):
+                        scans.append(f'{detail}\n    {sql}')
+        return scans
+
+    def assertIndexedRequest(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400, response.content)
+        scans = self.full_scans(context.captured_queries)
+        self.assertEqual(scans, [], f'{method.upper()} {url} {data or ""} reads whole tables:\n' + '\n'.join(scans))
+
+    def test_employee_list_filters(self):
+        """Test employee filters and ordering are served by indexes"""
+        url = reverse('employee-list-create')
+        self.assertIndexedRequest('get', url, {'page_size': 10})
+        self.assertIndexedRequest('get', url, {'status': 'hired'})
+        self.assertIndexedRequest('get', url, {'department': self.department.id})
+        self.assertIndexedRequest('get', url, {
+            'company': self.company.id, 'department': self.department.id, 'status': 'application_received',
+        })
+
+    def test_company_and_department_lists(self):
+        """Test company and department listings are served by indexes"""
+        self.assertIndexedRequest('get', reverse('company-list-create'), {'page_size': 10})
+        self.assertIndexedRequest('get', reverse('department-list-create'), {'page_size': 10})
+        self.assertIndexedRequest('get', reverse('department-list-create'), {'company': self.company.id})
+        self.assertIndexedRequest('get', reverse('company-departments', args=[self.company.id]))
+
+    def test_employee_report(self):
+        """Test the report filter and ordering are served by indexes"""
+        url = reverse('employee-report')
+        self.assertIndexedRequest('get', url, {'page_size': 10})
+        self.assertIndexedRequest('get', url, {'status': 'hired', 'page_size': 10})
+
+    def test_tenure_queries(self):
+        """Test tenure filters range-scan the hired_on indexes and tenure ordering needs no sort"""
+        for url, params in [
+            (reverse('employee-list-create'), {'ordering': '-tenure', 'page_size': 10}),
+            (reverse('employee-list-create'), {'company': self.company.id, 'ordering': '-tenure', 'min_days': 30}),
+            (reverse('employee-report'), {'ordering': 'tenure', 'page_size': 10}),
+            (reverse('employee-report'), {'hired_after': '2024-01-01', 'max_days': 365}),
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            employee_queries = [query['sql'] for query in context.captured_queries
+                                if '"core_employee"."hired_on"' in query['sql'] and 'ORDER BY' in query['sql']]
+            self.assertTrue(employee_queries)
+            with connection.cursor() as cursor:
+                for sql in employee_queries:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = ' '.join(row[-1] for row in cursor.fetchall())
+                    self.assertRegex(plan, r'INDEX core_emp_(co_)?status_hired_idx', sql)
+                    if 'ordering' in params:
+                        self.assertNotIn('TEMP B-TREE', plan, sql)
+
+    def test_employee_writes(self):
+        """Test the duplicate email check and detail lookups use indexes"""
+        self.assertIndexedRequest('post', reverse('employee-list-create'), {
+            'company': self.company.id,
+            'department': self.department.id,
+            'employee_name': 'Jane Doe',
+            'email_address': 'Jane@Example.com',
+            'mobile_number': '+1234567890',
+            'address': '1 Test Street',
+            'designation': 'Developer',
+        })
+        self.assertIndexedRequest('get', reverse('employee-detail', args=[self.employee.id]))
+
+    def test_email_unique_ignoring_case(self):
+        """Test the database rejects emails differing only in case"""
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Employee.objects.create(
+                    employee_name='John Again',
+                    email_address='JOHN@example.com',
+                    mobile_number='+1234567890',
+                    address='123 Test Street',
+                    designation='Developer',
+                    company=self.company,
+                    department=self.department,
+                )
+
+
+class FieldsetTest(APITestCase):
+    """Tests for ?fields= / ?expand= and the query planning behind them"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.company = Company.objects.create(company_name='Test Company')
+        self.department = Department.objects.create(department_name='Engineering', company=self.company)
+        self.employees = [
+            Employee.objects.create(
+                employee_name=f'Employee {i}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address='A long address line ' * 20,
+                designation='Developer',
+                employee_status='hired',
+                hired_on=date.today() - timedelta(days=10 + i),
+                company=self.company,
+                department=self.department,
+            )
+            for i in range(3)
+        ]
+
+    def get_with_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        employee_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "core_employee"' in query['sql'] and 'core_tableversion' not in query['sql']
+        ]
+        return response, employee_queries
+
+    def test_sparse_fields_narrow_the_query(self):
+        """Test ?fields= limits the output, the selected columns and the joins"""
+        response, queries = self.get_with_queries(reverse('employee-list-create'), {'fields': 'id,employee_name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()[0], {'id': self.employees[0].id, 'employee_name': 'Employee 0'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0])
+        self.assertNotIn('"address"', queries[0])
+
+    def test_default_fields_skip_unused_columns(self):
+        """Test the full list representation still leaves out columns it does not show"""
+        response, queries = self.get_with_queries(reverse('employee-list-create'))
+
+        self.assertEqual(response.json()[0]['company_name'], 'Test Company')
+        self.assertEqual(response.json()[0]['days_employed'], 10)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"address"', queries[0])
+        self.assertNotIn('number_of_employees', queries[0])
+
+    def test_expand(self):
+        """Test ?expand= nests related objects, joining only what is expanded"""
+        response, queries = self.get_with_queries(
+            reverse('employee-list-create'), {'fields': 'id', 'expand': 'company'}
+        )
+        self.assertEqual(response.json()[0], {
+            'id': self.employees[0].id,
+            'company': {
+                'id': self.company.id,
+                'company_name': 'Test Company',
+                'number_of_departments': 1,
+                'number_of_employees': 3,
+            },
+        })
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"core_company"', queries[0])
+        self.assertNotIn('"core_department"', queries[0])
+
+        # On the detail endpoint the expansion replaces the company id
+        response = self.client.get(
+            reverse('employee-detail', args=[self.employees[0].id]), {'expand': 'company,department'}
+        )
+        self.assertEqual(response.json()['company']['company_name'], 'Test Company')
+        self.assertEqual(response.json()['department']['department_name'], 'Engineering')
+        self.assertEqual(response.json()['employee_name'], 'Employee 0')
+
+    def test_unknown_names_rejected(self):
+        """Test unknown fields and expansions return 400"""
+        response = self.client.get(reverse('employee-list-create'), {'fields': 'id,salary'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('salary', response.json()['fields'][0])
+
+        response = self.client.get(reverse('employee-report'), {'expand': 'manager'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('manager', response.json()['expand'][0])
+
+    def test_writes_return_full_representation(self):
+        """Test ?fields= is ignored by writes"""
+        employee = self.employees[0]
+        response = self.client.put(reverse('employee-detail', args=[employee.id]) + '?fields=id', {
+            'company': self.company.id,
+            'department': self.department.id,
+            'employee_status': 'hired',
+            'employee_name': employee.employee_name,
+            'email_address': employee.email_address,
+            'mobile_number': employee.mobile_number,
+            'address': employee.address,
+            'designation': 'Lead',
+            'hired_on': str(employee.hired_on),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['designation'], 'Lead')
+        self.assertIn('address', response.json())
+
+    def test_paginated_sparse_fields(self):
+        """Test keyset pages still read their ordering from sparse rows without extra queries"""
+        url = reverse('employee-report')
+        response, queries = self.get_with_queries(url, {'fields': 'id', 'page_size': 2})
+        self.assertEqual([row.keys() for row in response.json()['results']], [{'id'}, {'id'}])
+        self.assertEqual(len(queries), 1)
+
+        response = self.client.get(response.json()['next'])
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.employees[2].id])
+
+    def test_report_fieldsets(self):
+        """Test sparse reports are cached separately and exports honour ?fields="""
+        url = reverse('employee-report')
+        full = self.client.get(url).json()
+        sparse = self.client.get(url, {'fields': 'employee_name,days_employed'}).json()
+        self.assertEqual(len(full[0]), 9)
+        self.assertEqual(sparse[0], {'employee_name': 'Employee 0', 'days_employed': 10})
+        self.assertEqual(self.client.get(url).json(), full)
+
+        response = self.client.get(url, {'format': 'csv', 'fields': 'days_employed,employee_name'})
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[:2], [['employee_name', 'days_employed'], ['Employee 0', '10']])
+
+        response = self.client.get(url, {'format': 'csv', 'fields': 'address'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(EMPLOYEE_REPORT_CACHE=None)
+class FastListSerializationTest(APITestCase):
+    """Tests for the values()-based list serialization in core.fast_serializers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='manager', email='manager@example.com', password='managerpass123', role='manager'
+        )
+        company = Company.objects.create(company_name='Test Company')
+        department = Department.objects.create(department_name='Engineering', company=company)
+        for i, (employee_status, hired_on) in enumerate([
+            ('hired', date.today() - timedelta(days=30)),
+            ('hired', date.today() - timedelta(days=30)),
+            ('hired', date(2020, 2, 29)),
+            ('interview_scheduled', None),
+            ('not_accepted', date(2021, 1, 1)),
+        ]):
+            Employee.objects.create(
+                employee_name=f'Employee \u00e9 "{i}"',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address=f'{i} Test Street',
+                designation='Developer',
+                employee_status=employee_status,
+                hired_on=hired_on,
+                company=company,
+                department=department,
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def assertSameContent(self, url, data=None):
+        responses = []
+        for fast in (False, True):
+            with override_settings(FAST_LIST_SERIALIZATION=fast):
+                responses.append(self.client.get(url, data))
+        self.assertEqual(responses[0].status_code, status.HTTP_200_OK)
+        self.assertEqual(responses[0].content, responses[1].content)
+
+    def test_output_matches_serializers(self):
+        """Test the fast path renders byte-identical lists, pages and reports"""
+        for url, data in [
+            (reverse('employee-list-create'), None),
+            (reverse('employee-list-create'), {'status': 'hired', 'fields': 'days_employed,id'}),
+            (reverse('employee-list-create'), {'page_size': 2}),
+            (reverse('employee-list-create'), {'page_size': 2, 'fields': 'hired_on'}),
+            (reverse('employee-list-create'), {'search': 'developer', 'page_size': 2}),
+            (reverse('employee-list-create'), {'expand': 'company'}),
+            (reverse('employee-report'), None),
+            (reverse('employee-report'), {'fields': 'position,days_employed'}),
+            (reverse('employee-report'), {'page_size': 2}),
+        ]:
+            with self.subTest(url=url, data=data):
+                self.assertSameContent(url, data)
+
+    def test_pages_follow_the_same_cursors(self):
+        """Test keyset pages built from values() rows link to the same next page"""
+        url = reverse('employee-list-create')
+        for fast in (False, True):
+            with override_settings(FAST_LIST_SERIALIZATION=fast):
+                first = self.client.get(url, {'page_size': 2}).json()
+                second = self.client.get(first['next']).json()
+            self.assertEqual([row['id'] for row in second['results']], [
+                employee.id for employee in Employee.objects.order_by('employee_name', 'id')[2:4]
+            ])
+
+    def test_plan(self):
+        """Test plans read plain columns and skip serializers they cannot reproduce"""
+        plan = fast_serializers.compile_plan(EmployeeListSerializer(), Employee)
+        self.assertIn('company__company_name', plan.lookups)
+        self.assertNotIn('address', plan.lookups)
+
+        class MethodSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Employee
+                fields = ['id', 'label']
+
+            def get_label(self, employee):
+                return str(employee)
+
+        self.assertIsNone(fast_serializers.compile_plan(MethodSerializer(), Employee))
+        self.assertIsNone(fast_serializers.compile_plan(EmployeeSerializer(), Company))
+
+
+class FastJSONRendererTest(TestCase):
+    """Tests for core.renderers.FastJSONRenderer"""
+
+    def test_matches_json_renderer(self):
+        """Test the output is byte-identical to DRF's JSONRenderer"""
+        data = {
+            'text': 'caf\u00e9 \u2028 "quoted" <script>',
+            'numbers': [1, -2, 3.5, None, True],
+            'when': datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'day': date(2024, 1, 2),
+            'amount': Decimal('12.50'),
+            'lazy': gettext_lazy('Not found.'),
+            'nested': [{'id': 1, 'tags': ('a', 'b')}],
+        }
+        for value in (data, [data, data], {1: 'integer key'}, [2 ** 70]):
+            with self.subTest(value=value):
+                self.assertEqual(FastJSONRenderer().render(value), JSONRenderer().render(value))
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+
+    def test_is_the_default_renderer(self):
+        """Test API responses are rendered by FastJSONRenderer"""
+        user = User.objects.create_user(
+            username='manager', email='manager@example.com', password='managerpass123', role='manager'
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        Company.objects.create(company_name='Caf\u00e9 Company')
+
+        response = client.get(reverse('company-list-create'))
+
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+class CompressionTest(APITestCase):
+    """Tests for core.compression.CompressionMiddleware"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='manager', email='manager@example.com', password='managerpass123', role='manager'
+        )
+        company = Company.objects.create(company_name='Test Company')
+        department = Department.objects.create(department_name='Engineering', company=company)
+        Employee.objects.bulk_create([
+            Employee(
+                employee_name=f'Employee {i}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address=f'{i} Test Street',
+                designation='Developer',
+                employee_status='hired',
+                hired_on=date(2024, 1, 1),
+                company=company,
+                department=department,
+            )
+            for i in range(50)
+        ])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.url = reverse('employee-list-create')
+
+    def test_gzip(self):
+        """Test large JSON responses are gzipped for clients accepting it"""
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='deflate, gzip;q=0.8')
+
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+
+    def test_weak_etag_revalidates(self):
+        """Test the weakened ETag of a compressed response still yields a 304"""
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_negotiation(self):
+        """Test refused, unsupported and wildcard encodings"""
+        self.assertEqual(compression.negotiate('gzip;q=0, br;q=0', ['br', 'gzip']), None)
+        self.assertEqual(compression.negotiate('identity', ['br', 'gzip']), None)
+        self.assertEqual(compression.negotiate('*', ['br', 'gzip']), 'br')
+        self.assertEqual(compression.negotiate('gzip, br;q=0.5', ['br', 'gzip']), 'gzip')
+        self.assertEqual(compression.negotiate('gzip, br', ['br', 'gzip']), 'br')
+
+    @skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli(self):
+        """Test brotli is preferred when both encodings are accepted"""
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), plain.content)
+
+    def test_small_responses_are_not_compressed(self):
+        """Test bodies under COMPRESSION_MIN_SIZE are sent as they are"""
+        response = self.client.get(self.url, {'fields': 'id', 'page_size': 2}, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_streaming_export(self):
+        """Test streamed exports are compressed chunk by chunk"""
+        plain = self.client.get(reverse('employee-report'), {'format': 'csv'})
+        response = self.client.get(reverse('employee-report'), {'format': 'csv'}, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(plain.streaming_content))
+
+    def test_gzip_length_is_randomized(self):
+        """Test gzip bodies carry random-length header padding against BREACH, streamed or not"""
+        content = b'employee_name,email_address\n' * 100
+        request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        middleware = compression.CompressionMiddleware(lambda request: None)
+
+        bodies = []
+        for _ in range(10):
+            bodies.append(middleware.process_response(request, HttpResponse(content, content_type='text/csv')).content)
+            streamed = StreamingHttpResponse(iter([content[:1000], content[1000:]]), content_type='text/csv')
+            bodies.append(b''.join(middleware.process_response(request, streamed).streaming_content))
+
+        self.assertEqual({gzip.decompress(body) for body in bodies}, {content})
+        self.assertGreater(len({len(body) for body in bodies}), 1)
+
+    def test_encoded_responses_are_left_alone(self):
+        """Test responses that set their own Content-Encoding are not compressed again"""
+        response = StreamingHttpResponse(iter([b'already compressed']), content_type='text/csv')
+        response['Content-Encoding'] = 'gzip'
+        request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+        response = compression.CompressionMiddleware(lambda request: response)(request)
+
+        self.assertEqual(b''.join(response.streaming_content), b'already compressed')
+
+
+@override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=1)
+class InstrumentationTest(APITestCase):
+    """Tests for the Server-Timing middleware in core.instrumentation"""
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username='manager', email='manager@example.com', password='managerpass123', role='manager'
+        )
+        self.client.force_authenticate(user)
+        company = Company.objects.create(company_name='Test Company')
+        Department.objects.create(department_name='Engineering', company=company)
+
+    def server_timing(self, response):
+        return {
+            part.split(';')[0].strip(): part for part in response['Server-Timing'].split(',')
+        }
+
+    def test_server_timing(self):
+        """Test sampled requests report queries and phase timings, and log them"""
+        with self.assertLogs('core.instrumentation', 'INFO') as logs, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('department-list-create'))
+
+        timing = self.server_timing(response)
+        self.assertEqual(set(timing), {'db', 'serialize', 'view', 'render', 'total'})
+        self.assertIn(f'desc="{len(queries.captured_queries)} queries"', timing['db'])
+        record = logs.records[0]
+        self.assertEqual(record.timings['queries'], len(queries.captured_queries))
+        self.assertEqual(record.timings['status'], 200)
+        self.assertIn('path=/api/core/departments/', record.getMessage())
+        self.assertLessEqual(record.timings['view'], record.timings['total'])
+
+    def test_fast_serialization_is_timed(self):
+        """Test the values()-based list serialization counts as serializer time"""
+        with self.assertLogs('core.instrumentation', 'INFO'):
+            response = self.client.get(reverse('employee-list-create'))
+
+        self.assertIn('serialize', self.server_timing(response))
+
+    def test_sampling(self):
+        """Test requests outside the sample are not measured"""
+        with override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0.5), \
+                mock.patch.object(instrumentation.random, 'random', return_value=0.7):
+            response = self.client.get(reverse('company-list-create'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_disabled(self):
+        """Test a sample rate of 0 takes the middleware out of the stack"""
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username='manager'))
+
+        response = client.get(reverse('company-list-create'))
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertFalse(any(
+            isinstance(getattr(middleware, '__self__', None), instrumentation.InstrumentationMiddleware)
+            for middleware in client.handler._view_middleware
+        ))
+
+
+class AsyncReadViewTest(APITestCase):
+    """Tests for the native async read path in core.async_views"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='employeepass123',
+            role='employee'
+        )
+        cls.token = str(AccessToken.for_user(cls.user))
+        cls.company = Company.objects.create(company_name='Test Company')
+        cls.department = Department.objects.create(department_name='Engineering', company=cls.company)
+        cls.employees = [
+            Employee.objects.create(
+                employee_name=f'Employee {i}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address='123 Test Street',
+                designation='Developer',
+                employee_status='hired',
+                hired_on=date.today() - timedelta(days=i),
+                company=cls.company,
+                department=cls.department,
+            )
+            for i in range(3)
+        ]
+
+    async def fetch_both(self, async_view_class, path, kwargs=None, data=None, headers=None):
+        """GET ``path`` through the async view and its DRF view; returns both responses"""
+        kwargs = kwargs or {}
+        async_view = async_view_class.as_view()
+        async_response = await async_view(AsyncRequestFactory().get(path, data, headers=headers), **kwargs)
+        if hasattr(async_response, 'render'):
+            # Fallback responses are rendered by the request handler
+            await sync_to_async(async_response.render)()
+
+        def sync_get():
+            sync_view = async_view_class.view_class.as_view()
+            response = sync_view(APIRequestFactory().get(path, data, headers=headers), **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+
+        return async_response, await sync_to_async(sync_get)()
+
+    def assertSameResponse(self, async_response, sync_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        for header in ('Content-Type', 'ETag', 'Last-Modified', 'Vary', 'Allow', 'Cache-Control'):
+            self.assertEqual(async_response.get(header), sync_response.get(header), header)
+
+    async def test_native_responses_match_sync_views(self):
+        """Test each read endpoint answers natively with the DRF view's exact response"""
+        auth = {'Authorization': f'Bearer {self.token}'}
+        employee = self.employees[0]
+        cases = [
+            (async_views.CompanyListView, '/api/core/companies/', {}, None),
+            (async_views.CompanyDetailView, '/api/core/companies/', {'pk': self.company.pk}, None),
+            (async_views.DepartmentListView, '/api/core/departments/', {}, {'company': self.company.pk}),
+            (async_views.DepartmentDetailView, '/api/core/departments/', {'pk': self.department.pk}, None),
+            (async_views.EmployeeListView, '/api/core/employees/', {}, {'status': 'hired'}),
+            (async_views.EmployeeListView, '/api/core/employees/', {}, {'fields': 'id,days_employed', 'expand': 'company'}),
+            (async_views.EmployeeDetailView, '/api/core/employees/', {'pk': employee.pk}, None),
+            (async_views.EmployeeReportView, '/api/core/employees/report/', {}, None),
+            (async_views.CompanyDepartmentsView, '/api/core/companies/departments/',
+             {'company_id': self.company.pk}, None),
+        ]
+        for async_view_class, path, kwargs, data in cases:
+            with self.subTest(view=async_view_class.__name__):
+                async_response, sync_response = await self.fetch_both(async_view_class, path, kwargs, data, auth)
+                self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+                # Served natively rather than by the DRF fallback
+                self.assertNotIsInstance(async_response, Response)
+                self.assertSameResponse(async_response, sync_response)
+
+                async_response, sync_response = await self.fetch_both(
+                    async_view_class, path, kwargs, data, dict(auth, **{'If-None-Match': async_response['ETag']})
+                )
+                self.assertEqual(async_response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertSameResponse(async_response, sync_response)
+
+    def test_queries(self):
+        """Test the native path loads the user, versions and rows, and trusts claims tokens"""
+        view = async_to_sync(async_views.CompanyListView.as_view())
+        request = AsyncRequestFactory().get('/api/core/companies/', headers={'Authorization': f'Bearer {self.token}'})
+        with self.assertNumQueries(3):
+            response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        request = AsyncRequestFactory().get('/api/core/companies/', headers={'Authorization': f'Bearer {token}'})
+        with mock.patch.object(CompanyListCreateView, 'authentication_classes', [ClaimsJWTAuthentication]):
+            with self.assertNumQueries(2):
+                response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_fallback_to_sync_views(self):
+        """Test errors, pagination, search and exports are answered by the DRF views"""
+        auth = {'Authorization': f'Bearer {self.token}'}
+        cases = [
+            (async_views.CompanyListView, '/api/core/companies/', {}, None, {}),
+            (async_views.CompanyListView, '/api/core/companies/', {}, None, {'Authorization': 'Bearer invalid'}),
+            (async_views.CompanyDetailView, '/api/core/companies/', {'pk': 0}, None, auth),
+            (async_views.EmployeeListView, '/api/core/employees/', {}, {'fields': 'salary'}, auth),
+            (async_views.EmployeeListView, '/api/core/employees/', {}, {'page_size': 2}, auth),
+            (async_views.EmployeeListView, '/api/core/employees/', {}, {'search': 'employee'}, auth),
+            (async_views.EmployeeReportView, '/api/core/employees/report/', {}, {'format': 'csv'}, auth),
+            (async_views.CompanyDepartmentsView, '/api/core/companies/departments/', {'company_id': 0}, None, auth),
+        ]
+        for async_view_class, path, kwargs, data, headers in cases:
+            with self.subTest(view=async_view_class.__name__, data=data, headers=headers):
+                async_response, sync_response = await self.fetch_both(async_view_class, path, kwargs, data, headers)
+                self.assertIsInstance(async_response, (Response, StreamingHttpResponse))
+                if isinstance(sync_response, StreamingHttpResponse):
+                    consume = sync_to_async(lambda response: b''.join(response.streaming_content))
+                    self.assertEqual(await consume(async_response), await consume(sync_response))
+                else:
+                    self.assertSameResponse(async_response, sync_response)
+
+    async def test_writes_use_sync_views(self):
+        """Test non-GET requests are delegated to the DRF view"""
+        manager = await User.objects.acreate(username='manager', email='manager@example.com', role='manager')
+        request = AsyncRequestFactory().post(
+            '/api/core/companies/', {'company_name': 'Async Company'}, content_type='application/json',
+            headers={'Authorization': f'Bearer {AccessToken.for_user(manager)}'},
+        )
+        response = await async_views.CompanyListView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Company.objects.filter(company_name='Async Company').aexists())
+
+    async def test_report_cache_shared_with_sync_view(self):
+        """Test the async report reads and fills the same cache entries as the DRF view"""
+        await sync_to_async(caches['default'].clear)()
+        auth = {'Authorization': f'Bearer {self.token}'}
+        async_response, sync_response = await self.fetch_both(
+            async_views.EmployeeReportView, '/api/core/employees/report/', headers=auth
+        )
+        self.assertSameResponse(async_response, sync_response)
+        self.assertEqual(len(json.loads(async_response.content)), 3)
+
+        # A cached entry is served as-is, even if it could not have been built
+        key = await report_cache.acache_key(date.today(), variant='application/json')
+        await caches['default'].aset(key, b'[]')
+        async_response, sync_response = await self.fetch_both(
+            async_views.EmployeeReportView, '/api/core/employees/report/', headers=auth
+        )
+        self.assertEqual(async_response.content, b'[]')
+        self.assertEqual(sync_response.content, b'[]')
+
+
+class GenerateDataCommandTest(TestCase):
+    """Tests for the generate_data management command"""
+
+    def generate(self, **options):
+        options = {'companies': 2, 'departments': 12, 'employees': 400, 'users': 2, 'batch_size': 150, **options}
+        call_command('generate_data', stdout=StringIO(), **options)
+
+    def test_generate(self):
+        """Test every status and role is generated and the derived tables agree"""
+        self.generate()
+
+        self.assertEqual(Company.objects.count(), 2)
+        self.assertEqual(Department.objects.count(), 24)
+        self.assertEqual(Employee.objects.count(), 400)
+        self.assertEqual(set(Employee.objects.values_list('employee_status', flat=True)),
+                         {value for value, _label in Employee.STATUS_CHOICES})
+        self.assertEqual(sorted(User.objects.values_list('role', flat=True)),
+                         sorted([value for value, _label in User.ROLE_CHOICES] * 2))
+        self.assertTrue(User.objects.first().check_password('password123'))
+
+        hired = Employee.objects.filter(employee_status='hired')
+        self.assertFalse(hired.filter(hired_on__isnull=True).exists())
+        self.assertFalse(hired.filter(hired_on__gt=date.today()).exists())
+        self.assertFalse(Employee.objects.exclude(employee_status='hired').filter(hired_on__isnull=False).exists())
+        self.assertFalse(Employee.objects.exclude(department__company=F('company')).exists())
+
+        self.assertEqual([list(drift) for drift in counters.find_drift()], [[], []])
+        self.assertEqual(
+            HiringRollup.objects.filter(period_type=HiringRollup.MONTH, scope=HiringRollup.ALL)
+            .aggregate(total=Sum('hires'))['total'],
+            hired.count(),
+        )
+
+    @skipUnless(connection.vendor == 'sqlite', 'The search index and dropped indexes are SQLite specific')
+    def test_indexes_restored(self):
+        """Test the employee indexes and search index are complete after the load"""
+        def indexes():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'core_employee'")
+                return sorted(row[0] for row in cursor.fetchall())
+        before = indexes()
+
+        self.generate()
+
+        self.assertEqual(indexes(), before)
+        employee = Employee.objects.order_by('pk').last()
+        self.assertIn(employee, search.search_employees(Employee.objects.all(), employee.email_address))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Employee.objects.create(
+                company=employee.company, department=employee.department, employee_name='Copy',
+                email_address=employee.email_address.upper(), mobile_number='+1', address='-', designation='-',
+            )
+
+    @skipUnless(connection.vendor == 'sqlite', 'The dropped indexes are SQLite specific')
+    def test_unique_indexes_kept(self):
+        """Test only non-unique indexes are dropped during the load"""
+        from core.management.commands.generate_data import deferred_indexes
+
+        def indexes():
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA index_list('core_employee')")
+                return {row[1]: bool(row[2]) for row in cursor.fetchall() if row[3] == 'c'}
+        before = indexes()
+        self.assertIn(True, before.values())
+
+        with transaction.atomic(), deferred_indexes(Employee):
+            self.assertEqual(indexes(), {name: unique for name, unique in before.items() if unique})
+        self.assertEqual(indexes(), before)
+
+    def test_deterministic(self):
+        """Test the same seed generates the same rows, and reruns add to existing data"""
+        def rows():
+            return list(Employee.objects.order_by('pk').values_list(
+                'department__department_name', 'employee_status', 'employee_name', 'designation', 'hired_on',
+            ))
+
+        self.generate(seed=7)
+        first = rows()
+        self.generate(seed=7)
+
+        self.assertEqual(Employee.objects.count(), 800)
+        self.assertEqual(rows()[400:], first)
+        self.assertEqual(Company.objects.count(), 4)
+
+
+class ImportEmployeesCommandTest(TestCase):
+    """Tests for the import_employees management command"""
+
+    header = ['employee_name', 'email_address', 'mobile_number', 'address', 'designation',
+              'employee_status', 'hired_on', 'company_name', 'department_name']
+
+    def setUp(self):
+        self.company = Company.objects.create(company_name='Acme Corp')
+        self.department = Department.objects.create(company=self.company, department_name='Engineering')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'applicants.csv')
+        self.errors_path = self.path + '.errors.csv'
+
+    def write_csv(self, rows):
+        with open(self.path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header)
+            writer.writerows(rows)
+
+    def row(self, i, **overrides):
+        values = {
+            'employee_name': f'Applicant {i}', 'email_address': f'applicant{i}@example.com',
+            'mobile_number': '+12345678901', 'address': f'{i} Main Street', 'designation': 'Engineer',
+            'employee_status': '', 'hired_on': '', 'company_name': 'acme  CORP', 'department_name': 'engineering',
+            **overrides,
+        }
+        return [values[column] for column in self.header]
+
+    def run_import(self, *args):
+        out = StringIO()
+        call_command('import_employees', self.path, *args, stdout=out)
+        return out.getvalue()
+
+    def rejected(self):
+        with open(self.errors_path, newline='') as f:
+            return [(row['line'], row['errors']) for row in csv.DictReader(f)]
+
+    def test_import(self):
+        """Test valid rows are imported by company/department name and invalid ones written out"""
+        self.write_csv([
+            self.row(1, employee_status='hired', hired_on='2024-03-04'),
+            self.row(2),
+            self.row(3, email_address='not-an-email'),
+            self.row(4, email_address='APPLICANT1@example.com'),
+            self.row(5, company_name='Unknown Inc'),
+            self.row(6, department_name='Sales'),
+        ])
+
+        out = self.run_import('--chunk-size', '4')
+
+        self.assertIn('Imported 2 employees', out)
+        self.assertEqual(
+            sorted(Employee.objects.values_list('employee_name', 'employee_status', 'department')),
+            [('Applicant 1', 'hired', self.department.pk), ('Applicant 2', 'application_received', self.department.pk)],
+        )
+        self.assertEqual(self.rejected(), [
+            ('4', 'email_address: Enter a valid email address.'),
+            ('5', 'email_address: Duplicate email address (line 2).'),
+            ('6', 'company_name: Unknown company "Unknown Inc".'),
+            ('7', 'department_name: Unknown department "Sales" in company "acme  CORP".'),
+        ])
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.number_of_employees, 2)
+        self.assertEqual(rollups.time_series('month', date(2024, 3, 1), date(2024, 3, 31))[0]['hires'], 1)
+
+    def test_resume_after_crash(self):
+        """Test a rerun after a failed chunk continues after the last committed one"""
+        self.write_csv([self.row(i, email_address='bad' if i % 5 == 0 else f'applicant{i}@example.com')
+                        for i in range(1, 21)])
+        insert = bulk.insert_employees
+        calls = []
+
+        def crash_on_third_chunk(employees, *args, **kwargs):
+            calls.append(len(employees))
+            if len(calls) == 3:
+                raise RuntimeError('crash')
+            return insert(employees, *args, **kwargs)
+
+        with mock.patch.object(bulk, 'insert_employees', crash_on_third_chunk), self.assertRaises(RuntimeError):
+            self.run_import('--chunk-size', '5')
+        self.assertEqual(Employee.objects.count(), 8)
+
+        out = self.run_import('--chunk-size', '5')
+
+        self.assertIn('Resuming after row 10', out)
+        self.assertIn('Imported 16 employees', out)
+        self.assertEqual(Employee.objects.count(), 16)
+        self.assertEqual([line for line, _errors in self.rejected()], ['6', '11', '16', '21'])
+
+    def test_rerun(self):
+        """Test an imported file is skipped unless restarted, and restarting rejects existing emails"""
+        self.write_csv([self.row(1)])
+        self.run_import()
+
+        self.assertIn('already imported', self.run_import())
+        self.run_import('--restart')
+
+        self.assertEqual(Employee.objects.count(), 1)
+        self.assertEqual(self.rejected(), [('2', 'An employee with this email address already exists.')])
+
+    def test_missing_columns(self):
+        """Test a file without the required columns is refused"""
+        with open(self.path, 'w') as f:
+            f.write('employee_name,email_address\nA,a@example.com\n')
+
+        with self.assertRaisesMessage(CommandError, 'missing the columns'):
+            self.run_import()
+
+
+class QueryBudgetTest(APITestCase):
+    """
+    Query budgets for every route in core/urls.py and accounts/urls.py.
+
+    Each request is made with 10 and then 1,000 rows per table and must stay
+    within its budget at both sizes without its query count growing. Caches
+    are cleared before every request, so the counts are for a cold request.
+    """
+    sizes = (10, 1000)
+
+    # (route name, request): maximum queries, including the JWT user lookup.
+    # Counts include the savepoints of atomic blocks inside the test
+    # transaction; the first write to a table also creates its version row.
+    budgets = {
+        ('company-list-create', 'list'): 3,
+        ('company-list-create', 'create'): 7,
+        ('company-detail', 'retrieve'): 3,
+        ('company-detail', 'update'): 15,
+        ('company-detail', 'delete'): 8,
+        ('department-list-create', 'list'): 3,
+        ('department-list-create', 'create'): 9,
+        ('department-detail', 'retrieve'): 3,
+        ('department-detail', 'update'): 11,
+        ('department-detail', 'delete'): 7,
+        ('employee-list-create', 'list'): 3,
+        ('employee-list-create', 'page'): 4,
+        ('employee-list-create', 'search'): 4,
+        ('employee-list-create', 'expand'): 3,
+        ('employee-list-create', 'tenure'): 3,
+        ('employee-list-create', 'create'): 17,
+        ('employee-detail', 'retrieve'): 3,
+        ('employee-detail', 'update'): 10,
+        ('employee-detail', 'delete'): 8,
+        ('employee-bulk', 'create'): 16,
+        ('employee-bulk', 'update'): 16,
+        ('employee-bulk', 'delete'): 14,
+        ('employee-bulk-transition', 'update'): 6,
+        ('employee-bulk-transition', 'hire'): 8,
+        ('employee-report', 'json'): 4,
+        ('employee-report', 'csv'): 3,
+        ('employee-report', 'tenure'): 3,
+        ('dashboard-stats', 'retrieve'): 3,
+        ('hiring-trends', 'retrieve'): 5,
+        ('company-departments', 'list'): 4,
+        ('signup', 'create'): 5,
+        ('login', 'create'): 2,
+        ('token_refresh', 'create'): 5,
+        ('logout', 'create'): 5,
+    }
+
+    def test_every_route_has_a_budget(self):
+        """Test new routes cannot be added without a query budget"""
+        from accounts import urls as accounts_urls
+        from core import urls as core_urls
+
+        routes = {pattern.name for pattern in core_urls.urlpatterns + accounts_urls.urlpatterns}
+        self.assertEqual(routes, {route for route, _request in self.budgets})
+
+    def test_query_budgets(self):
+        """Test every request stays within its budget and does not grow with the data"""
+        self.user = User.objects.create_user(
+            username='budget', email='budget@example.com', password='budgetpass123', role='admin'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.counter = 0
+
+        counts = {}
+        for size in self.sizes:
+            self.seed(size)
+            for (route, request), prepare in self.requests().items():
+                count, sql = self.count_queries(*prepare())
+                counts.setdefault((route, request), []).append((size, count, sql))
+
+        failures = []
+        for key, results in counts.items():
+            budget = self.budgets[key]
+            (_small, small_count, _small_sql), (size, count, sql) = results[0], results[-1]
+            if small_count > budget or count > budget or count > small_count:
+                failures.append(
+                    f'{key[0]} {key[1]}: {small_count} queries at {self.sizes[0]} rows, '
+                    f'{count} at {size} rows (budget {budget})\n' + '\n'.join(f'  {query}' for query in sql)
+                )
+        self.assertFalse(failures, '\n\n'.join(failures))
+
+    def seed(self, size):
+        """Top the tables up to ``size`` companies, departments, employees and users"""
+        start = Company.objects.count()
+        companies = Company.objects.bulk_create(
+            [Company(company_name=f'Company {i}') for i in range(start, size)]
+        )
+        departments = Department.objects.bulk_create([
+            Department(company=company, department_name=f'Department {i}')
+            for i, company in enumerate(companies, start)
+        ])
+        Employee.objects.bulk_create([
+            Employee(
+                company_id=department.company_id,
+                department_id=department.id,
+                employee_status='hired',
+                employee_name=f'Employee {i}',
+                email_address=f'employee{i}@example.com',
+                mobile_number='+1234567890',
+                address=f'{i} Test Street',
+                designation='Developer',
+                hired_on=date.today() - timedelta(days=i),
+            )
+            for i, department in enumerate(departments, start)
+        ])
+        password = User.objects.get(pk=self.user.pk).password
+        User.objects.bulk_create([
+            User(username=f'user{i}', email=f'user{i}@example.com', password=password)
+            for i in range(start, size)
+        ])
+        counters.recount()
+        rollups.rebuild()
+
+    def next_id(self):
+        self.counter += 1
+        return self.counter
+
+    def employee_data(self, **overrides):
+        n = self.next_id()
+        department = Department.objects.order_by('id').first()
+        data = {
+            'company': department.company_id,
+            'department': department.id,
+            'employee_status': 'hired',
+            'employee_name': f'Budget Employee {n}',
+            'email_address': f'budget{n}@example.com',
+            'mobile_number': '+1234567890',
+            'address': f'{n} Budget Street',
+            'designation': 'Developer',
+            'hired_on': date.today().isoformat(),
+        }
+        data.update(overrides)
+        return data
+
+    def new_employee(self, **overrides):
+        data = self.employee_data(**overrides)
+        data['company_id'] = data.pop('company')
+        data['department_id'] = data.pop('department')
+        return Employee.objects.create(**data)
+
+    def requests(self):
+        """``{(route, request): prepare}``; ``prepare()`` returns ``(method, url, data)``"""
+        company = Company.objects.order_by('id').first()
+        department = Department.objects.order_by('id').first()
+        employee = Employee.objects.order_by('id').first()
+
+        def new_company():
+            return Company.objects.create(company_name=f'Empty Company {self.next_id()}')
+
+        def new_department():
+            return Department.objects.create(company=company, department_name=f'Empty {self.next_id()}')
+
+        def bulk_update():
+            rows = []
+            for row in [self.new_employee() for _ in range(5)]:
+                data = self.employee_data(designation='Senior Developer')
+                data['id'] = row.id
+                rows.append(data)
+            return rows
+
+        return {
+            ('company-list-create', 'list'): lambda: ('get', reverse('company-list-create'), None),
+            ('company-list-create', 'create'): lambda: (
+                'post', reverse('company-list-create'), {'company_name': f'New Company {self.next_id()}'}),
+            ('company-detail', 'retrieve'): lambda: ('get', reverse('company-detail', args=[company.id]), None),
+            ('company-detail', 'update'): lambda: (
+                'put', reverse('company-detail', args=[company.id]), {'company_name': f'Renamed {self.next_id()}'}),
+            ('company-detail', 'delete'): lambda: (
+                'delete', reverse('company-detail', args=[new_company().id]), None),
+            ('department-list-create', 'list'): lambda: ('get', reverse('department-list-create'), None),
+            ('department-list-create', 'create'): lambda: ('post', reverse('department-list-create'), {
+                'company': company.id, 'department_name': f'New Department {self.next_id()}'}),
+            ('department-detail', 'retrieve'): lambda: (
+                'get', reverse('department-detail', args=[department.id]), None),
+            ('department-detail', 'update'): lambda: ('put', reverse('department-detail', args=[department.id]), {
+                'company': company.id, 'department_name': f'Renamed {self.next_id()}'}),
+            ('department-detail', 'delete'): lambda: (
+                'delete', reverse('department-detail', args=[new_department().id]), None),
+            ('employee-list-create', 'list'): lambda: (
+                'get', reverse('employee-list-create') + f'?department={department.id}', None),
+            ('employee-list-create', 'page'): lambda: (
+                'get', reverse('employee-list-create') + '?page_size=50&total=exact', None),
+            ('employee-list-create', 'search'): lambda: (
+                'get', reverse('employee-list-create') + '?search=employee&page_size=50', None),
+            ('employee-list-create', 'expand'): lambda: (
+                'get', reverse('employee-list-create') + '?page_size=50&expand=company,department', None),
+            ('employee-list-create', 'tenure'): lambda: (
+                'get', reverse('employee-list-create') + f'?company={company.id}&ordering=-tenure&min_days=30'
+                '&page_size=50', None),
+            ('employee-list-create', 'create'): lambda: (
+                'post', reverse('employee-list-create'), self.employee_data()),
+            ('employee-detail', 'retrieve'): lambda: ('get', reverse('employee-detail', args=[employee.id]), None),
+            ('employee-detail', 'update'): lambda: (
+                'put', reverse('employee-detail', args=[employee.id]), self.employee_data()),
+            ('employee-detail', 'delete'): lambda: (
+                'delete', reverse('employee-detail', args=[self.new_employee().id]), None),
+            ('employee-bulk', 'create'): lambda: (
+                'post', reverse('employee-bulk'), [self.employee_data() for _ in range(5)]),
+            ('employee-bulk', 'update'): lambda: ('put', reverse('employee-bulk'), bulk_update()),
+            ('employee-bulk', 'delete'): lambda: (
+                'delete', reverse('employee-bulk'), {'ids': [self.new_employee().id for _ in range(5)]}),
+            ('employee-bulk-transition', 'update'): lambda: ('post', reverse('employee-bulk-transition'), {
+                'employee_status': 'interview_scheduled',
+                'ids': [self.new_employee(employee_status='application_received', hired_on=None).id
+                        for _ in range(5)]}),
+            ('employee-bulk-transition', 'hire'): lambda: ('post', reverse('employee-bulk-transition'), {
+                'employee_status': 'hired', 'hired_on': date.today().isoformat(),
+                'ids': [self.new_employee(employee_status='interview_scheduled', hired_on=None).id
+                        for _ in range(5)]}),
+            ('employee-report', 'json'): lambda: ('get', reverse('employee-report'), None),
+            ('employee-report', 'csv'): lambda: ('get', reverse('employee-report') + '?format=csv', None),
+            ('employee-report', 'tenure'): lambda: (
+                'get', reverse('employee-report') + '?ordering=-tenure&max_days=365&page_size=50', None),
+            ('dashboard-stats', 'retrieve'): lambda: ('get', reverse('dashboard-stats'), None),
+            ('hiring-trends', 'retrieve'): lambda: ('get', reverse('hiring-trends'), None),
+            ('company-departments', 'list'): lambda: (
+                'get', reverse('company-departments', args=[company.id]), None),
+            ('signup', 'create'): lambda: ('post', reverse('signup'), {
+                'username': f'new{self.next_id()}', 'email': f'new{self.next_id()}@example.com',
+                'password': 'budgetpass123', 'password_confirm': 'budgetpass123', 'role': 'employee'}),
+            ('login', 'create'): lambda: (
+                'post', reverse('login'), {'email': 'budget@example.com', 'password': 'budgetpass123'}),
+            ('token_refresh', 'create'): lambda: (
+                'post', reverse('token_refresh'), {'refresh': str(RefreshToken.for_user(self.user))}),
+            ('logout', 'create'): lambda: (
+                'post', reverse('logout'), {'refresh_token': str(RefreshToken.for_user(self.user))}),
+        }
+
+    def count_queries(self, method, url, data):
+        """The queries one request runs, after a cache clear; fails on an error status"""
+        for cache in caches.all():
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+        self.assertLess(response.status_code, 300, f'{method.upper()} {url}: {content[:300]!r}')
+        return len(queries.captured_queries), [query['sql'] for query in queries.captured_queries]
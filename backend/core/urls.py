@@ -1,27 +1,49 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import (
     CompanyListCreateView, CompanyDetailView,
     DepartmentListCreateView, DepartmentDetailView,
-    EmployeeListCreateView, EmployeeDetailView,
-    company_departments, EmployeeReportView
+    EmployeeListCreateView, EmployeeDetailView, EmployeeBulkView, EmployeeBulkTransitionView,
+    company_departments, EmployeeReportView, DashboardStatsView, HiringTrendsView
 )
 
+
+def read_view(view, async_view):
+    """``async_view`` when ASYNC_READ_VIEWS is set (see core.async_views), else ``view``"""
+    return async_view.as_view() if getattr(settings, 'ASYNC_READ_VIEWS', False) else view
+
+
 urlpatterns = [
     # Company URLs
-    path('companies/', CompanyListCreateView.as_view(), name='company-list-create'),
-    path('companies/<int:pk>/', CompanyDetailView.as_view(), name='company-detail'),
+    path('companies/', read_view(CompanyListCreateView.as_view(), async_views.CompanyListView),
+         name='company-list-create'),
+    path('companies/<int:pk>/', read_view(CompanyDetailView.as_view(), async_views.CompanyDetailView),
+         name='company-detail'),
     
     # Department URLs
-    path('departments/', DepartmentListCreateView.as_view(), name='department-list-create'),
-    path('departments/<int:pk>/', DepartmentDetailView.as_view(), name='department-detail'),
+    path('departments/', read_view(DepartmentListCreateView.as_view(), async_views.DepartmentListView),
+         name='department-list-create'),
+    path('departments/<int:pk>/', read_view(DepartmentDetailView.as_view(), async_views.DepartmentDetailView),
+         name='department-detail'),
     
     # Employee URLs
-    path('employees/', EmployeeListCreateView.as_view(), name='employee-list-create'),
-    path('employees/<int:pk>/', EmployeeDetailView.as_view(), name='employee-detail'),
+    path('employees/', read_view(EmployeeListCreateView.as_view(), async_views.EmployeeListView),
+         name='employee-list-create'),
+    path('employees/<int:pk>/', read_view(EmployeeDetailView.as_view(), async_views.EmployeeDetailView),
+         name='employee-detail'),
+    path('employees/bulk/', EmployeeBulkView.as_view(), name='employee-bulk'),
+    path('employees/bulk/transition/', EmployeeBulkTransitionView.as_view(), name='employee-bulk-transition'),
     
     # Reports URLs
-    path('employees/report/', EmployeeReportView.as_view(), name='employee-report'),
+    path('employees/report/', read_view(EmployeeReportView.as_view(), async_views.EmployeeReportView),
+         name='employee-report'),
+    
+    # Dashboard statistics
+    path('stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('stats/hiring/', HiringTrendsView.as_view(), name='hiring-trends'),
     
     # Utility URLs
-    path('companies/<int:company_id>/departments/', company_departments, name='company-departments'),
+    path('companies/<int:company_id>/departments/', read_view(company_departments, async_views.CompanyDepartmentsView),
+         name='company-departments'),
 ]
@@ -0,0 +1,102 @@
+"""
+Per-table change counters used for conditional GETs.
+
+Every write to Company, Department or Employee bumps that model's
+``TableVersion`` row inside the writing transaction: single-row saves and
+deletes through the handlers in ``core.signals`` (``AtomicSaveMixin`` and
+the deletion collector run them in the write's transaction), bulk paths
+explicitly.
+Code that bypasses model signals (``bulk_create``, ``QuerySet.update``) must
+call ``bump()`` for the models it wrote. Reading the current versions of a
+view's tables is one small indexed query, which is all a conditional GET
+needs to answer ``304 Not Modified``.
+
+Besides model classes, ``bump()`` and ``current()`` accept plain names for
+derived data with its own invalidation rules, e.g. ``report_cache.REPORT``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TableVersion
+
+
+# Table names touched while inside deferred(), or None
+_pending = ContextVar('core_versions_pending', default=None)
+
+
+def table_name(model):
+    if isinstance(model, str):
+        return model
+    return model._meta.label_lower
+
+
+def bump(*models):
+    """Record a change to the tables of ``models`` (or queue it inside deferred())"""
+    names = {table_name(model) for model in models}
+    if not names:
+        return
+    pending = _pending.get()
+    if pending is not None:
+        pending.update(names)
+        return
+    _increment(names)
+
+
+def _increment(names):
+    """One UPDATE for existing rows; tables written for the first time get a row"""
+    now = timezone.now()
+    rows = TableVersion.objects.filter(name__in=names)
+    if rows.update(version=F('version') + 1, updated_at=now) < len(names):
+        for name in names - set(rows.values_list('name', flat=True)):
+            TableVersion.objects.get_or_create(name=name, defaults={'version': 1, 'updated_at': now})
+
+
+def _rows(names):
+    return TableVersion.objects.filter(name__in=names).values_list('name', 'version', 'updated_at')
+
+
+def _collect(names, rows):
+    versions = dict.fromkeys(names, 0)
+    last_modified = None
+    for name, version, updated_at in rows:
+        versions[name] = version
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+    return versions, last_modified
+
+
+def current(*models):
+    """``({name: version}, last_modified)`` for the tables of ``models``"""
+    names = sorted(table_name(model) for model in models)
+    return _collect(names, _rows(names))
+
+
+async def acurrent(*models):
+    """Async version of ``current()``, using the async ORM"""
+    names = sorted(table_name(model) for model in models)
+    return _collect(names, [row async for row in _rows(names)])
+
+
+@contextmanager
+def deferred():
+    """
+    Collect version bumps and apply them once when the block exits successfully.
+
+    Bulk code paths wrap their writes in this block so a batch of N rows costs
+    one UPDATE per table instead of N. Nested blocks join the outer one.
+    """
+    if _pending.get() is not None:
+        yield _pending.get()
+        return
+
+    pending = set()
+    token = _pending.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending.reset(token)
+    if pending:
+        _increment(pending)
@@ -1,21 +1,41 @@
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from django.db.models import Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from .models import Company, Department, Employee
+from datetime import date, timedelta
+from .models import Company, Department, Employee, HiringRollup
 from .serializers import (
     CompanySerializer, DepartmentSerializer, EmployeeSerializer,
-    EmployeeListSerializer, DepartmentListSerializer, EmployeeReportSerializer
+    EmployeeListSerializer, DepartmentListSerializer, EmployeeReportSerializer, EmployeeTransitionSerializer
 )
 from .permissions import IsAdminOrManager, IsAdminOnly
+from . import bulk, fieldsets, report_cache, rollups, search, stats, tenure
+from .conditional import ConditionalGetMixin, compute_validators, not_modified
+from .fast_serializers import FastListMixin
+from .fieldsets import FieldsetMixin
+from .tenure import TenureFilterMixin
+from .renderers import CSVRenderer, NDJSONRenderer, TabularRenderer
+
+
+# Tables behind each representation, for ETag/Last-Modified. The headcount
+# counters make companies and departments depend on employee writes too.
+CORE_TABLES = (Company, Department, Employee)
 
 
 # Company Views
-class CompanyListCreateView(generics.ListCreateAPIView):
+class CompanyListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    version_models = CORE_TABLES
+    keyset_ordering = ('company_name', 'id')
 
     def perform_create(self, serializer):
         """Create a new company"""
@@ -29,10 +49,11 @@ class CompanyListCreateView(generics.ListCreateAPIView):
             )
 
 
-class CompanyDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CompanyDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    version_models = CORE_TABLES
 
     def perform_update(self, serializer):
         """Update a company"""
@@ -78,10 +99,12 @@ class CompanyDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Department Views
-class DepartmentListCreateView(generics.ListCreateAPIView):
+class DepartmentListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Department.objects.select_related('company').all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    version_models = CORE_TABLES
+    keyset_ordering = ('department_name', 'id')
 
     def get_queryset(self):
         """Filter departments by company if specified"""
@@ -103,10 +126,11 @@ class DepartmentListCreateView(generics.ListCreateAPIView):
             )
 
 
-class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DepartmentDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Department.objects.select_related('company').all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    version_models = CORE_TABLES
 
     def perform_update(self, serializer):
         """Update a department"""
@@ -146,9 +170,13 @@ class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Employee Views
-class EmployeeListCreateView(generics.ListCreateAPIView):
+class EmployeeListCreateView(ConditionalGetMixin, FieldsetMixin, FastListMixin, TenureFilterMixin,
+                             generics.ListCreateAPIView):
     queryset = Employee.objects.select_related('company', 'department').all()
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    version_models = CORE_TABLES
+    date_sensitive = True
+    keyset_ordering = ('employee_name', 'id')
 
     def get_serializer_class(self):
         """Use different serializers for list and create operations"""
@@ -175,7 +203,50 @@ class EmployeeListCreateView(generics.ListCreateAPIView):
         if status_filter is not None:
             queryset = queryset.filter(employee_status=status_filter)
         
-        return queryset
+        # Full-text search over name, email, designation and address; pages
+        # are ordered by id, since relevance changes with every write
+        search_query = self.request.query_params.get('search', None)
+        if search_query is not None:
+            ranked = self.paginator is None or not self.paginator.is_requested(self.request)
+            queryset = search.search_employees(queryset, search_query, ranked=ranked)
+        
+        # Tenure/hire date range and ordering
+        return self.filter_tenure(queryset)
+
+    def get_keyset_ordering(self):
+        """Page by the requested tenure ordering, search results by id"""
+        ordering = self.get_tenure_ordering()
+        if ordering is not None:
+            return ordering
+        if 'search' in self.request.query_params:
+            return ('id',)
+        return self.keyset_ordering
+
+    def list(self, request, *args, **kwargs):
+        """List employees; search results also carry facet counts"""
+        response = super().list(request, *args, **kwargs)
+        if 'search' in request.query_params:
+            data = response.data if isinstance(response.data, dict) else {'results': response.data}
+            data['facets'] = search.facet_counts(self.filter_queryset(self.get_queryset()))
+            response.data = data
+        return response
+
+    def estimate_total(self, queryset):
+        """Read the total from the headcount counters instead of counting rows"""
+        params = self.request.query_params
+        if 'status' in params or 'search' in params or self.get_tenure() is not None:
+            return None
+        department_id = params.get('department')
+        company_id = params.get('company')
+        if department_id is not None:
+            counters = Department.objects.filter(pk=department_id)
+            if company_id is not None:
+                counters = counters.filter(company_id=company_id)
+        elif company_id is not None:
+            counters = Company.objects.filter(pk=company_id)
+        else:
+            return Company.objects.aggregate(total=Sum('number_of_employees'))['total'] or 0
+        return counters.values_list('number_of_employees', flat=True).first() or 0
 
     def perform_create(self, serializer):
         """Create a new employee"""
@@ -196,10 +267,12 @@ class EmployeeListCreateView(generics.ListCreateAPIView):
             )
 
 
-class EmployeeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EmployeeDetailView(ConditionalGetMixin, FieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Employee.objects.select_related('company', 'department').all()
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    version_models = CORE_TABLES
+    date_sensitive = True
 
     def perform_update(self, serializer):
         """Update an employee"""
@@ -238,16 +311,215 @@ class EmployeeDetailView(generics.RetrieveUpdateDestroyAPIView):
             )
 
 
+class EmployeeBulkView(APIView):
+    """Create, update or delete many employees in one request"""
+    permission_classes = [IsAuthenticated, IsAdminOrManager]
+    max_batch_size = 10000
+
+    def get_rows(self, request):
+        """Accept either a JSON list or {"employees": [...]}"""
+        rows = request.data
+        if isinstance(rows, dict):
+            rows = rows.get('employees')
+        if not isinstance(rows, list) or not rows:
+            return None, Response(
+                {'error': 'Expected a non-empty list of employees.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > self.max_batch_size:
+            return None, Response(
+                {'error': f'At most {self.max_batch_size} employees can be sent per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return rows, None
+
+    def post(self, request):
+        """Create employees; nothing is written if any row is invalid"""
+        rows, error_response = self.get_rows(request)
+        if error_response:
+            return error_response
+
+        result = bulk.bulk_create_employees(rows)
+        if not result.ok:
+            return Response({'errors': result.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'created': len(result.employees), 'ids': [employee.pk for employee in result.employees]},
+            status=status.HTTP_201_CREATED
+        )
+
+    def put(self, request):
+        """Update employees (full records including id); nothing is written if any row is invalid"""
+        rows, error_response = self.get_rows(request)
+        if error_response:
+            return error_response
+
+        result = bulk.bulk_update_employees(rows)
+        if not result.ok:
+            return Response({'errors': result.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'updated': len(result.employees), 'ids': [employee.pk for employee in result.employees]}
+        )
+
+    def delete(self, request):
+        """Delete employees listed in {"ids": [...]}"""
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {'error': 'Expected a non-empty list of employee ids.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > self.max_batch_size:
+            return Response(
+                {'error': f'At most {self.max_batch_size} employees can be deleted per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Employee ids must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        deleted, missing = bulk.bulk_delete_employees(ids)
+        return Response({'deleted': len(deleted), 'missing': missing})
+
+
+class EmployeeBulkTransitionView(APIView):
+    """Change the status of many employees in one request"""
+    permission_classes = [IsAuthenticated, IsAdminOrManager]
+    max_batch_size = EmployeeBulkView.max_batch_size
+
+    def post(self, request):
+        """
+        Move the employees in {"ids": [...]} or matched by {"filter": {"company", "department",
+        "status"}} to "employee_status"; employees whose current status does not allow it are
+        skipped and listed with the reason
+        """
+        serializer = EmployeeTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        ids = data.get('ids')
+        if ids is not None:
+            if len(ids) > self.max_batch_size:
+                return Response(
+                    {'error': f'At most {self.max_batch_size} employees can be changed per request.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            employees = Employee.objects.filter(pk__in=ids)
+        else:
+            filters = data['filter']
+            employees = Employee.objects.all()
+            if 'company' in filters:
+                employees = employees.filter(company_id=filters['company'])
+            if 'department' in filters:
+                employees = employees.filter(department_id=filters['department'])
+            if 'status' in filters:
+                employees = employees.filter(employee_status=filters['status'])
+            if employees[self.max_batch_size:self.max_batch_size + 1].exists():
+                return Response(
+                    {'error': f'The filter matches more than {self.max_batch_size} employees; narrow it down.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        updated, skipped = bulk.transition_employees(
+            employees, data['employee_status'], hired_on=data['hired_on'], ids=ids,
+        )
+        return Response({'updated': len(updated), 'ids': updated, 'skipped': skipped})
+
+
+class DashboardStatsView(APIView):
+    """Headcounts by status per company, per department and overall"""
+    permission_classes = [IsAuthenticated, IsAdminOrManager]
+
+    def get(self, request):
+        validators = compute_validators(request, CORE_TABLES)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        # The validators already read the versions the cache key is built from
+        return validators.apply(Response(stats.get_stats(validators.current)))
+
+
+class HiringTrendsView(APIView):
+    """Hires and headcount per day/month plus current tenure buckets, from the rollups"""
+    permission_classes = [IsAuthenticated, IsAdminOrManager]
+    max_periods = 3660
+    default_days = 365
+
+    def get_params(self, request):
+        """Parse the query parameters; returns (params, error_response)"""
+        params = request.query_params
+        interval = params.get('interval', HiringRollup.MONTH)
+        if interval not in (HiringRollup.DAY, HiringRollup.MONTH):
+            return None, Response(
+                {'error': "interval must be 'day' or 'month'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            end = date.fromisoformat(params['end']) if 'end' in params else date.today()
+            start = date.fromisoformat(params['start']) if 'start' in params else end - timedelta(days=self.default_days)
+            company_id = int(params['company']) if 'company' in params else None
+            department_id = int(params['department']) if 'department' in params else None
+        except ValueError:
+            return None, Response(
+                {'error': 'start/end must be YYYY-MM-DD dates and company/department integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start > end:
+            return None, Response(
+                {'error': 'start must not be after end.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        periods = (end - start).days + 1 if interval == HiringRollup.DAY else (
+            (end.year - start.year) * 12 + end.month - start.month + 1
+        )
+        if periods > self.max_periods:
+            return None, Response(
+                {'error': f'At most {self.max_periods} periods can be requested at once.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return {
+            'interval': interval, 'start': start, 'end': end,
+            'company_id': company_id, 'department_id': department_id,
+        }, None
+
+    def get(self, request):
+        params, error_response = self.get_params(request)
+        if error_response:
+            return error_response
+
+        validators = compute_validators(request, CORE_TABLES, date_sensitive=True)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+
+        filters = {'company_id': params['company_id'], 'department_id': params['department_id']}
+        return validators.apply(Response({
+            'interval': params['interval'],
+            'start': params['start'],
+            'end': params['end'],
+            'series': rollups.time_series(params['interval'], params['start'], params['end'], **filters),
+            'tenure': rollups.tenure_buckets(**filters),
+        }))
+
+
 # Utility Views
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def company_departments(request, company_id):
     """Get all departments for a specific company"""
     try:
+        validators = compute_validators(request, (Company, Department))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+
         company = get_object_or_404(Company, id=company_id)
         departments = Department.objects.filter(company=company)
         serializer = DepartmentListSerializer(departments, many=True)
-        return Response(serializer.data)
+        return validators.apply(Response(serializer.data))
     except Exception as e:
         return Response(
             {'error': f'Failed to fetch departments: {str(e)}'},
@@ -256,15 +528,119 @@ def company_departments(request, company_id):
 
 
 # Employee Report View
-class EmployeeReportView(generics.ListAPIView):
+class EmployeeReportView(ConditionalGetMixin, FieldsetMixin, FastListMixin, TenureFilterMixin, generics.ListAPIView):
     """View to get detailed report of hired employees"""
     serializer_class = EmployeeReportSerializer
     permission_classes = [IsAuthenticated, IsAdminOrManager]
+    # Bumped only by writes that change the report (see core.report_cache)
+    version_models = (report_cache.REPORT,)
+    date_sensitive = True
+    keyset_ordering = ('company__company_name', 'department__department_name', 'employee_name', 'id')
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [CSVRenderer, NDJSONRenderer]
+
+    # (output column, model lookup) in EmployeeReportSerializer field order;
+    # days_employed is computed from hired_on while streaming
+    export_columns = (
+        ('id', 'id'),
+        ('employee_name', 'employee_name'),
+        ('email_address', 'email_address'),
+        ('mobile_number', 'mobile_number'),
+        ('position', 'designation'),
+        ('hired_on', 'hired_on'),
+        ('days_employed', None),
+        ('company_name', 'company__company_name'),
+        ('department_name', 'department__department_name'),
+    )
+    export_chunk_size = 2000
     
     def get_queryset(self):
         """Return only hired employees with related company and department data"""
-        return Employee.objects.filter(
+        return self.filter_tenure(Employee.objects.filter(
             employee_status='hired'
         ).select_related('company', 'department').order_by(
             'company__company_name', 'department__department_name', 'employee_name'
+        ))
+
+    def get_keyset_ordering(self):
+        """Page by the requested tenure ordering, else by company/department/name"""
+        return self.get_tenure_ordering() or self.keyset_ordering
+
+    def list(self, request, *args, **kwargs):
+        """Stream CSV/NDJSON exports; serve the full JSON report from the cache"""
+        renderer = request.accepted_renderer
+        if isinstance(renderer, TabularRenderer):
+            return self.stream_report(renderer)
+        paginator = self.paginator
+        if paginator is not None and paginator.is_requested(request):
+            return super().list(request, *args, **kwargs)
+        if isinstance(renderer, JSONRenderer):
+            # Cache the rendered body: encoding dominates a warm request otherwise
+            content = report_cache.get_or_build(
+                date.today(),
+                lambda: renderer.render(self.build_report(), request.accepted_media_type, self.get_renderer_context()),
+                variant=self.get_cache_variant(),
+            )
+            return HttpResponse(content, content_type=renderer.media_type)
+        return Response(report_cache.get_or_build(date.today(), self.build_report, variant=self.get_cache_variant('data')))
+
+    def get_cache_variant(self, representation=None):
+        """
+        Name the cached representation: media type (or ``representation``)
+        plus the requested fieldset and tenure parameters
+        """
+        parts = [
+            representation or self.request.accepted_media_type,
+            fieldsets.cache_variant(self.request),
+            tenure.cache_variant(self.request),
+        ]
+        return ';'.join(part for part in parts if part)
+
+    def build_report(self):
+        """The serialized full report, as cached by core.report_cache"""
+        return self.serialize_list(self.filter_queryset(self.get_queryset()))
+
+    def get_export_columns(self):
+        """``export_columns`` narrowed to ``?fields=``; expansions do not apply to flat exports"""
+        requested_fields, _expanded = fieldsets.requested(self.request)
+        if requested_fields is None:
+            return self.export_columns
+        columns = dict(self.export_columns)
+        unknown = [name for name in requested_fields if name not in columns]
+        if unknown:
+            raise ValidationError({fieldsets.FIELDS_PARAM: [
+                f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(columns)}."
+            ]})
+        return tuple((column, lookup) for column, lookup in self.export_columns if column in requested_fields)
+
+    def stream_report(self, renderer):
+        """Stream the report rows without materializing the result set"""
+        columns = self.get_export_columns()
+        response = StreamingHttpResponse(
+            renderer.stream([column for column, _lookup in columns], self.iter_export_rows(columns)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
         )
+        response['Content-Disposition'] = f'attachment; filename="employee-report.{renderer.format}"'
+        return response
+
+    def iter_export_rows(self, columns):
+        """
+        Report rows as tuples, fetched from the database in chunks.
+
+        The queryset is built right away, so invalid query parameters raise
+        before the streaming response (and its 200 status) is created.
+        """
+        # days_employed is computed from hired_on
+        lookups = [lookup or 'hired_on' for _column, lookup in columns]
+        computed = [index for index, (_column, lookup) in enumerate(columns) if lookup is None]
+        rows = self.filter_queryset(self.get_queryset()).values_list(*lookups)
+        return self._export_rows(rows, computed)
+
+    def _export_rows(self, rows, computed):
+        today = date.today()
+        for row in rows.iterator(chunk_size=self.export_chunk_size):
+            if computed:
+                row = list(row)
+                for index in computed:
+                    row[index] = (today - row[index]).days if row[index] else None
+                row = tuple(row)
+            yield row
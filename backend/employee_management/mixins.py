@@ -0,0 +1,18 @@
+"""Model mixins shared by the project's apps."""
+
+
+class TrackLoadedValuesMixin:
+    """Remember the column values an instance was loaded with.
+
+    Shared by the core and accounts models: the signal handlers in
+    core.signals compare these against the current values to tell a plain
+    update from a move between companies/departments, or a rename/status
+    change that affects the cached report; accounts.signals uses them to spot
+    changes to the claims carried by a user's tokens.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
@@ -47,12 +47,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Last, so its view timing covers the view alone
+    'core.instrumentation.InstrumentationMiddleware',
 ]
 
 ROOT_URLCONF = 'employee_management.urls'
@@ -132,13 +135,36 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
+# Authenticate API requests from the verified JWT claims (role, email) instead
+# of loading the user row on every request. Role/active changes then apply
+# when the current access token expires (ACCESS_TOKEN_LIFETIME).
+JWT_CLAIMS_AUTHENTICATION = False
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-
+        'accounts.authentication.ClaimsJWTAuthentication'
+        if JWT_CLAIMS_AUTHENTICATION else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # Keyset pagination, applied when a request sends ?cursor= or ?page_size=
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    # JSONRenderer output, encoded with orjson when it is installed
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Response compression (core.compression.CompressionMiddleware). Encodings
+# in order of preference; 'br' needs the optional brotli package and is
+# skipped without it. Bodies under COMPRESSION_MIN_SIZE bytes are sent
+# uncompressed, as the saving would not pay for the CPU time.
+COMPRESSION_ENCODINGS = ['br', 'gzip']
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15), 
@@ -146,6 +172,61 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": False,
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.CustomTokenRefreshSerializer",
+}
+
+# Expected number of live blacklisted refresh tokens; sizes the in-memory
+# bloom filter used by accounts.blacklist (it grows automatically)
+TOKEN_BLACKLIST_FILTER_CAPACITY = 100000
+
+# Per-process in-memory cache. For several workers on one machine a shared
+# backend avoids one rebuild per worker, e.g.
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / 'cache',
+# or 'django.core.cache.backends.db.DatabaseCache' (run createcachetable).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'employee-management',
+    },
+}
+
+# Cache alias for the hired-employee report (core.report_cache); None disables
+# caching. Entries are invalidated on change, the timeout only bounds memory.
+EMPLOYEE_REPORT_CACHE = 'default'
+EMPLOYEE_REPORT_CACHE_TIMEOUT = 60 * 60
+
+# Keep /api/core/stats/ payloads cached for this many seconds (0 disables).
+# Entries are keyed by the table versions, so they are never stale.
+DASHBOARD_STATS_CACHE = 'default'
+DASHBOARD_STATS_CACHE_TIMEOUT = 30
+
+# Serve the core read endpoints with the native async views in
+# core.async_views. Only worth it under ASGI (e.g. uvicorn
+# employee_management.asgi:application); under WSGI every async view runs in
+# its own event loop, which is slower than the synchronous views.
+ASYNC_READ_VIEWS = False
+
+# Serialize the employee list and report GETs straight from values_list()
+# rows (core.fast_serializers) when the requested fields allow it. The
+# output is identical to the DRF serializers'; False always uses those.
+FAST_LIST_SERIALIZATION = True
+
+# Fraction of requests (0-1) measured by core.instrumentation: SQL query
+# count and time, serializer, view and render time, sent as a Server-Timing
+# header and logged on the core.instrumentation logger. 0 disables the
+# middleware entirely.
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = 0
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.instrumentation': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
 }
 
 # CORS settings
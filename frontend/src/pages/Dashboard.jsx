@@ -18,16 +18,12 @@ const Dashboard = () => {
 
   const fetchStats = async () => {
     try {
-      const [employeesData, departmentsData, companiesData] = await Promise.all([
-        apiService.getEmployees(),
-        apiService.getDepartments(),
-        apiService.getCompanies()
-      ]);
+      const { totals } = await apiService.getDashboardStats();
       
       setStats({
-        employees: employeesData.length,
-        departments: departmentsData.length,
-        companies: companiesData.length
+        employees: totals.employees,
+        departments: totals.departments,
+        companies: totals.companies
       });
     } catch (error) {
       console.error('Error fetching stats:', error);
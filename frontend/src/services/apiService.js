@@ -310,6 +310,15 @@ class ApiService {
     }
   }
 
+  async getDashboardStats() {
+    try {
+      const response = await api.get('/core/stats/');
+      return response.data;
+    } catch (error) {
+      throw new Error(error.response?.data?.error || 'Failed to fetch dashboard statistics');
+    }
+  }
+
   // Utility methods
   async getCompanyDepartments(companyId) {
     try {